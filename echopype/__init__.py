@@ -2,9 +2,9 @@ from __future__ import absolute_import, division, print_function
 
 from _echopype_version import version as __version__  # noqa
 
-from . import calibrate, clean, commongrid, consolidate, mask, utils
+from . import calibrate, catalog, clean, commongrid, consolidate, mask, utils
 from .convert.api import open_raw
-from .echodata.api import open_converted
+from .echodata.api import open_converted, open_mfconverted
 from .echodata.combine import combine_echodata
 from .utils.io import init_ep_dir
 from .utils.log import verbose
@@ -16,6 +16,7 @@ init_ep_dir()
 
 __all__ = [
     "calibrate",
+    "catalog",
     "clean",
     "combine_echodata",
     "commongrid",
@@ -23,6 +24,7 @@ __all__ = [
     "mask",
     "metrics",
     "open_converted",
+    "open_mfconverted",
     "open_raw",
     "utils",
     "verbose",
@@ -1,3 +1,11 @@
-from .api import compute_Sv, compute_TS
+from .api import compute, compute_Sv, compute_Svf, compute_TS, compute_TSf
+from .env_params import clear_env_params_cache
 
-__all__ = ["compute_Sv", "compute_TS"]
+__all__ = [
+    "clear_env_params_cache",
+    "compute",
+    "compute_Sv",
+    "compute_Svf",
+    "compute_TS",
+    "compute_TSf",
+]
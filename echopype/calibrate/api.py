@@ -1,12 +1,47 @@
+from collections import defaultdict
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, MutableMapping, Optional, Union
+
+import dask.array
+import fsspec
+import numpy as np
 import xarray as xr
+import zarr
+from dask.base import tokenize
+from fsspec import FSMap
 
+from ..consolidate.split_beam_angle import get_angle_complex_samples, get_angle_power_samples
 from ..echodata import EchoData
-from ..echodata.simrad import check_input_args_combination
+from ..echodata.simrad import check_input_args_combination, retrieve_correct_beam_group
 from ..utils.log import _init_logger
 from ..utils.prov import echopype_prov_attrs, source_files_vars
+from ..utils.ragged import COUNT_VAR, EXTENT_VAR, get_sample_extents, skip_padding
 from .calibrate_azfp import CalibrateAZFP
 from .calibrate_ek import CalibrateEK60, CalibrateEK80
 
+# Default number of pings calibrated at once when writing to a zarr store
+DEFAULT_PING_BLOCK = 1000
+
+# Root attribute of an output zarr store recording the calibrated ping blocks
+PROGRESS_ATTR = "_calibration_progress"
+
+# Data variables of each product of ``compute``
+PRODUCT_VARS = {
+    "Sv": ["Sv"],
+    "TS": ["TS"],
+    "angles": ["angle_alongship", "angle_athwartship"],
+}
+
+ANGLE_SONAR_MODELS = ["EK60", "ES70", "EK80", "ES80", "EA640"]
+
+ANGLE_PARAM_NAMES = [
+    "angle_sensitivity_alongship",
+    "angle_sensitivity_athwartship",
+    "angle_offset_alongship",
+    "angle_offset_athwartship",
+]
+
 CALIBRATOR = {
     "EK60": CalibrateEK60,
     "EK80": CalibrateEK80,
@@ -19,6 +54,104 @@ CALIBRATOR = {
 logger = _init_logger(__name__)
 
 
+def _select_channel_pings(
+    echodata: EchoData, ed_beam_group: str, channel: str, ping_idx, n_samples: int
+) -> EchoData:
+    """
+    Get an ``EchoData`` object restricted to one channel, and to the given pings
+    and first ``n_samples`` samples of this channel in ``ed_beam_group``.
+    """
+    # expand_ragged returns a shallow copy of rectangular data
+    echodata = echodata.expand_ragged()
+    for group in echodata.group_paths:
+        ds = echodata[group]
+        if ds is not None and "channel" in ds.dims:
+            echodata[group] = ds.sel(channel=ds["channel"].isin([channel]))
+    echodata[ed_beam_group] = echodata[ed_beam_group].isel(
+        ping_time=ping_idx, range_sample=slice(0, n_samples)
+    )
+    return echodata
+
+
+def _compute_angles(cal_obj) -> xr.Dataset:
+    """
+    Compute the split-beam angles of the channels of a calibration object,
+    reusing its pulse compression output for BB mode complex samples.
+    """
+    ds_beam = cal_obj.echodata[cal_obj.ed_beam_group].sel(channel=cal_obj.chan_sel)
+    angle_params = {p: cal_obj.cal_params[p] for p in ANGLE_PARAM_NAMES}
+    if cal_obj.encode_mode == "power":
+        theta, phi = get_angle_power_samples(ds_beam, angle_params)
+    elif cal_obj.waveform_mode == "BB":
+        theta, phi = get_angle_complex_samples(
+            ds_beam, angle_params, pc=cal_obj.get_pulse_compressed()
+        )
+    else:
+        theta, phi = get_angle_complex_samples(ds_beam, angle_params)
+
+    theta.attrs = {"long_name": "split-beam alongship angle"}
+    phi.attrs = {"long_name": "split-beam athwartship angle"}
+    ds_angles = xr.Dataset({"angle_alongship": theta, "angle_athwartship": phi})
+    ds_angles = ds_angles.merge(cal_obj.range_meter)
+    ds_angles["frequency_nominal"] = ds_beam["frequency_nominal"]
+    return ds_angles
+
+
+def _compute_products(cal_obj, products: List[str]) -> Dict[str, xr.Dataset]:
+    """Compute the products with the same calibration object, sharing its intermediate results."""
+    cal_funcs = {
+        "Sv": cal_obj.compute_Sv,
+        "TS": cal_obj.compute_TS,
+        "angles": partial(_compute_angles, cal_obj),
+    }
+    return {product: cal_funcs[product]() for product in products}
+
+
+def _compute_cal_multiplexed(
+    products: List[str],
+    echodata: EchoData,
+    ed_beam_group: str,
+    counts: xr.DataArray,
+    cal_kwargs: dict,
+) -> Dict[str, xr.Dataset]:
+    """
+    Calibrate each channel over its own pings and samples, given by ``counts``,
+    and align the results on the ``ping_time`` and ``range_sample`` of ``ed_beam_group``.
+    """
+    cal_ds_lists = defaultdict(list)
+    for ch_seq, channel_counts in enumerate(counts.transpose("channel", "ping_time")):
+        ping_idx = np.flatnonzero(channel_counts.values > 0)
+        echodata_ch = _select_channel_pings(
+            echodata,
+            ed_beam_group,
+            channel=channel_counts["channel"].values,
+            ping_idx=ping_idx,
+            n_samples=int(channel_counts.max()),
+        )
+        cal_kwargs_ch = dict(cal_kwargs)
+        if cal_kwargs.get("pc_store") is not None:
+            cal_kwargs_ch["pc_group"] = f"pulse_compressed_{ch_seq}"
+        cal_obj = CALIBRATOR[echodata.sonar_model](echodata_ch, **cal_kwargs_ch)
+        for product, ds in _compute_products(cal_obj, products).items():
+            cal_ds_lists[product].append(ds)
+
+    beam = echodata[ed_beam_group]
+    cal_ds_dict = {}
+    for product, cal_ds_list in cal_ds_lists.items():
+        cal_ds = xr.concat(
+            cal_ds_list,
+            dim="channel",
+            data_vars="minimal",
+            coords="minimal",
+            compat="override",
+            join="outer",
+        )
+        cal_ds_dict[product] = cal_ds.reindex(
+            ping_time=beam["ping_time"], range_sample=beam["range_sample"]
+        )
+    return cal_ds_dict
+
+
 def _compute_cal(
     cal_type,
     echodata: EchoData,
@@ -27,7 +160,61 @@ def _compute_cal(
     ecs_file=None,
     waveform_mode=None,
     encode_mode=None,
+    dtype=None,
+    output_path: Optional[Union[str, Path, FSMap]] = None,
+    ping_block: Optional[int] = None,
+    storage_options: Optional[Dict] = None,
 ):
+    if cal_type not in ("Sv", "TS"):
+        raise ValueError("cal_type must be Sv or TS")
+
+    if output_path is not None:
+        return _compute_cal_to_zarr(
+            cal_type,
+            echodata,
+            output_path,
+            ping_block=ping_block,
+            storage_options=storage_options,
+            env_params=env_params,
+            cal_params=cal_params,
+            ecs_file=ecs_file,
+            waveform_mode=waveform_mode,
+            encode_mode=encode_mode,
+            dtype=dtype,
+        )
+    elif ping_block is not None:
+        raise ValueError("ping_block is only used when writing to output_path!")
+
+    return _compute_cal_products(
+        [cal_type],
+        echodata,
+        env_params=env_params,
+        cal_params=cal_params,
+        ecs_file=ecs_file,
+        waveform_mode=waveform_mode,
+        encode_mode=encode_mode,
+        dtype=dtype,
+        processing_function=f"calibrate.compute_{cal_type}",
+    )[cal_type]
+
+
+def _compute_cal_products(
+    products: List[str],
+    echodata: EchoData,
+    env_params=None,
+    cal_params=None,
+    ecs_file=None,
+    waveform_mode=None,
+    encode_mode=None,
+    pc_store: Optional[Union[str, MutableMapping]] = None,
+    dtype=None,
+    processing_function: str = "calibrate.compute",
+) -> Dict[str, xr.Dataset]:
+    if dtype is not None:
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError("dtype must be float32 or float64!")
+
     # Make waveform_mode "FM" equivalent to "BB"
     waveform_mode = "BB" if waveform_mode == "FM" else waveform_mode
 
@@ -48,26 +235,47 @@ def _compute_cal(
                 "(encode_mode='power'). Calibration will be done on the power samples.",
             )
 
-    # Set up calibration object
-    cal_obj = CALIBRATOR[echodata.sonar_model](
-        echodata,
+    # Lazily expand beam groups stored as contiguous ragged arrays,
+    # keeping the sample counts of each channel to skip the padding
+    sample_counts = {}
+    if echodata.is_ragged:
+        sample_counts = {
+            p: echodata[p][COUNT_VAR] for p in echodata.beam_group_paths if COUNT_VAR in echodata[p]
+        }
+        echodata = echodata.expand_ragged()
+
+    cal_kwargs = dict(
         env_params=env_params,
         cal_params=cal_params,
         ecs_file=ecs_file,
         waveform_mode=waveform_mode,
         encode_mode=encode_mode,
     )
+    if pc_store is not None:
+        cal_kwargs["pc_store"] = pc_store
+    if dtype is not None:
+        cal_kwargs["dtype"] = dtype
+
+    # Set up calibration object
+    cal_obj = CALIBRATOR[echodata.sonar_model](echodata, **cal_kwargs)
 
     # Check Echodata Backscatter Size
     cal_obj._check_echodata_backscatter_size()
 
+    ed_beam_group = getattr(cal_obj, "ed_beam_group", None) or "Sonar/Beam_group1"
+    counts = sample_counts.get(ed_beam_group)
+    if counts is not None:
+        counts = counts.sel(channel=getattr(cal_obj, "chan_sel", counts["channel"]))
+
     # Perform calibration
-    if cal_type == "Sv":
-        cal_ds = cal_obj.compute_Sv()
-    elif cal_type == "TS":
-        cal_ds = cal_obj.compute_TS()
+    if counts is not None and not (counts > 0).all():
+        # Multiplexed channels do not ping at the same times:
+        # calibrate each channel over its own pings only
+        cal_ds_dict = _compute_cal_multiplexed(
+            products, echodata, ed_beam_group, counts, cal_kwargs
+        )
     else:
-        raise ValueError("cal_type must be Sv or TS")
+        cal_ds_dict = _compute_products(cal_obj, products)
 
     # Add attributes
     def add_attrs(cal_type, ds):
@@ -91,8 +299,35 @@ def _compute_cal(
                 }
             )
 
-    add_attrs(cal_type, cal_ds)
+    for product, cal_ds in cal_ds_dict.items():
+        data_vars = PRODUCT_VARS[product]
+
+        # Skip the computation of the padding beyond the sample extent of each channel
+        if counts is not None:
+            extents = get_sample_extents(xr.Dataset({COUNT_VAR: counts}))
+            for var in data_vars + ["echo_range"]:
+                cal_ds[var] = skip_padding(cal_ds[var], extents)
+            cal_ds[EXTENT_VAR] = extents
+            cal_ds[COUNT_VAR] = counts.copy(data=counts.values)
+            cal_ds[COUNT_VAR].attrs = {"long_name": counts.attrs["long_name"]}
+
+        if dtype is not None:
+            for var in data_vars + ["echo_range"]:
+                cal_ds[var] = cal_ds[var].astype(dtype)
+
+        if product in ("Sv", "TS"):
+            add_attrs(product, cal_ds)
+        else:
+            cal_ds["range_sample"].attrs = {"long_name": "Along-range sample number, base 0"}
+            cal_ds["echo_range"].attrs = {"long_name": "Range distance", "units": "m"}
+
+        cal_ds_dict[product] = _add_provenance(cal_ds, echodata, processing_function)
+
+    return cal_ds_dict
+
 
+def _add_provenance(cal_ds: xr.Dataset, echodata: EchoData, processing_function: str):
+    """Add the provenance and ``water_level`` of ``echodata`` to a calibrated dataset."""
     # Add provinance
     # Provenance source files may originate from raw files (echodata.source_files)
     # or converted files (echodata.converted_raw_path)
@@ -104,8 +339,9 @@ def _compute_cal(
         source_file = "SOURCE FILE NOT IDENTIFIED"
 
     prov_dict = echopype_prov_attrs(process_type="processing")
-    prov_dict["processing_function"] = f"calibrate.compute_{cal_type}"
+    prov_dict["processing_function"] = processing_function
     files_vars = source_files_vars(source_file)
+
     cal_ds = (
         cal_ds.assign(**files_vars["source_files_var"])
         .assign_coords(**files_vars["source_files_coord"])
@@ -119,6 +355,249 @@ def _compute_cal(
     return cal_ds
 
 
+def _compute_cal_freq(
+    cal_type: str,
+    echodata: EchoData,
+    frequency_resolution: Optional[float] = None,
+    env_params=None,
+    cal_params=None,
+    ecs_file=None,
+    pc_store: Optional[Union[str, MutableMapping]] = None,
+    dtype=None,
+) -> xr.Dataset:
+    """Calibrate EK80 broadband complex samples at each frequency of their spectrum."""
+    if echodata.sonar_model not in ("EK80", "ES80", "EA640"):
+        raise ValueError(
+            f"{cal_type}(f) can only be computed from broadband complex samples "
+            "of EK80, ES80 and EA640 echosounders!"
+        )
+    if dtype is not None:
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError("dtype must be float32 or float64!")
+
+    if echodata.is_ragged:
+        echodata = echodata.expand_ragged()
+
+    cal_kwargs = dict(
+        env_params=env_params,
+        cal_params=cal_params,
+        ecs_file=ecs_file,
+        waveform_mode="BB",
+        encode_mode="complex",
+    )
+    if pc_store is not None:
+        cal_kwargs["pc_store"] = pc_store
+    if dtype is not None:
+        cal_kwargs["dtype"] = dtype
+    cal_obj = CALIBRATOR[echodata.sonar_model](echodata, **cal_kwargs)
+    cal_ds = cal_obj._cal_complex_samples_freq(cal_type, frequency_resolution)
+
+    name = f"{cal_type}f"
+    if dtype is not None:
+        for var in [name, "echo_range"]:
+            cal_ds[var] = cal_ds[var].astype(dtype)
+
+    cal_ds["echo_range"].attrs = {
+        "long_name": "Range distance at the center of the range window",
+        "units": "m",
+    }
+    cal_ds[name].attrs = {
+        "long_name": {
+            "Sv": "Volume backscattering strength at each frequency (Sv(f) re 1 m-1)",
+            "TS": "Target strength at each frequency (TS(f) re 1 m^2)",
+        }[cal_type],
+        "units": "dB",
+        "waveform_mode": "BB",
+        "encode_mode": "complex",
+    }
+
+    return _add_provenance(cal_ds, echodata, f"calibrate.compute_{name}")
+
+
+def compute(
+    echodata: EchoData,
+    products: List[str] = ["Sv", "TS"],
+    pc_store: Optional[Union[str, MutableMapping]] = None,
+    **kwargs,
+) -> Dict[str, xr.Dataset]:
+    """
+    Compute several calibrated products from raw data, sharing intermediate results.
+
+    The transmit replicas and pulse compression output of EK80 broadband complex samples
+    are computed once and used for all products, instead of once for each of
+    ``compute_Sv``, ``compute_TS`` and ``consolidate.add_splitbeam_angle``.
+
+    Parameters
+    ----------
+    echodata : EchoData
+        An `EchoData` object created by using `open_raw` or `open_converted`
+    products : list of {"Sv", "TS", "angles"}
+        The products to compute:
+
+        - ``"Sv"``: volume backscattering strength, as returned by ``compute_Sv``
+        - ``"TS"``: target strength, as returned by ``compute_TS``
+        - ``"angles"``: split-beam angles ``angle_alongship`` and ``angle_athwartship``,
+          computed from the pulse compression output for BB mode complex samples.
+          Only available for Simrad echosounders.
+    pc_store : str or MutableMapping, optional
+        A zarr store to which the pulse compression output of EK80 broadband complex samples
+        is written, and read back lazily to compute the products, instead of being
+        kept in memory. Defaults to ``None``, i.e. the output is not persisted.
+    **kwargs
+        ``env_params``, ``cal_params``, ``ecs_file``, ``waveform_mode``, ``encode_mode``
+        and ``dtype``, as in ``compute_Sv``
+
+    Returns
+    -------
+    dict of xr.Dataset
+        The dataset of each product, keyed by product name
+    """
+    if isinstance(products, str):
+        products = [products]
+    products = list(dict.fromkeys(products))
+    if not products or not set(products) <= set(PRODUCT_VARS):
+        raise ValueError(f"products must be a non-empty list of {list(PRODUCT_VARS)}!")
+    if "angles" in products and echodata.sonar_model not in ANGLE_SONAR_MODELS:
+        raise ValueError(
+            f"Split-beam angles cannot be computed for sonar model {echodata.sonar_model}!"
+        )
+    if pc_store is not None and echodata.sonar_model not in ("EK80", "ES80", "EA640"):
+        raise ValueError("pc_store is only used for EK80 broadband complex samples!")
+
+    return _compute_cal_products(products, echodata, pc_store=pc_store, **kwargs)
+
+
+def _get_cal_beam_group(echodata: EchoData, waveform_mode=None, encode_mode=None) -> str:
+    """Get the beam group calibrated for the given waveform and encode modes."""
+    if echodata.sonar_model == "AZFP":
+        return "Sonar/Beam_group1"
+    if echodata.sonar_model in ("EK60", "ES70"):
+        waveform_mode, encode_mode = "CW", "power"
+    waveform_mode = "BB" if waveform_mode == "FM" else waveform_mode
+    return retrieve_correct_beam_group(echodata, waveform_mode, encode_mode)
+
+
+def _compute_cal_to_zarr(
+    cal_type: str,
+    echodata: EchoData,
+    output_path: Union[str, Path, FSMap],
+    ping_block: Optional[int] = None,
+    storage_options: Optional[Dict] = None,
+    **kwargs,
+) -> xr.Dataset:
+    """
+    Calibrate blocks of pings and write each block to its region of a zarr store.
+
+    The store is initialized from the first block, with chunks of ``ping_block`` pings.
+    The number of blocks written is recorded in the ``PROGRESS_ATTR`` attribute of the store
+    after each block, so that an interrupted calibration resumes at the first block
+    not written. The attribute is removed once all blocks are written.
+    """
+    storage_options = storage_options if storage_options is not None else {}
+    ping_block = DEFAULT_PING_BLOCK if ping_block is None else int(ping_block)
+    if ping_block < 1:
+        raise ValueError("ping_block must be a positive integer!")
+
+    store = (
+        output_path
+        if isinstance(output_path, FSMap)
+        else fsspec.get_mapper(str(output_path), **storage_options)
+    )
+
+    ed_beam_group = _get_cal_beam_group(
+        echodata, kwargs.get("waveform_mode"), kwargs.get("encode_mode")
+    )
+    beam = echodata[ed_beam_group]
+    ping_time = beam["ping_time"]
+    n_ping = ping_time.size
+    if echodata.is_ragged and COUNT_VAR in beam:
+        counts = beam[COUNT_VAR].compute()
+        range_sample = np.arange(int(counts.max()))
+    else:
+        counts = None
+        range_sample = beam["range_sample"].values
+    block_starts = range(0, n_ping, ping_block)
+    progress = {
+        "cal_type": cal_type,
+        "n_ping": n_ping,
+        "ping_block": ping_block,
+        # Blocks calibrated with other settings or pings are not resumed
+        "token": tokenize(kwargs, ping_time.values),
+    }
+
+    def _compute_block(start: int) -> xr.Dataset:
+        # Pings are selected by their times in the calibrated beam group,
+        # since ping_time may not be monotonic and other beam groups may have other pings
+        block_times = ping_time.values[start : start + ping_block]
+        ed_block = echodata._subset_time(
+            lambda t: np.isin(t, block_times), block_times.min(), block_times.max()
+        )
+        cal_ds = _compute_cal(cal_type, ed_block, **kwargs).compute()
+        if not np.array_equal(cal_ds["ping_time"].values, block_times):
+            raise RuntimeError(
+                f"The ping block starting at ping {start} has {cal_ds.sizes['ping_time']} pings "
+                f"instead of the {block_times.size} pings of its region in the store!"
+            )
+        # Blocks of ragged data are expanded to the samples of their own pings
+        return cal_ds.reindex(range_sample=range_sample)
+
+    # Resume an interrupted calibration of the same pings into this store
+    n_done = 0
+    first_block = None
+    try:
+        attrs = zarr.open_group(store, mode="r").attrs.asdict()
+    except (zarr.errors.GroupNotFoundError, zarr.errors.PathNotFoundError, KeyError):
+        attrs = {}
+    if PROGRESS_ATTR in attrs and all(
+        attrs[PROGRESS_ATTR].get(k) == v for k, v in progress.items()
+    ):
+        n_done = attrs[PROGRESS_ATTR]["n_done"]
+        logger.info(f"Resuming calibration at ping block {n_done} of {len(block_starts)}")
+    else:
+        # Initialize the store from the first block: variables along ping_time
+        # are only allocated and other variables are written
+        cal_ds = first_block = _compute_block(0)
+        template = cal_ds.drop_vars(
+            [name for name, var in cal_ds.variables.items() if "ping_time" in var.dims]
+        )
+        template = template.assign_coords(ping_time=ping_time.values)
+        for name, var in cal_ds.variables.items():
+            if "ping_time" in var.dims and name != "ping_time":
+                shape = tuple(n_ping if d == "ping_time" else var.sizes[d] for d in var.dims)
+                chunks = tuple(ping_block if d == "ping_time" else -1 for d in var.dims)
+                template[name] = (
+                    var.dims,
+                    dask.array.empty(shape, chunks=chunks, dtype=var.dtype),
+                    var.attrs,
+                )
+        if "water_level" in template and "water_level" in echodata["Platform"]:
+            # Water level is taken from all pings, not only those of the first block
+            template["water_level"] = echodata["Platform"]["water_level"].compute()
+        if counts is not None:
+            template[EXTENT_VAR] = get_sample_extents(xr.Dataset({COUNT_VAR: counts}))
+        template.attrs[PROGRESS_ATTR] = dict(progress, n_done=0)
+        template.to_zarr(store, mode="w", compute=False)
+
+    root = zarr.open_group(store, mode="r+")
+    for block_seq, start in enumerate(block_starts):
+        if block_seq < n_done:
+            continue
+        cal_ds = (
+            first_block if block_seq == 0 and first_block is not None else _compute_block(start)
+        )
+        cal_ds = cal_ds[[name for name, var in cal_ds.data_vars.items() if "ping_time" in var.dims]]
+        cal_ds = cal_ds.drop_vars([c for c in cal_ds.coords if "ping_time" not in cal_ds[c].dims])
+        cal_ds.to_zarr(store, region={"ping_time": slice(start, start + cal_ds.sizes["ping_time"])})
+        root.attrs[PROGRESS_ATTR] = dict(progress, n_done=block_seq + 1)
+        logger.debug(f"Calibrated ping block {block_seq + 1} of {len(block_starts)}")
+
+    del root.attrs[PROGRESS_ATTR]
+    zarr.consolidate_metadata(store)
+
+    return xr.open_zarr(store)
+
+
 def compute_Sv(echodata: EchoData, **kwargs) -> xr.Dataset:
     """
     Compute volume backscattering strength (Sv) from raw data.
@@ -179,6 +658,28 @@ def compute_Sv(echodata: EchoData, **kwargs) -> xr.Dataset:
         - `"power"` for power/angle samples, only allowed when
           the echosounder is configured for narrowband transmission
 
+    dtype : {"float32", "float64"}, optional
+        Data type of the calibrated samples and `echo_range`.
+        With `"float32"`, the samples are calibrated block by block and stored
+        in single precision, and the pulse compression output of EK80 broadband
+        complex samples is kept in `complex64`, which halves the size of the output
+        and intermediate arrays. Calibration parameters, ranges and the averaging of
+        the transducer sectors are still computed in double precision.
+        Defaults to `None`, i.e. double precision (`float64`). See Notes for the error bounds.
+
+    output_path : str, Path or FSMap, optional
+        Path of a zarr store to which the calibrated dataset is written block by block,
+        for data too large to be calibrated in memory. The returned dataset is then
+        lazily opened from this store. Defaults to `None`, i.e. the dataset is not written.
+
+    ping_block : int, optional
+        Number of pings calibrated and written at a time with `output_path`,
+        which is also the chunk size along `ping_time` of the store.
+        Defaults to 1000.
+
+    storage_options : dict, optional
+        Additional keywords to pass to the filesystem class of `output_path`
+
     Returns
     -------
     xr.Dataset
@@ -201,9 +702,22 @@ def compute_Sv(echodata: EchoData, **kwargs) -> xr.Dataset:
     uses band-integrated Sv with the gain computed at the center frequency
     of the transmit signal.
 
+    With ``dtype="float32"``, the calibrated values are rounded to single precision:
+    the error is at most 1e-5 dB for values of magnitude below 256 dB,
+    and the relative error of `echo_range` is at most 6e-8 (0.06 mm at 1 km).
+    For EK80 complex samples, the power is computed from single precision samples:
+    the added error is about 1e-6 dB where the transducer sectors are coherent,
+    and larger where they cancel out (e.g. incoherent noise between echoes).
+
     The returned xr.Dataset will contain the variable `water_level` from the
     EchoData object provided, if it exists. If `water_level` is not returned,
     it must be set using `EchoData.update_platform()`.
+
+    With ``output_path``, only one block of ``ping_block`` pings is held in memory
+    at a time. The number of blocks written is recorded in the
+    ``_calibration_progress`` attribute of the store, so that calling the function
+    again with the same arguments after an interruption resumes at the first block
+    not written. The attribute is removed once the calibration is complete.
     """
     return _compute_cal(cal_type="Sv", echodata=echodata, **kwargs)
 
@@ -268,6 +782,28 @@ def compute_TS(echodata: EchoData, **kwargs):
         - `"power"` for power/angle samples, only allowed when
           the echosounder is configured for narrowband transmission
 
+    dtype : {"float32", "float64"}, optional
+        Data type of the calibrated samples and `echo_range`.
+        With `"float32"`, the samples are calibrated block by block and stored
+        in single precision, and the pulse compression output of EK80 broadband
+        complex samples is kept in `complex64`, which halves the size of the output
+        and intermediate arrays. Calibration parameters, ranges and the averaging of
+        the transducer sectors are still computed in double precision.
+        Defaults to `None`, i.e. double precision (`float64`). See Notes for the error bounds.
+
+    output_path : str, Path or FSMap, optional
+        Path of a zarr store to which the calibrated dataset is written block by block,
+        for data too large to be calibrated in memory. The returned dataset is then
+        lazily opened from this store. Defaults to `None`, i.e. the dataset is not written.
+
+    ping_block : int, optional
+        Number of pings calibrated and written at a time with `output_path`,
+        which is also the chunk size along `ping_time` of the store.
+        Defaults to 1000.
+
+    storage_options : dict, optional
+        Additional keywords to pass to the filesystem class of `output_path`
+
     Returns
     -------
     xr.Dataset
@@ -290,6 +826,16 @@ def compute_TS(echodata: EchoData, **kwargs):
     uses band-integrated TS with the gain computed at the center frequency
     of the transmit signal.
 
+    With ``dtype="float32"``, the calibrated values are rounded to single precision:
+    the error is at most 1e-5 dB for values of magnitude below 256 dB,
+    and the relative error of `echo_range` is at most 6e-8 (0.06 mm at 1 km).
+    For EK80 complex samples, the power is computed from single precision samples:
+    the added error is about 1e-6 dB where the transducer sectors are coherent,
+    and larger where they cancel out (e.g. incoherent noise between echoes).
+
+    With ``output_path``, the dataset is written block by block and an interrupted
+    calibration is resumed as in ``compute_Sv``.
+
     Note that in the fisheries acoustics context, it is customary to
     associate TS to a single scatterer.
     TS is defined as: TS = 10 * np.log10 (sigma_bs), where sigma_bs
@@ -301,3 +847,104 @@ def compute_TS(echodata: EchoData, **kwargs):
     https://doi.org/10.1006/jmsc.2001.1158
     """
     return _compute_cal(cal_type="TS", echodata=echodata, **kwargs)
+
+
+def compute_Svf(
+    echodata: EchoData, frequency_resolution: Optional[float] = None, **kwargs
+) -> xr.Dataset:
+    """
+    Compute volume backscattering strength at each frequency (Sv(f))
+    from EK80 broadband complex samples.
+
+    The pulse compression output of each channel is cut into range windows
+    of a power of 2 samples covering at least twice the transmit pulse, with an overlap
+    of half a window. The spectra of all windows of a block of pings are computed at once,
+    normalized by the spectrum of the autocorrelation of the matched filter, and calibrated
+    with the calibration parameters at each frequency.
+
+    Parameters
+    ----------
+    echodata : EchoData
+        An `EchoData` object created by using `open_raw` or `open_converted`
+
+    frequency_resolution : float, optional
+        Resolution of the frequencies of the output [Hz].
+        Defaults to the frequency resolution of the range windows,
+        i.e. the decimated sampling frequency divided by the window length.
+
+    env_params : dict, optional
+        Environmental parameters needed for calibration, as in ``compute_Sv``.
+        Unless ``"sound_absorption"`` is given, the absorption is computed at each frequency.
+
+    cal_params : dict, optional
+        Calibration parameters, as in ``compute_Sv``.
+        Parameters given here or in ``ecs_file`` are used at all frequencies.
+        Otherwise, the frequency-dependent values of the broadband calibration stored in the
+        ``Vendor_specific`` group are interpolated at each frequency, and the values at the
+        center frequency are scaled with frequency for the channels without them.
+
+    ecs_file : str, optional
+        An ECS file containing calibration parameters, as in ``compute_Sv``
+
+    pc_store : str or MutableMapping, optional
+        A zarr store to which the pulse compression output is written,
+        as in ``compute``
+
+    dtype : {"float32", "float64"}, optional
+        Data type of `Svf` and `echo_range`, as in ``compute_Sv``
+
+    Returns
+    -------
+    xr.Dataset
+        The calibrated Sv(f) dataset with dimensions
+        (``channel``, ``ping_time``, ``range_window``, ``frequency``), chunked along
+        ``ping_time``, the range at the center of each window (`echo_range`),
+        and the calibration parameters and environmental variables used.
+
+    Notes
+    -----
+    Sv(f) is normalized by the duration of the range windows instead of the effective
+    pulse length, and only computed within the transmit band of each ping.
+    The spectra of the windows are normalized by the spectrum of the autocorrelation
+    without the window, so that the average of Sv(f) over the band in the linear domain
+    agrees with the band-integrated Sv of ``compute_Sv`` for volume backscattering.
+    TS(f) is the target strength of point targets at the center of the windows.
+    Frequencies outside the band and windows beyond the samples of a channel are NaN.
+    """
+    return _compute_cal_freq(
+        cal_type="Sv", echodata=echodata, frequency_resolution=frequency_resolution, **kwargs
+    )
+
+
+def compute_TSf(
+    echodata: EchoData, frequency_resolution: Optional[float] = None, **kwargs
+) -> xr.Dataset:
+    """
+    Compute target strength at each frequency (TS(f))
+    from EK80 broadband complex samples.
+
+    The spectra of the range windows are computed and calibrated as in ``compute_Svf``.
+
+    Parameters
+    ----------
+    echodata : EchoData
+        An `EchoData` object created by using `open_raw` or `open_converted`
+
+    frequency_resolution : float, optional
+        Resolution of the frequencies of the output [Hz], as in ``compute_Svf``
+
+    **kwargs
+        ``env_params``, ``cal_params``, ``ecs_file``, ``pc_store`` and ``dtype``,
+        as in ``compute_Svf``
+
+    Returns
+    -------
+    xr.Dataset
+        The calibrated TS(f) dataset with dimensions
+        (``channel``, ``ping_time``, ``range_window``, ``frequency``), chunked along
+        ``ping_time``, the range at the center of each window (`echo_range`),
+        and the calibration parameters and environmental variables used.
+    """
+    return _compute_cal_freq(
+        cal_type="TS", echodata=echodata, frequency_resolution=frequency_resolution, **kwargs
+    )
@@ -1,4 +1,4 @@
-from typing import Dict, List, Literal, Union
+from typing import Dict, Iterable, List, Literal, Union
 
 import numpy as np
 import xarray as xr
@@ -32,6 +32,18 @@ CAL_PARAMS = {
     "AZFP": ("EL", "DS", "TVR", "VTX0", "equivalent_beam_angle", "Sv_offset"),
 }
 
+# Parameters of BB channels varying with frequency in Sv(f) and TS(f),
+# with the name of their frequency-dependent values in the Vendor_specific group
+FREQ_DEP_PARAMS = {
+    "gain_correction": "gain",
+    "impedance_transducer": "impedance_transducer",
+    "angle_offset_alongship": "angle_offset_alongship",
+    "angle_offset_athwartship": "angle_offset_athwartship",
+    "beamwidth_alongship": "beamwidth_alongship",
+    "beamwidth_athwartship": "beamwidth_athwartship",
+    "equivalent_beam_angle": None,
+}
+
 EK80_DEFAULT_PARAMS = {
     "impedance_transducer": 75,
     "impedance_transceiver": 1000,
@@ -194,12 +206,17 @@ def _get_interp_da(
     -------
     xr.DataArray
         Data array aligned with the channel coordinate.
+        The ``ping_time`` dimension is only kept if the values vary with it,
+        i.e. when frequency-dependent values are interpolated at a ``freq_center``
+        varying with ``ping_time``, or when ``alternative`` or ``BB_factor`` vary with it.
+        Otherwise the output only has the ``channel`` dimension and broadcasts against
+        the ``(channel, ping_time)`` data arrays it is combined with.
 
     Note
     ----
     ``da_param`` is always an xr.DataArray from the Vendor-specific group.
     It is possible that only a subset of the channels have frequency-dependent parameter values.
-    The output xr.DataArray here is constructed channel-by-channel to allow for this flexibility.
+    These channels are interpolated together and the alternative is used for other channels.
 
     ``alternative`` can be one of the following:
 
@@ -211,51 +228,58 @@ def _get_interp_da(
         this is the case for sa_correction and gain_correction,
         which will be direct output of get_vend_cal_params_power()
     """
-    param = []
-    for ch_id in freq_center["channel"].values:
-        # if frequency-dependent param exists as a data array with desired channel
-        if (
-            da_param is not None
-            and "cal_channel_id" in da_param.coords
-            and ch_id in da_param["cal_channel_id"]
-        ):
-            # interp variable has ping_time dimension from freq_center
-            param.append(
-                da_param.sel(cal_channel_id=ch_id)
-                .interp(cal_frequency=freq_center.sel(channel=ch_id))
-                .data
+    channel = freq_center["channel"]
+
+    # Channels with frequency-dependent param values
+    if da_param is not None and "cal_channel_id" in da_param.coords:
+        is_interp = np.isin(channel.values, da_param["cal_channel_id"].values)
+    else:
+        is_interp = np.zeros(channel.size, dtype=bool)
+
+    # Alternative for the other channels, only along ping_time if it varies with it
+    if not is_interp.all():
+        if isinstance(alternative, xr.DataArray):
+            alt = alternative.sel(channel=channel.values)
+            alt = alt.squeeze(
+                [
+                    d
+                    for d in alt.dims
+                    if d not in ("channel", "ping_time") + freq_center.dims and alt.sizes[d] == 1
+                ]
             )
-        # if no frequency-dependent param exists, use alternative
-        else:
-            BB_factor_ch = (
-                BB_factor.sel(channel=ch_id) if isinstance(BB_factor, xr.DataArray) else BB_factor
+        elif isinstance(alternative, (int, float)):
+            alt = xr.DataArray(
+                np.full(channel.size, float(alternative)),
+                dims=["channel"],
+                coords={"channel": channel},
             )
-            if isinstance(alternative, xr.DataArray):
-                alt = (alternative.sel(channel=ch_id) * BB_factor_ch).data.squeeze()
-            elif isinstance(alternative, (int, float)):
-                alt = (
-                    np.array([alternative] * freq_center.sel(channel=ch_id).size).squeeze()
-                    * BB_factor_ch
-                )
-            else:
-                raise ValueError("'alternative' has to be of the type int, float, or xr.DataArray")
-            if alt.size == 1 and "ping_time" in freq_center.coords:
-                # expand to size of ping_time coordinate
-                alt = np.array([alt] * freq_center.sel(channel=ch_id).size)
-            param.append(alt)
-
-    param = np.array(param)
-
-    if "ping_time" in freq_center.coords:
-        if len(param.shape) == 1:  # this means param has only the channel but not the ping_time dim
-            param = np.expand_dims(param, axis=1)
-        return xr.DataArray(
-            param,
-            dims=["channel", "ping_time"],
-            coords={"channel": freq_center["channel"], "ping_time": freq_center["ping_time"]},
+        else:
+            raise ValueError("'alternative' has to be of the type int, float, or xr.DataArray")
+        if isinstance(BB_factor, xr.DataArray):
+            BB_factor = BB_factor.sel(channel=channel.values)
+        param = alt * BB_factor
+
+    # Interpolate all channels with frequency-dependent values at once:
+    # the interpolation is pointwise along the channel dimension shared with freq_center
+    if is_interp.any():
+        ch_interp = channel.values[is_interp]
+        param_interp = (
+            da_param.sel(cal_channel_id=ch_interp)
+            .rename(cal_channel_id="channel")
+            .assign_coords(channel=ch_interp)
+            .interp(cal_frequency=freq_center.sel(channel=ch_interp))
         )
-    else:
-        return xr.DataArray(param, dims=["channel"], coords={"channel": freq_center["channel"]})
+        if is_interp.all():
+            param = param_interp
+        else:
+            param = xr.where(
+                xr.DataArray(is_interp, dims=["channel"], coords={"channel": channel.values}),
+                param_interp.reindex(channel=channel.values),
+                param,
+            )
+
+    param = param.reset_coords(drop=True).transpose("channel", ...).rename(None)
+    return param.assign_coords(channel=channel)
 
 
 def get_vend_cal_params_power(beam: xr.Dataset, vend: xr.Dataset, param: str) -> xr.DataArray:
@@ -516,3 +540,64 @@ def get_cal_params_EK(
                         raise ValueError(f"{p} not in the defined set of calibration parameters.")
 
     return out_dict
+
+
+def get_cal_params_EK_freq(
+    cal_params: Dict[str, xr.DataArray],
+    freq_center: xr.DataArray,
+    frequency: xr.DataArray,
+    vend: xr.Dataset,
+    user_params: Iterable[str] = (),
+) -> Dict[str, xr.DataArray]:
+    """
+    Get the calibration parameters of BB channels at each frequency of their spectrum.
+
+    The frequency-dependent values of the Vendor_specific group are interpolated
+    for the channels that have them, unless the parameter was given by the user.
+    Otherwise the value at the center frequency is scaled to each frequency:
+    ``gain_correction`` by ``20 log10(f / freq_center)``,
+    ``beamwidth_alongship/athwartship`` by ``freq_center / f``
+    and ``equivalent_beam_angle`` by ``20 log10(freq_center / f)``.
+    The other parameters do not change with frequency.
+
+    Parameters
+    ----------
+    cal_params : dict
+        Calibration parameters at the center frequency, from ``get_cal_params_EK``
+    freq_center : xr.DataArray
+        Center frequency of each channel and ping
+    frequency : xr.DataArray
+        Frequencies of the spectrum, with dimension ``frequency``
+    vend : xr.Dataset
+        A subset of Vendor_specific that contains only the channels to be calibrated
+    user_params : iterable of str
+        Names of the parameters given by the user, not taken from the Vendor_specific group
+
+    Returns
+    -------
+    dict
+        The parameters of ``FREQ_DEP_PARAMS``, with dimensions
+        ``channel``, ``frequency`` and ``ping_time`` when they vary with it
+    """
+    freq_ratio = frequency / freq_center
+    scaled = {
+        "gain_correction": cal_params["gain_correction"] + 20 * np.log10(freq_ratio),
+        "beamwidth_alongship": cal_params["beamwidth_alongship"] / freq_ratio,
+        "beamwidth_athwartship": cal_params["beamwidth_athwartship"] / freq_ratio,
+        "equivalent_beam_angle": cal_params["equivalent_beam_angle"] - 20 * np.log10(freq_ratio),
+    }
+    freq = frequency.expand_dims(channel=freq_center["channel"].values).assign_coords(
+        channel=freq_center["channel"]
+    )
+
+    out_dict = {}
+    for p, p_vend in FREQ_DEP_PARAMS.items():
+        alternative = scaled.get(p, cal_params[p])
+        if not isinstance(alternative, xr.DataArray):
+            alternative = param2da(alternative, freq_center["channel"])
+        if p_vend is None or p in user_params or p_vend not in vend:
+            out_dict[p] = alternative
+        else:
+            out_dict[p] = _get_interp_da(vend[p_vend], freq, alternative)
+        out_dict[p] = out_dict[p].transpose("channel", "ping_time", ..., missing_dims="ignore")
+    return out_dict
@@ -1,4 +1,8 @@
+from functools import partial
+from typing import Optional
+
 import numpy as np
+import xarray as xr
 
 from ..echodata import EchoData
 from .cal_params import get_cal_params_AZFP
@@ -7,11 +11,64 @@ from .env_params import get_env_params_AZFP
 from .range import compute_range_AZFP
 
 
+def _cal_power_kernel_AZFP(
+    counts: np.ndarray,
+    range_meter: np.ndarray,
+    absorption: np.ndarray,
+    scale: np.ndarray,
+    *gains: np.ndarray,
+    spreading_factor: int = 1,
+    dtype: Optional[np.dtype] = None,
+) -> np.ndarray:
+    """
+    Calibrate a block of AZFP samples in one pass.
+
+    The echo level is computed from the ADC counts, the spreading and absorption losses
+    from the range of each sample, and the precomputed ``gains`` of each channel and ping
+    are subtracted in order, without full-size intermediate arrays.
+
+    Parameters
+    ----------
+    counts : np.ndarray
+        ADC counts of the samples
+    range_meter : np.ndarray
+        Range of each sample [m]
+    absorption : np.ndarray
+        Sound absorption [dB/m]
+    scale : np.ndarray
+        Echo level per ADC count [dB]
+    gains : np.ndarray
+        Terms subtracted from the compensated echo level [dB]
+    spreading_factor : int
+        1 for the spreading loss of Sv, 2 for TS
+    dtype : np.dtype, optional
+        Data type of the output, defaults to the data type of the computation
+
+    Returns
+    -------
+    np.ndarray
+        The calibrated samples
+    """
+    out = counts * scale
+    # TODO: take care of dividing by zero encountered in log10
+    out = out + 20 * np.log10(range_meter) * spreading_factor
+    out = out + 2 * absorption * range_meter
+    for gain in gains:
+        out = out - gain
+    return out if dtype is None else out.astype(dtype, copy=False)
+
+
 class CalibrateAZFP(CalibrateBase):
     def __init__(
-        self, echodata: EchoData, env_params=None, cal_params=None, ecs_file=None, **kwargs
+        self,
+        echodata: EchoData,
+        env_params=None,
+        cal_params=None,
+        ecs_file=None,
+        dtype=None,
+        **kwargs,
     ):
-        super().__init__(echodata, env_params, cal_params, ecs_file)
+        super().__init__(echodata, env_params, cal_params, ecs_file, dtype=dtype)
 
         # Set sonar_type
         self.sonar_type = "AZFP"
@@ -59,51 +116,58 @@ class CalibrateAZFP(CalibrateBase):
         # range computation different for Sv and TS per AZFP matlab code
         self.compute_echo_range(cal_type=cal_type)
 
+        beam = self.echodata["Sonar/Beam_group1"]
+
         # Compute derived params
-        # TODO: take care of dividing by zero encountered in log10
-        spreading_loss = 20 * np.log10(self.range_meter)
-        absorption_loss = 2 * self.env_params["sound_absorption"] * self.range_meter
         SL = self.cal_params["TVR"] + 20 * np.log10(self.cal_params["VTX0"])  # eq.(2)
 
         # scaling factor (slope) in Fig.G-1, units Volts/dB], see p.84
         a = self.cal_params["DS"]
-        EL = (
-            self.cal_params["EL"]
-            - 2.5 / a
-            + self.echodata["Sonar/Beam_group1"]["backscatter_r"] / (26214 * a)
-        )  # eq.(5)
+        # echo level of eq.(5), without the term of the ADC counts
+        EL_offset = self.cal_params["EL"] - 2.5 / a
 
         if cal_type == "Sv":
             # eq.(9)
-            out = (
-                EL
-                - SL
-                + spreading_loss
-                + absorption_loss
-                - 10
+            gains = [
+                SL - EL_offset,
+                10
                 * np.log10(
                     0.5
                     * self.env_params["sound_speed"]
-                    * self.echodata["Sonar/Beam_group1"]["transmit_duration_nominal"]
+                    * beam["transmit_duration_nominal"]
                     * self.cal_params["equivalent_beam_angle"]
-                )
-                + self.cal_params["Sv_offset"]
-            )  # see p.90-91 for this correction to Sv
-            out.name = "Sv"
+                ),
+                -self.cal_params["Sv_offset"],  # see p.90-91 for this correction to Sv
+            ]
+            spreading_factor = 1
 
         elif cal_type == "TS":
             # eq.(10)
-            out = EL - SL + 2 * spreading_loss + absorption_loss
-            out.name = "TS"
+            gains = [SL - EL_offset]
+            spreading_factor = 2
         else:
             raise ValueError("cal_type not recognized!")
 
+        # All ping- and channel-level terms are computed above, so that
+        # the samples are calibrated in one pass over each block
+        out = xr.apply_ufunc(
+            partial(_cal_power_kernel_AZFP, spreading_factor=spreading_factor, dtype=self.dtype),
+            beam["backscatter_r"],
+            self.range_meter,
+            self.env_params["sound_absorption"],
+            1 / (26214 * a),
+            *gains,
+            dask="parallelized",
+            output_dtypes=[self.dtype or np.float64],
+        )
+        out.name = cal_type
+
         # Attach calculated range (with units meter) into data set
         out = out.to_dataset()
         out = out.merge(self.range_meter)
 
         # Add frequency_nominal to data set
-        out["frequency_nominal"] = self.echodata["Sonar/Beam_group1"]["frequency_nominal"]
+        out["frequency_nominal"] = beam["frequency_nominal"]
 
         # Add env and cal parameters
         out = self._add_params_to_output(out)
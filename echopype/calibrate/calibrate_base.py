@@ -1,5 +1,7 @@
 import abc
 
+import numpy as np
+
 from ..echodata import EchoData
 from ..utils.log import _init_logger
 from .ecs import ECSParser
@@ -10,12 +12,17 @@ logger = _init_logger(__name__)
 class CalibrateBase(abc.ABC):
     """Class to handle calibration for all sonar models."""
 
-    def __init__(self, echodata: EchoData, env_params=None, cal_params=None, ecs_file=None):
+    def __init__(
+        self, echodata: EchoData, env_params=None, cal_params=None, ecs_file=None, dtype=None
+    ):
         self.echodata = echodata
         self.sonar_type = None
         self.ecs_file = ecs_file
         self.ecs_dict = {}
 
+        # Data type of the calibrated samples, None for the data type of the computation
+        self.dtype = None if dtype is None else np.dtype(dtype)
+
         # Set ECS to overwrite user-provided dict
         if self.ecs_file is not None:
             if env_params is not None or cal_params is not None:
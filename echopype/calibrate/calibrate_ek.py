@@ -1,30 +1,82 @@
-from typing import Dict
+from functools import partial
+from typing import Dict, MutableMapping, Optional, Union
 
 import numpy as np
 import xarray as xr
 
 from ..echodata import EchoData
 from ..echodata.simrad import retrieve_correct_beam_group
+from ..utils import uwa
 from ..utils.log import _init_logger
-from .cal_params import _get_interp_da, get_cal_params_EK
+from .cal_params import _get_interp_da, get_cal_params_EK, get_cal_params_EK_freq
 from .calibrate_base import CalibrateBase
 from .ecs import conform_channel_order, ecs_ds2dict, ecs_ev2ep
 from .ek80_complex import (
+    SPECTRUM_PING_CHUNK,
     compress_pulse,
     get_filter_coeff,
     get_norm_fac,
-    get_tau_effective,
-    get_transmit_signal,
+    get_spectral_window_len,
+    get_transmit_replicas,
+    get_window_spectra,
 )
 from .env_params import get_env_params_EK
-from .range import compute_range_EK, range_mod_TVG_EK
+from .range import compute_range_EK, get_TVG_range_offset_EK
 
 logger = _init_logger(__name__)
 
 
+def _cal_power_kernel(
+    backscatter: np.ndarray,
+    range_meter: np.ndarray,
+    tvg_range_offset: np.ndarray,
+    absorption: np.ndarray,
+    *gains: np.ndarray,
+    spreading_factor: int = 1,
+    dtype: Optional[np.dtype] = None,
+) -> np.ndarray:
+    """
+    Calibrate a block of power samples in one pass.
+
+    The TVG range, spreading and absorption losses are computed from the range
+    of each sample, and the precomputed ``gains`` of each channel and ping
+    are subtracted in order, without full-size intermediate arrays.
+
+    Parameters
+    ----------
+    backscatter : np.ndarray
+        Power samples [dB]
+    range_meter : np.ndarray
+        Range of each sample [m]
+    tvg_range_offset : np.ndarray
+        Offset of the TVG range from ``range_meter`` [m]
+    absorption : np.ndarray
+        Sound absorption [dB/m]
+    gains : np.ndarray
+        Terms subtracted from the compensated samples [dB]
+    spreading_factor : int
+        1 for the spreading loss of Sv, 2 for TS
+    dtype : np.dtype, optional
+        Data type of the output, defaults to the data type of the computation
+
+    Returns
+    -------
+    np.ndarray
+        The calibrated samples
+    """
+    tvg_mod_range = range_meter - tvg_range_offset
+    tvg_mod_range = np.where(tvg_mod_range > 0, tvg_mod_range, np.nan)
+
+    out = backscatter + 20 * np.log10(tvg_mod_range) * spreading_factor
+    out = out + 2 * absorption * tvg_mod_range
+    for gain in gains:
+        out = out - gain
+    return out if dtype is None else out.astype(dtype, copy=False)
+
+
 class CalibrateEK(CalibrateBase):
-    def __init__(self, echodata: EchoData, env_params, cal_params, ecs_file, **kwargs):
-        super().__init__(echodata, env_params, cal_params, ecs_file)
+    def __init__(self, echodata: EchoData, env_params, cal_params, ecs_file, dtype=None, **kwargs):
+        super().__init__(echodata, env_params, cal_params, ecs_file, dtype=dtype)
 
         self.ed_beam_group = None  # will be assigned in child class
 
@@ -45,7 +97,7 @@ class CalibrateEK(CalibrateBase):
             chan_sel=chan_sel,
         )
 
-    def _cal_power_samples(self, cal_type: str) -> xr.Dataset:
+    def _cal_power_samples(self, cal_type: str, dtype: Optional[np.dtype] = None) -> xr.Dataset:
         """Calibrate power data from EK60 and EK80.
 
         Parameters
@@ -53,12 +105,17 @@ class CalibrateEK(CalibrateBase):
         cal_type: str
             'Sv' for calculating volume backscattering strength, or
             'TS' for calculating target strength
+        dtype: np.dtype, optional
+            Data type of the calibrated samples, e.g. ``np.float32``.
+            Defaults to the ``dtype`` of the calibration object
 
         Returns
         -------
         xr.Dataset
             The calibrated dataset containing Sv or TS
         """
+        dtype = self.dtype if dtype is None else dtype
+
         # Select source of backscatter data
         beam = self.echodata[self.ed_beam_group]
 
@@ -66,16 +123,10 @@ class CalibrateEK(CalibrateBase):
         wavelength = self.env_params["sound_speed"] / beam["frequency_nominal"]  # wavelength
         # range_meter = self.range_meter
 
-        # TVG compensation with modified range
+        # TVG compensation with modified range, applied within the calibration kernel
         sound_speed = self.env_params["sound_speed"]
         absorption = self.env_params["sound_absorption"]
-        tvg_mod_range = range_mod_TVG_EK(
-            self.echodata, self.ed_beam_group, self.range_meter, sound_speed
-        )
-        tvg_mod_range = tvg_mod_range.where(tvg_mod_range > 0, np.nan)
-
-        spreading_loss = 20 * np.log10(tvg_mod_range)
-        absorption_loss = 2 * absorption * tvg_mod_range
+        tvg_range_offset = get_TVG_range_offset_EK(self.echodata, self.ed_beam_group, sound_speed)
 
         if cal_type == "Sv":
             # Calc gain
@@ -93,14 +144,8 @@ class CalibrateEK(CalibrateBase):
             )
 
             # Calibration and echo integration
-            out = (
-                beam["backscatter_r"]  # has beam dim
-                + spreading_loss
-                + absorption_loss
-                - CSv
-                - 2 * self.cal_params["sa_correction"]
-            )
-            out.name = "Sv"
+            gains = [CSv, 2 * self.cal_params["sa_correction"]]
+            spreading_factor = 1
 
         elif cal_type == "TS":
             # Calc gain
@@ -111,8 +156,22 @@ class CalibrateEK(CalibrateBase):
             )
 
             # Calibration and echo integration
-            out = beam["backscatter_r"] + spreading_loss * 2 + absorption_loss - CSp
-            out.name = "TS"
+            gains = [CSp]
+            spreading_factor = 2
+
+        # All ping- and channel-level terms are computed above, so that
+        # the samples are calibrated in one pass over each block
+        out = xr.apply_ufunc(
+            partial(_cal_power_kernel, spreading_factor=spreading_factor, dtype=dtype),
+            beam["backscatter_r"],  # has beam dim
+            self.range_meter,
+            tvg_range_offset,
+            absorption,
+            *gains,
+            dask="parallelized",
+            output_dtypes=[dtype or np.float64],
+        )
+        out.name = cal_type
 
         # Attach calculated range (with units meter) into data set
         out = out.to_dataset()
@@ -132,8 +191,8 @@ class CalibrateEK(CalibrateBase):
 
 
 class CalibrateEK60(CalibrateEK):
-    def __init__(self, echodata: EchoData, env_params, cal_params, ecs_file, **kwargs):
-        super().__init__(echodata, env_params, cal_params, ecs_file)
+    def __init__(self, echodata: EchoData, env_params, cal_params, ecs_file, dtype=None, **kwargs):
+        super().__init__(echodata, env_params, cal_params, ecs_file, dtype=dtype)
 
         # Set sonar_type and waveform/encode mode
         self.sonar_type = "EK60"
@@ -216,13 +275,23 @@ class CalibrateEK80(CalibrateEK):
         waveform_mode,
         encode_mode,
         ecs_file=None,
+        pc_store: Optional[Union[str, MutableMapping]] = None,
+        pc_group: str = "pulse_compressed",
+        dtype=None,
         **kwargs,
     ):
-        super().__init__(echodata, env_params, cal_params, ecs_file)
+        super().__init__(echodata, env_params, cal_params, ecs_file, dtype=dtype)
 
         # Set sonar_type
         self.sonar_type = "EK80"
 
+        # Transmit replicas and pulse compression output, computed once and shared
+        # by Sv, TS and split-beam angles, optionally spilled to a zarr store
+        self.pc_store = pc_store
+        self.pc_group = pc_group
+        self._tx = None
+        self._pc = None
+
         # The waveform and encode mode combination checked in calibrate/api.py::_compute_cal
         # so just doing assignment here
         self.waveform_mode = waveform_mode
@@ -292,6 +361,10 @@ class CalibrateEK80(CalibrateEK):
             freq=self.freq_center,
         )
 
+        # Params given by the user or the ECS file take precedence over
+        # the frequency-dependent values of the Vendor_specific group in Sv(f) and TS(f)
+        self._user_cal_params = [p for p, v in self.cal_params.items() if v is not None]
+
         # Get cal_params: depends on waveform and encode mode
         self.cal_params = get_cal_params_EK(
             waveform_mode=self.waveform_mode,
@@ -374,22 +447,13 @@ class CalibrateEK80(CalibrateEK):
 
                 # Assemble parameter data array with all channels
                 # Either interpolate or pull from narrowband input
-                # The ping_time dimension has to persist for BB case,
-                # because center frequency may change across ping
-                if "ping_time" in cal_params_dict[p].coords:
-                    ds_cal_BB[p] = _get_interp_da(
-                        da_param=ds_cal_BB[p],  # freq-dep xr.DataArray
-                        freq_center=self.freq_center,
-                        alternative=cal_params_dict[p],
-                    )
-                else:
-                    ds_cal_BB[p] = _get_interp_da(
-                        da_param=ds_cal_BB[p],  # freq-dep xr.DataArray
-                        freq_center=self.freq_center,
-                        alternative=cal_params_dict[p].expand_dims(
-                            dim={"ping_time": self.freq_center["ping_time"].size}, axis=1
-                        ),
-                    )
+                # The ping_time dimension is kept for channels interpolated at
+                # the center frequency, which may change across ping
+                ds_cal_BB[p] = _get_interp_da(
+                    da_param=ds_cal_BB[p],  # freq-dep xr.DataArray
+                    freq_center=self.freq_center,
+                    alternative=cal_params_dict[p],
+                )
 
             # Keep only 'channel' and 'ping_time' coorindates
             ds_cal_BB = ds_cal_BB.drop_dims(["cal_frequency", "cal_channel_id"])
@@ -407,6 +471,8 @@ class CalibrateEK80(CalibrateEK):
         chirp: Dict,
         z_et: float,
         z_er: float,
+        ds_tx: Optional[xr.Dataset] = None,
+        pc: Optional[xr.DataArray] = None,
     ) -> xr.DataArray:
         """
         Get power from complex samples.
@@ -416,11 +482,17 @@ class CalibrateEK80(CalibrateEK):
         beam : xr.Dataset
             EchoData["Sonar/Beam_group1"] with selected channel subset
         chirp : dict
-            a dictionary containing transmit chirp for BB channels
+            a dictionary containing transmit chirp for BB channels,
+            or the lists of replicas of each channel when ``ds_tx`` is given
         z_et : float
             impedance of transducer [ohm]
         z_er : float
             impedance of transceiver [ohm]
+        ds_tx : xr.Dataset, optional
+            ``replica_index`` and ``norm_fac`` of each ping from ``get_transmit_replicas``
+        pc : xr.DataArray, optional
+            normalized pulse compression output for BB channels,
+            computed from ``chirp`` if not given
 
         Returns
         -------
@@ -429,20 +501,34 @@ class CalibrateEK80(CalibrateEK):
         """
 
         def _get_prx(sig):
-            return (
+            if self.dtype is not None:
+                # Average the sectors in double precision
+                sig = sig.mean(dim="beam", dtype=np.complex128)
+            else:
+                sig = sig.mean(dim="beam")
+            prx = (
                 beam["beam"].size  # number of transducer sectors
-                * np.abs(sig.mean(dim="beam")) ** 2
+                * np.abs(sig) ** 2
                 / (2 * np.sqrt(2)) ** 2
                 * (np.abs(z_er + z_et) / z_er) ** 2
                 / z_et
             )
+            return prx if self.dtype is None else prx.astype(self.dtype)
 
         # Compute power
         if self.waveform_mode == "BB":
-            pc = compress_pulse(
-                backscatter=beam["backscatter_r"] + 1j * beam["backscatter_i"], chirp=chirp
-            )  # has beam dim
-            pc = pc / get_norm_fac(chirp=chirp)  # normalization for each channel
+            if pc is None and ds_tx is None:
+                pc = compress_pulse(
+                    backscatter=beam["backscatter_r"] + 1j * beam["backscatter_i"], chirp=chirp
+                )  # has beam dim
+                pc = pc / get_norm_fac(chirp=chirp)  # normalization for each channel
+            elif pc is None:
+                pc = compress_pulse(
+                    backscatter=beam["backscatter_r"] + 1j * beam["backscatter_i"],
+                    chirp=chirp,
+                    replica_index=ds_tx["replica_index"],
+                )  # has beam dim
+                pc = pc / ds_tx["norm_fac"]  # normalization for each channel and ping
             prx = _get_prx(pc)  # ensure prx is xr.DataArray
         else:
             bs_cw = beam["backscatter_r"] + 1j * beam["backscatter_i"]
@@ -452,22 +538,74 @@ class CalibrateEK80(CalibrateEK):
 
         return prx
 
-    def _get_B_theta_phi_m(self):
+    def _get_transmit_replicas(self):
+        """Get the transmit replicas of the calibrated channels, built once."""
+        if self._tx is None:
+            beam = self.echodata[self.ed_beam_group].sel(channel=self.chan_sel)
+            vend = self.echodata["Vendor_specific"].sel(channel=self.chan_sel)
+            # Switch to use Andersen implementation for transmit chirp starting v0.6.4
+            # Replicas are built once for each unique transmit configuration
+            self._tx = get_transmit_replicas(
+                beam,
+                get_filter_coeff(vend),
+                self.waveform_mode,
+                self.cal_params["receiver_sampling_frequency"],
+            )
+        return self._tx
+
+    def get_pulse_compressed(self) -> xr.DataArray:
+        """
+        Get the normalized pulse compression output of the complex samples of BB channels.
+
+        The output is computed once and shared by the computation of Sv, TS
+        and split-beam angles with this calibration object.
+        If ``pc_store`` was given, it is written to the ``pc_group`` group of this zarr store
+        and lazily read back, so that it is not recomputed nor kept in memory.
+
+        Returns
+        -------
+        xr.DataArray
+            The pulse compression output, with a ``beam`` dimension
         """
-        Get transceiver gain compensation for BB mode.
+        if self.waveform_mode != "BB":
+            raise ValueError("Pulse compression is only performed on BB mode complex samples!")
+        if self._pc is None:
+            beam = self.echodata[self.ed_beam_group].sel(channel=self.chan_sel)
+            tx, ds_tx = self._get_transmit_replicas()
+            pc = compress_pulse(
+                backscatter=beam["backscatter_r"] + 1j * beam["backscatter_i"],
+                chirp=tx,
+                replica_index=ds_tx["replica_index"],
+            )  # has beam dim
+            norm_fac = ds_tx["norm_fac"]
+            if self.dtype is not None:
+                # Keep single precision samples in single precision (complex64)
+                norm_fac = norm_fac.astype(self.dtype)
+            pc = pc / norm_fac  # normalization for each channel and ping
+            pc.name = "pulse_compressed"
+            if self.pc_store is not None:
+                pc.to_dataset().to_zarr(self.pc_store, group=self.pc_group, mode="w")
+                pc = xr.open_zarr(self.pc_store, group=self.pc_group)["pulse_compressed"]
+            self._pc = pc
+        return self._pc
+
+    def _get_B_theta_phi_m(self, cal_params: Optional[Dict] = None):
+        """
+        Get transceiver gain compensation for BB mode,
+        from ``cal_params`` if given or the calibration parameters of this object.
 
         Source: https://github.com/CRIMAC-WP4-Machine-learning/CRIMAC-Raw-To-Svf-TSf/blob/abd01f9c271bb2dbe558c80893dbd7eb0d06fe38/Core/EK80DataContainer.py#L261-L273  # noqa
         From conversation with Lars Andersen, this correction is based on a longstanding
         empirical formula used for fitting beampattern during calibration, based on
         physically meaningful parameters such as the angle offset and beamwidth.
         """
+        cal_params = self.cal_params if cal_params is None else cal_params
         fac_along = (
-            np.abs(-self.cal_params["angle_offset_alongship"])
-            / (self.cal_params["beamwidth_alongship"] / 2)
+            np.abs(-cal_params["angle_offset_alongship"]) / (cal_params["beamwidth_alongship"] / 2)
         ) ** 2
         fac_athwart = (
-            np.abs(-self.cal_params["angle_offset_athwartship"])
-            / (self.cal_params["beamwidth_athwartship"] / 2)
+            np.abs(-cal_params["angle_offset_athwartship"])
+            / (cal_params["beamwidth_athwartship"] / 2)
         ) ** 2
         B_theta_phi_m = 0.5 * 6.0206 * (fac_along + fac_athwart - 0.18 * fac_along * fac_athwart)
 
@@ -496,11 +634,7 @@ class CalibrateEK80(CalibrateEK):
         vend = self.echodata["Vendor_specific"].sel(channel=self.chan_sel)
 
         # Get transmit signal
-        tx_coeff = get_filter_coeff(vend)
-        fs = self.cal_params["receiver_sampling_frequency"]
-
-        # Switch to use Andersen implementation for transmit chirp starting v0.6.4
-        tx, tx_time = get_transmit_signal(beam, tx_coeff, self.waveform_mode, fs)
+        tx, ds_tx = self._get_transmit_replicas()
 
         # Params to clarity in use below
         z_er = self.cal_params["impedance_transceiver"]
@@ -517,66 +651,62 @@ class CalibrateEK80(CalibrateEK):
         wavelength = sound_speed / self.freq_center
         transmit_power = beam["transmit_power"]
 
-        # TVG compensation with modified range
-        tvg_mod_range = range_mod_TVG_EK(
-            self.echodata, self.ed_beam_group, range_meter, sound_speed
-        )
-        tvg_mod_range = tvg_mod_range.where(tvg_mod_range > 0, np.nan)
-
-        spreading_loss = 20 * np.log10(tvg_mod_range)
-        absorption_loss = 2 * absorption * tvg_mod_range
+        # TVG compensation with modified range, applied within the calibration kernel
+        tvg_range_offset = get_TVG_range_offset_EK(self.echodata, self.ed_beam_group, sound_speed)
 
         # Get power from complex samples
-        prx = self._get_power_from_complex(beam=beam, chirp=tx, z_et=z_et, z_er=z_er)
+        # Pulse compression output of BB channels is shared by Sv and TS
+        prx = self._get_power_from_complex(
+            beam=beam,
+            chirp=tx,
+            z_et=z_et,
+            z_er=z_er,
+            ds_tx=ds_tx,
+            pc=self.get_pulse_compressed() if self.waveform_mode == "BB" else None,
+        )
         prx = prx.where(prx > 0, np.nan)
 
         # Compute based on cal_type
         if cal_type == "Sv":
-            # Effective pulse length
-            # compute first assuming all channels are not GPT
-            tau_effective = get_tau_effective(
-                ytx_dict=tx,
-                fs_deci_dict={k: 1 / np.diff(v[:2]) for (k, v) in tx_time.items()},  # decimated fs
-                waveform_mode=self.waveform_mode,
-                channel=self.chan_sel,
-                ping_time=beam["ping_time"],
-            )
+            # Effective pulse length of each ping
             # Use pulse_duration in place of tau_effective for GPT channels
-            # TODO: below assumes that all transmit parameters are identical
-            # and needs to be changed when allowing transmit parameters to vary by ping
             ch_GPT = (vend["transceiver_type"] == "GPT").compute()
-            tau_effective[ch_GPT] = beam["transmit_duration_nominal"][ch_GPT].isel(ping_time=0)
+            tau_effective = ds_tx["tau_effective"].where(~ch_GPT, beam["transmit_duration_nominal"])
 
             # equivalent_beam_angle
             # TODO: THIS ONE CARRIES THE BEAM DIMENSION AROUND
             psifc = self.cal_params["equivalent_beam_angle"]
 
-            out = (
-                10 * np.log10(prx)
-                + spreading_loss
-                + absorption_loss
-                - 10 * np.log10(wavelength**2 * transmit_power * sound_speed / (32 * np.pi**2))
-                - 2 * gain
-                - 10 * np.log10(tau_effective)
-                - psifc
-            )
+            gains = [
+                10 * np.log10(wavelength**2 * transmit_power * sound_speed / (32 * np.pi**2)),
+                2 * gain,
+                10 * np.log10(tau_effective),
+                psifc,
+            ]
 
             # Correct for sa_correction if CW mode
             if self.waveform_mode == "CW":
-                out = out - 2 * self.cal_params["sa_correction"]
-
-            out.name = "Sv"
-            # out = out.rename_vars({list(out.data_vars.keys())[0]: "Sv"})
+                gains.append(2 * self.cal_params["sa_correction"])
+            spreading_factor = 1
 
         elif cal_type == "TS":
-            out = (
-                10 * np.log10(prx)
-                + 2 * spreading_loss
-                + absorption_loss
-                - 10 * np.log10(wavelength**2 * transmit_power / (16 * np.pi**2))
-                - 2 * gain
-            )
-            out.name = "TS"
+            gains = [
+                10 * np.log10(wavelength**2 * transmit_power / (16 * np.pi**2)),
+                2 * gain,
+            ]
+            spreading_factor = 2
+
+        out = xr.apply_ufunc(
+            partial(_cal_power_kernel, spreading_factor=spreading_factor, dtype=self.dtype),
+            10 * np.log10(prx),
+            range_meter,
+            tvg_range_offset,
+            absorption,
+            *gains,
+            dask="parallelized",
+            output_dtypes=[self.dtype or np.float64],
+        )
+        out.name = cal_type
 
         # Attach calculated range (with units meter) into data set
         out = out.to_dataset().merge(range_meter)
@@ -589,6 +719,183 @@ class CalibrateEK80(CalibrateEK):
 
         return out
 
+    def _cal_complex_samples_freq(
+        self, cal_type: str, frequency_resolution: Optional[float] = None
+    ) -> xr.Dataset:
+        """Calibrate complex data from EK80 BB channels at each frequency of their spectrum.
+
+        The pulse compression output averaged over the transducer sectors is cut
+        into overlapping range windows. The spectrum of each window is normalized
+        by the spectrum of the autocorrelation of the matched filter and calibrated
+        with the parameters at each frequency, following Andersen et al. (2021)
+        and the CRIMAC implementation cited in ``ek80_complex.py``.
+
+        Parameters
+        ----------
+        cal_type : str
+            'Sv' for calculating volume backscattering strength, or
+            'TS' for calculating target strength
+        frequency_resolution : float, optional
+            Resolution of the frequencies of the output [Hz].
+            Defaults to the resolution of the range windows of the channels,
+            i.e. their decimated sampling frequency divided by their window length.
+
+        Returns
+        -------
+        xr.Dataset
+            The calibrated dataset containing Svf or TSf
+        """
+        if self.waveform_mode != "BB":
+            raise ValueError(
+                "Frequency-dependent calibration is only performed on BB mode complex samples!"
+            )
+
+        beam = self.echodata[self.ed_beam_group].sel(channel=self.chan_sel)
+        vend = self.echodata["Vendor_specific"].sel(channel=self.chan_sel)
+        tx, ds_tx = self._get_transmit_replicas()
+
+        # Decimated sampling frequency and range window length of each channel
+        coeff = get_filter_coeff(vend)
+        fs = self.cal_params["receiver_sampling_frequency"]
+        fs_deci = {}
+        window_len = {}
+        for ch in self.chan_sel.values:
+            fs_ch = float(fs.sel(channel=ch)) if isinstance(fs, xr.DataArray) else float(fs)
+            fs_deci[str(ch)] = fs_ch / (coeff[ch]["wbt_decifac"] * coeff[ch]["pc_decifac"])
+            window_len[str(ch)] = get_spectral_window_len(
+                float(beam["transmit_duration_nominal"].sel(channel=ch).max()), fs_deci[str(ch)]
+            )
+        window_duration = xr.DataArray(
+            [window_len[str(ch)] / fs_deci[str(ch)] for ch in self.chan_sel.values],
+            dims=["channel"],
+            coords={"channel": self.chan_sel.values},
+        )
+
+        # Frequencies of the output covering the transmit band of all channels
+        freq_low = np.minimum(beam["transmit_frequency_start"], beam["transmit_frequency_stop"])
+        freq_high = np.maximum(beam["transmit_frequency_start"], beam["transmit_frequency_stop"])
+        if frequency_resolution is None:
+            frequency_resolution = min(fs_deci[ch] / window_len[ch] for ch in fs_deci)
+        frequency = xr.DataArray(
+            np.arange(
+                np.ceil(float(freq_low.min()) / frequency_resolution),
+                np.floor(float(freq_high.max()) / frequency_resolution) + 1,
+            )
+            * frequency_resolution,
+            dims=["frequency"],
+            attrs={"long_name": "Frequency of the spectrum", "units": "Hz"},
+        )
+        frequency = frequency.assign_coords(frequency=frequency)
+
+        # Spectra of the range windows, in blocks of pings
+        pc = self.get_pulse_compressed()
+        if self.dtype is not None:
+            # Average the sectors in double precision
+            pc = pc.mean(dim="beam", dtype=np.complex128)
+        else:
+            pc = pc.mean(dim="beam")
+        if pc.chunks is None:
+            pc = pc.chunk({"ping_time": SPECTRUM_PING_CHUNK})
+        spectra, window_center = get_window_spectra(
+            pc,
+            tx,
+            ds_tx["replica_index"],
+            fs_deci,
+            window_len,
+            frequency.values,
+            normalization="volume" if cal_type == "Sv" else "point",
+        )
+        spectra = spectra.where((frequency >= freq_low) & (frequency <= freq_high))
+
+        # Calibration parameters at each frequency
+        cal_params_freq = get_cal_params_EK_freq(
+            self.cal_params, self.freq_center, frequency, vend, self._user_cal_params
+        )
+        z_er = self.cal_params["impedance_transceiver"]
+        z_et = cal_params_freq["impedance_transducer"]
+        gain = cal_params_freq["gain_correction"] - self._get_B_theta_phi_m(cal_params_freq)
+
+        # Power of the spectra
+        prx = (
+            beam["beam"].size  # number of transducer sectors
+            * spectra
+            / (2 * np.sqrt(2)) ** 2
+            * (np.abs(z_er + z_et) / z_er) ** 2
+            / z_et
+        )
+        prx = prx.where(prx > 0, np.nan)
+
+        # Range at the center of each window
+        range_meter = self.range_meter.isel(
+            channel=xr.DataArray(np.arange(self.chan_sel.size), dims=["channel"]),
+            range_sample=window_center.clip(min=0),
+        )
+        range_meter = range_meter.where(window_center >= 0).drop_vars(
+            "range_sample", errors="ignore"
+        )
+
+        # Absorption at each frequency, unless given by the user at the center frequency
+        sound_speed = self.env_params["sound_speed"]
+        if "formula_absorption" in self.env_params:
+            absorption = uwa.calc_absorption(
+                frequency=frequency,
+                temperature=self.env_params["temperature"],
+                salinity=self.env_params["salinity"],
+                pressure=self.env_params["pressure"],
+                pH=self.env_params["pH"],
+                sound_speed=sound_speed,
+                formula_source=self.env_params["formula_absorption"],
+            )
+        else:
+            absorption = self.env_params["sound_absorption"]
+
+        wavelength = sound_speed / frequency
+        transmit_power = beam["transmit_power"]
+        tvg_range_offset = get_TVG_range_offset_EK(self.echodata, self.ed_beam_group, sound_speed)
+
+        if cal_type == "Sv":
+            # The window duration replaces the effective pulse length
+            gains = [
+                10 * np.log10(wavelength**2 * transmit_power * sound_speed / (32 * np.pi**2)),
+                2 * gain,
+                10 * np.log10(window_duration),
+                cal_params_freq["equivalent_beam_angle"],
+            ]
+            spreading_factor = 1
+        elif cal_type == "TS":
+            gains = [
+                10 * np.log10(wavelength**2 * transmit_power / (16 * np.pi**2)),
+                2 * gain,
+            ]
+            spreading_factor = 2
+
+        out = xr.apply_ufunc(
+            partial(_cal_power_kernel, spreading_factor=spreading_factor, dtype=self.dtype),
+            10 * np.log10(prx),
+            range_meter,
+            tvg_range_offset,
+            absorption,
+            *gains,
+            dask="parallelized",
+            output_dtypes=[self.dtype or np.float64],
+        )
+        out = out.transpose("channel", "ping_time", "range_window", "frequency")
+        out.name = f"{cal_type}f"
+
+        # Attach the range at the center of each window
+        out = out.to_dataset()
+        out["echo_range"] = range_meter.transpose("channel", "ping_time", "range_window")
+
+        # Add frequency_nominal to data set
+        out["frequency_nominal"] = beam["frequency_nominal"]
+
+        # Add env and cal parameters, with those varying with frequency
+        out = self._add_params_to_output(out)
+        out = out.assign(cal_params_freq)
+        out["sound_absorption"] = absorption
+
+        return out
+
     def _compute_cal(self, cal_type) -> xr.Dataset:
         """
         Private method to compute Sv or TS from EK80 data, called by compute_Sv or compute_TS.
@@ -639,3 +946,41 @@ class CalibrateEK80(CalibrateEK):
             and the corresponding range (``echo_range``) in units meter.
         """
         return self._compute_cal(cal_type="TS")
+
+    def compute_Svf(self, frequency_resolution: Optional[float] = None):
+        """Compute volume backscattering strength at each frequency (Sv(f)) of BB channels.
+
+        Parameters
+        ----------
+        frequency_resolution : float, optional
+            Resolution of the frequencies of the output [Hz]
+
+        Returns
+        -------
+        Svf : xr.DataSet
+            A DataSet containing the volume backscattering strength (``Svf``)
+            of each range window and frequency, and the corresponding range
+            at the center of the windows (``echo_range``) in units meter.
+        """
+        return self._cal_complex_samples_freq(
+            cal_type="Sv", frequency_resolution=frequency_resolution
+        )
+
+    def compute_TSf(self, frequency_resolution: Optional[float] = None):
+        """Compute target strength at each frequency (TS(f)) of BB channels.
+
+        Parameters
+        ----------
+        frequency_resolution : float, optional
+            Resolution of the frequencies of the output [Hz]
+
+        Returns
+        -------
+        TSf : xr.DataSet
+            A DataSet containing the target strength (``TSf``)
+            of each range window and frequency, and the corresponding range
+            at the center of the windows (``echo_range``) in units meter.
+        """
+        return self._cal_complex_samples_freq(
+            cal_type="TS", frequency_resolution=frequency_resolution
+        )
@@ -1,13 +1,36 @@
 from collections import defaultdict
-from functools import partial
-from typing import Dict, Literal, Optional, Union
+from functools import lru_cache, partial
+from typing import Dict, List, Literal, Optional, Tuple, Union
 
+import dask.array
 import numpy as np
 import xarray as xr
-from scipy import signal
+from scipy import fft as sp_fft, signal
 
 from ..convert.set_groups_ek80 import DECIMATION, FILTER_IMAG, FILTER_REAL
 
+# Minimum FFT length of the overlap-save segments of the FFT pulse compression,
+# in multiples of the replica length
+PC_FFT_SEGMENT_FACTOR = 8
+
+# Maximum number of transmit replicas kept in cache
+REPLICA_CACHE_SIZE = 256
+
+# Step between consecutive range windows of the spectral analysis,
+# in fraction of the window length
+SPECTRUM_WINDOW_STEP = 0.5
+
+# Number of pings of the blocks of the spectral analysis of samples held in memory
+SPECTRUM_PING_CHUNK = 200
+
+# Beam group variables defining the transmit signal of each ping
+TX_PARAM_NAMES = [
+    "transmit_duration_nominal",
+    "slope",
+    "transmit_frequency_start",
+    "transmit_frequency_stop",
+]
+
 
 def tapered_chirp(
     fs,
@@ -147,6 +170,16 @@ def get_filter_coeff(vend: xr.Dataset) -> Dict:
     return coeff
 
 
+def _get_tau_effective_single(ytx: np.ndarray, fs_deci: float, waveform_mode: str):
+    """Compute the effective pulse length of a transmit signal."""
+    if waveform_mode == "BB":
+        ytxa = signal.convolve(ytx, np.flip(np.conj(ytx))) / np.linalg.norm(ytx) ** 2
+        ptxa = np.abs(ytxa) ** 2
+    elif waveform_mode == "CW":
+        ptxa = np.abs(ytx) ** 2  # energy of transmit signal
+    return ptxa.sum() / (ptxa.max() * fs_deci)
+
+
 def get_tau_effective(
     ytx_dict: Dict[str, np.array],
     fs_deci_dict: Dict[str, float],
@@ -171,12 +204,7 @@ def get_tau_effective(
     """
     tau_effective = {}
     for ch, ytx in ytx_dict.items():
-        if waveform_mode == "BB":
-            ytxa = signal.convolve(ytx, np.flip(np.conj(ytx))) / np.linalg.norm(ytx) ** 2
-            ptxa = np.abs(ytxa) ** 2
-        elif waveform_mode == "CW":
-            ptxa = np.abs(ytx) ** 2  # energy of transmit signal
-        tau_effective[ch] = ptxa.sum() / (ptxa.max() * fs_deci_dict[ch])
+        tau_effective[ch] = _get_tau_effective_single(ytx, fs_deci_dict[ch], waveform_mode)
 
     # set up coordinates
     if len(ytx.shape) == 1:  # ytx is a vector (transmit signals are identical across pings)
@@ -259,6 +287,129 @@ def get_transmit_signal(
     return y_all, y_time_all
 
 
+def _get_filter_key(coeff_ch: Dict) -> Tuple:
+    """Hashable representation of the filter coefficients and decimation factors of a channel."""
+    return tuple(
+        (
+            (np.asarray(coeff_ch[k]).dtype.str, np.asarray(coeff_ch[k]).tobytes())
+            if k.endswith("fil")
+            else int(coeff_ch[k])
+        )
+        for k in ["wbt_fil", "wbt_decifac", "pc_fil", "pc_decifac"]
+    )
+
+
+@lru_cache(maxsize=REPLICA_CACHE_SIZE)
+def _build_replica(
+    tx_config: Tuple[float, float, float, float, float],
+    filter_key: Tuple,
+    waveform_mode: str,
+) -> Tuple[np.ndarray, float, float]:
+    """
+    Build a transmit replica with its effective pulse length and normalization factor.
+
+    Parameters
+    ----------
+    tx_config : tuple of float
+        The values of ``TX_PARAM_NAMES`` and the sampling frequency
+    filter_key : tuple
+        The filter coefficients and decimation factors from ``_get_filter_key``
+    waveform_mode : str
+        ``CW`` or ``BB``
+
+    Returns
+    -------
+    tuple
+        The (read-only) replica, the effective pulse length and the normalization factor
+    """
+    *tx_values, fs = tx_config
+    coeff_ch = {}
+    for k, v in zip(["wbt_fil", "wbt_decifac", "pc_fil", "pc_decifac"], filter_key):
+        coeff_ch[k] = np.frombuffer(v[1], dtype=v[0]) if k.endswith("fil") else v
+
+    y, _ = tapered_chirp(fs=fs, **{p: np.array([v]) for p, v in zip(TX_PARAM_NAMES, tx_values)})
+    y, y_time = filter_decimate_chirp(coeff_ch=coeff_ch, y_ch=y, fs=fs)
+    y.flags.writeable = False
+
+    tau_effective = _get_tau_effective_single(y, 1 / np.diff(y_time[:2]).item(), waveform_mode)
+
+    return y, float(tau_effective), float(np.linalg.norm(y) ** 2)
+
+
+def get_transmit_replicas(
+    beam: xr.Dataset,
+    coeff: Dict,
+    waveform_mode: str,
+    fs: Union[float, xr.DataArray],
+) -> Tuple[Dict[str, List[np.ndarray]], xr.Dataset]:
+    """
+    Build the transmit replicas of all pings, once per unique transmit configuration.
+
+    Pings are grouped by channel and unique values of the transmit parameters
+    (``TX_PARAM_NAMES``) and sampling frequency. The replica of each configuration
+    and its effective pulse length are built once and cached across calls,
+    so that repeated calibrations of the same data do not rebuild them.
+
+    Parameters
+    ----------
+    beam : xr.Dataset
+        EchoData["Sonar/Beam_group1"] selected with channel subset
+    coeff : dict
+        a dictionary indexed by ``channel`` and values being dictionaries containing
+        filter coefficients and decimation factors for constructing the transmit replica.
+    waveform_mode : str
+        ``CW`` for CW-mode samples, either recorded as complex or power samples
+        ``BB`` for BB-mode samples, recorded as complex samples
+    fs : float or xr.DataArray
+        receiver sampling frequency [Hz], for each channel (and ping)
+
+    Returns
+    -------
+    replicas : dict
+        The list of replicas of the transmit configurations of each ``channel``
+    ds_tx : xr.Dataset
+        The ``replica_index`` of each ping in the replicas of its channel
+        (-1 for pings without a transmit signal), and the ``tau_effective``
+        and ``norm_fac`` of each ping, with dimensions ``(channel, ping_time)``
+    """
+    if waveform_mode == "BB" and np.all(beam["transmit_type"] == "CW"):
+        raise TypeError("File does not contain BB mode complex samples!")
+
+    fs = fs if isinstance(fs, xr.DataArray) else xr.DataArray(fs)
+    tx_params = xr.broadcast(*[beam[p] for p in TX_PARAM_NAMES], fs)
+    tx_params = np.stack(
+        [da.transpose("channel", "ping_time").values.astype(np.float64) for da in tx_params],
+        axis=-1,
+    )
+
+    replicas = {}
+    n_ch, n_ping = tx_params.shape[:2]
+    replica_index = np.full((n_ch, n_ping), -1, dtype=np.int64)
+    tau_effective = np.full((n_ch, n_ping), np.nan)
+    norm_fac = np.full((n_ch, n_ping), np.nan)
+    for ch_seq, ch in enumerate(beam["channel"].values):
+        # pings without a transmit signal have NaN parameters
+        has_tx = ~np.isnan(tx_params[ch_seq]).any(axis=-1)
+        configs, inverse = np.unique(tx_params[ch_seq, has_tx], axis=0, return_inverse=True)
+        filter_key = _get_filter_key(coeff[ch])
+        built = [_build_replica(tuple(c), filter_key, waveform_mode) for c in configs.tolist()]
+        replicas[str(ch)] = [b[0] for b in built]
+        replica_index[ch_seq, has_tx] = inverse.ravel()
+        tau_effective[ch_seq, has_tx] = np.array([b[1] for b in built])[inverse.ravel()]
+        norm_fac[ch_seq, has_tx] = np.array([b[2] for b in built])[inverse.ravel()]
+
+    coords = {"channel": beam["channel"], "ping_time": beam["ping_time"]}
+    ds_tx = xr.Dataset(
+        {
+            "replica_index": (["channel", "ping_time"], replica_index),
+            "tau_effective": (["channel", "ping_time"], tau_effective),
+            "norm_fac": (["channel", "ping_time"], norm_fac),
+        },
+        coords=coords,
+    )
+    return replicas, ds_tx
+
+
 def _convolve_per_channel(backscatter_subset: np.ndarray, replica_dict: dict, channels: dict):
     """
     Convolve `backscatter_subset` array along range sample dimension for each channel.
@@ -290,7 +441,98 @@ def _convolve_per_channel(backscatter_subset: np.ndarray, replica_dict: dict, ch
         return convolved
 
 
-def compress_pulse(backscatter: xr.DataArray, chirp: Dict) -> xr.DataArray:
+def _get_replica_fft_len(n_samples: int, replica_len: int) -> int:
+    """
+    FFT length of the segments used to correlate ``n_samples`` samples with a replica.
+
+    Records shorter than a few replica lengths are transformed in one segment,
+    longer records are split into overlap-save segments.
+    """
+    segment_len = max(PC_FFT_SEGMENT_FACTOR * replica_len, 1024)
+    return sp_fft.next_fast_len(min(n_samples + replica_len - 1, segment_len))
+
+
+def _correlate_replica_fft(
+    backscatter: np.ndarray,
+    replica_fft: np.ndarray,
+    replica_len: int,
+    replica_index: Optional[np.ndarray] = None,
+    block_info: Optional[dict] = None,
+) -> np.ndarray:
+    """
+    Correlate complex samples with the transmit replica of each channel by overlap-save FFT.
+
+    The ``backscatter`` array has implicit dimensions ``(..., channel, range_sample)``
+    and the output at each sample is the correlation of the replica with the samples
+    starting at that sample, as ``_convolve_per_channel``. NaN samples are treated
+    as 0 and restored in the output.
+
+    Parameters
+    ----------
+    backscatter : np.ndarray
+        complex backscatter samples, or a dask block of them
+    replica_fft : np.ndarray
+        conjugate of the FFT of the replica of each channel, with dimensions
+        ``(channel, fft_len)``
+    replica_len : int
+        length of the longest replica
+    replica_index : np.ndarray, optional
+        index of the replica of each ping, with dimensions ``(channel, ping_time)``.
+        If given, ``backscatter`` has implicit dimensions ``(ping_time, ..., channel,
+        range_sample)`` and ``replica_fft`` has dimensions ``(channel, replica, fft_len)``
+    block_info : dict, optional
+        dask block information, used to select the replicas of the channels
+        (and pings) of the block
+
+    Returns
+    -------
+    np.ndarray
+        pulse compression output as complex64
+    """
+    if block_info is not None:
+        ch_start, ch_stop = block_info[0]["array-location"][-2]
+        replica_fft = replica_fft[ch_start:ch_stop]
+        if replica_index is not None:
+            ping_start, ping_stop = block_info[0]["array-location"][0]
+            replica_index = replica_index[ch_start:ch_stop, ping_start:ping_stop]
+    if replica_index is not None:
+        # Gather the replica of each ping, with dimensions (ping_time, ..., channel, fft_len)
+        replica_fft = replica_fft[np.arange(replica_fft.shape[0])[:, np.newaxis], replica_index]
+        replica_fft = replica_fft.transpose(1, 0, 2).reshape(
+            (replica_index.shape[1],)
+            + (1,) * (backscatter.ndim - 3)
+            + (replica_fft.shape[0], replica_fft.shape[-1])
+        )
+
+    nan_mask = np.isnan(backscatter)
+    samples = np.where(nan_mask, 0, backscatter).astype(np.complex64)
+
+    # Overlap-save segments: each segment of fft_len samples
+    # yields the output at its first `step` samples
+    n_samples = samples.shape[-1]
+    fft_len = replica_fft.shape[-1]
+    step = fft_len - replica_len + 1
+    n_seg = -(-n_samples // step)
+    samples = np.pad(
+        samples,
+        [(0, 0)] * (samples.ndim - 1) + [(0, n_seg * step + replica_len - 1 - n_samples)],
+    )
+    segments = np.lib.stride_tricks.sliding_window_view(samples, fft_len, axis=-1)[..., ::step, :]
+
+    spectrum = sp_fft.fft(segments, axis=-1)
+    spectrum *= replica_fft[..., np.newaxis, :]
+    pc = sp_fft.ifft(spectrum, axis=-1, overwrite_x=True)[..., :step]
+    pc = pc.reshape(pc.shape[:-2] + (n_seg * step,))[..., :n_samples]
+
+    return np.where(nan_mask, np.complex64(np.nan), pc).astype(np.complex64, copy=False)
+
+
+def compress_pulse(
+    backscatter: xr.DataArray,
+    chirp: Dict,
+    engine: Literal["fft", "direct"] = "fft",
+    replica_index: Optional[xr.DataArray] = None,
+) -> xr.DataArray:
     """Perform pulse compression on the backscatter data.
 
     Parameters
@@ -298,13 +540,90 @@ def compress_pulse(backscatter: xr.DataArray, chirp: Dict) -> xr.DataArray:
     backscatter : xr.DataArray
         complex backscatter samples
     chirp : dict
-        transmit chirp replica indexed by ``channel``
+        transmit chirp replica indexed by ``channel``, or the list of replicas
+        of each ``channel`` when ``replica_index`` is given
+    engine : {"fft", "direct"}, default "fft"
+        ``"fft"`` correlates blocks of pings and beams with the replica of each channel
+        by overlap-save FFT along ``range_sample``, with the FFT of each replica computed
+        once. Dask arrays are processed blockwise without rechunking.
+        ``"direct"`` convolves each ping, beam and channel separately
+        with ``scipy.signal.convolve``.
+    replica_index : xr.DataArray, optional
+        index of the replica of each ping in the lists of ``chirp``,
+        with dimensions ``(channel, ping_time)`` as returned by ``get_transmit_replicas``.
+        Pings with index -1 (no transmit signal) are compressed to 0.
 
     Returns
     -------
     xr.DataArray
         A data array containing pulse compression output.
     """
+    if engine not in ["fft", "direct"]:
+        raise ValueError("engine must be 'fft' or 'direct'!")
+
+    if replica_index is None:
+        if engine == "direct":
+            return _compress_pulse_direct(backscatter, chirp)
+        replica_lists = {str(ch): [chirp[str(ch)]] for ch in backscatter["channel"].values}
+    else:
+        replica_index = replica_index.sel(channel=backscatter["channel"])
+        replica_lists = {str(ch): list(chirp[str(ch)]) for ch in backscatter["channel"].values}
+
+    if engine == "direct":
+        # Compress all pings with each replica and keep the pings transmitted with it
+        pc = xr.where(np.isnan(backscatter), np.nan + 0j, 0j).astype(np.complex64)
+        for k in range(max(len(r) for r in replica_lists.values())):
+            pc_k = _compress_pulse_direct(
+                backscatter, {ch: r[min(k, len(r) - 1)] for ch, r in replica_lists.items()}
+            )
+            pc = xr.where(replica_index == k, pc_k, pc)
+        return pc.transpose(*backscatter.dims)
+
+    dims = backscatter.dims
+    if replica_index is not None:
+        bs = backscatter.transpose("ping_time", ..., "channel", "range_sample")
+    else:
+        bs = backscatter.transpose(..., "channel", "range_sample")
+
+    # FFT of the conjugate replicas of each channel, zero-padded to the segment length
+    replica_len = max(np.asarray(r).size for rs in replica_lists.values() for r in rs)
+    block_len = max(bs.chunksizes["range_sample"]) if bs.chunks is not None else bs.shape[-1]
+    # blocks of dask arrays are extended by the replica length
+    fft_len = _get_replica_fft_len(
+        block_len + (replica_len - 1 if bs.chunks is not None else 0), replica_len
+    )
+    n_replica = max(len(rs) for rs in replica_lists.values())
+    # The last slot is left empty for pings with index -1
+    replica_fft = np.zeros((bs.sizes["channel"], n_replica + 1, fft_len), dtype=np.complex64)
+    for ch_seq, ch in enumerate(bs["channel"].values):
+        for k, r in enumerate(replica_lists[str(ch)]):
+            replica_fft[ch_seq, k] = np.conj(sp_fft.fft(np.asarray(r), fft_len))
+
+    kwargs = dict(replica_len=replica_len)
+    if replica_index is not None:
+        kwargs["replica_index"] = replica_index.transpose("channel", "ping_time").values
+    else:
+        replica_fft = replica_fft[:, 0]
+
+    if isinstance(bs.data, dask.array.Array):
+        # Each block needs the samples of the next block within the replica length
+        pc_data = dask.array.map_overlap(
+            _correlate_replica_fft,
+            bs.data,
+            depth={bs.ndim - 1: (0, replica_len - 1)},
+            boundary="none",
+            dtype=np.complex64,
+            replica_fft=replica_fft,
+            **kwargs,
+        )
+    else:
+        pc_data = _correlate_replica_fft(bs.values, replica_fft, **kwargs)
+
+    return bs.copy(data=pc_data).transpose(*dims)
+
+
+def _compress_pulse_direct(backscatter: xr.DataArray, chirp: Dict) -> xr.DataArray:
+    """Perform pulse compression by direct convolution of each ping, beam and channel."""
     # Calculate the transmit signal values from the chirp dictionary
     replica_dict = {
         # Compute conjugate and flip for each channel's transmit signal
@@ -366,3 +685,218 @@ def get_norm_fac(chirp: Dict) -> xr.DataArray:
         norm_fac.append(np.linalg.norm(tx) ** 2)
         ch_all.append(ch)
     return xr.DataArray(norm_fac, coords={"channel": ch_all})
+
+
+def get_spectral_window_len(tau: float, fs_deci: float) -> int:
+    """
+    Get the number of samples of the range windows of the spectral analysis.
+
+    The window length is the lowest power of 2 that is at least twice
+    the number of samples of the transmit pulse.
+
+    Parameters
+    ----------
+    tau : float
+        transmit pulse duration [s]
+    fs_deci : float
+        sampling frequency of the decimated (recorded) signal [Hz]
+    """
+    return int(2 ** np.ceil(np.log2(max(2 * tau * fs_deci, 2))))
+
+
+def get_spectral_window(window_len: int) -> np.ndarray:
+    """Hann window normalized to a mean power of 1."""
+    w = np.hanning(window_len)
+    return w / (np.linalg.norm(w) / np.sqrt(window_len))
+
+
+def get_freq_index(frequency: np.ndarray, fs_deci: float, n_fft: int) -> np.ndarray:
+    """
+    Get the DFT bin of each frequency for the decimated complex samples.
+
+    The band-pass frequencies are aliased into the ``n_fft`` bins
+    of the decimated sampling frequency, and rounded to the nearest bin.
+    """
+    return np.mod(np.rint(np.asarray(frequency) / fs_deci * n_fft).astype(np.int64), n_fft)
+
+
+def get_autocorrelation_spectra(
+    replicas: List[np.ndarray],
+    window: np.ndarray,
+    n_fft: int,
+    freq_index: np.ndarray,
+    normalization: Literal["point", "volume"] = "point",
+) -> np.ndarray:
+    """
+    Get the spectra of the autocorrelation of the normalized matched filter of each replica.
+
+    The autocorrelation is cut to the window length around its peak.
+    With ``normalization="point"``, it is windowed as the range windows of the
+    pulse compression output, so that the normalized spectrum of a point target
+    at the center of a window is its backscattering cross-section.
+    With ``normalization="volume"``, it is not windowed, so that the normalized
+    spectra of volume backscattering divided by the window length average to the power
+    of the pulse compression output divided by the effective pulse length in samples,
+    as in the band-integrated Sv.
+
+    Parameters
+    ----------
+    replicas : list of np.ndarray
+        transmit replicas of a channel
+    window : np.ndarray
+        window applied to the range windows
+    n_fft : int
+        DFT length
+    freq_index : np.ndarray
+        DFT bins of the output frequencies, from ``get_freq_index``
+    normalization : {"point", "volume"}
+        Normalization of the spectra for point targets (TS) or volume backscattering (Sv)
+
+    Returns
+    -------
+    np.ndarray
+        The spectra with shape ``(n_replica + 1, n_freq)``, where the last row is NaN
+        for pings without a transmit signal (``replica_index`` -1)
+    """
+    window_len = window.size
+    spectra = np.full((len(replicas) + 1, freq_index.size), np.nan + 0j)
+    for k, y in enumerate(replicas):
+        y = np.asarray(y)
+        y_auto = signal.correlate(y, y, mode="full") / np.linalg.norm(y) ** 2
+        # Zero-pad so that the window centered on the peak is within the autocorrelation
+        y_auto = np.pad(y_auto, window_len)
+        start = window_len + y.size - 1 - window_len // 2
+        y_auto = y_auto[start : start + window_len]
+        if normalization == "point":
+            y_auto = y_auto * window
+        spectra[k] = sp_fft.fft(y_auto, n_fft)[freq_index]
+    return spectra
+
+
+def _window_spectra_kernel(
+    pc: np.ndarray,
+    replica_index: np.ndarray,
+    window: np.ndarray,
+    step: int,
+    n_fft: int,
+    freq_index: np.ndarray,
+    auto_spectra: np.ndarray,
+) -> np.ndarray:
+    """
+    Power spectra of the range windows of the pulse compression output of a channel,
+    normalized by the autocorrelation spectrum of the replica of each ping.
+
+    ``pc`` has dimensions ``(..., range_sample)`` and ``replica_index`` dimensions ``(...)``.
+    The DFT of all pings and windows are taken in a single batched call.
+    The output has dimensions ``(..., range_window, frequency)``.
+    """
+    windows = np.lib.stride_tricks.sliding_window_view(pc, window.size, axis=-1)[..., ::step, :]
+    spectra = sp_fft.fft(windows * window, n_fft, axis=-1)[..., freq_index]
+    with np.errstate(invalid="ignore"):
+        # pings without a transmit signal are divided by NaN
+        spectra /= auto_spectra[replica_index][..., np.newaxis, :]
+    return np.abs(spectra) ** 2
+
+
+def get_window_spectra(
+    pc: xr.DataArray,
+    replicas: Dict[str, List[np.ndarray]],
+    replica_index: xr.DataArray,
+    fs_deci: Dict[str, float],
+    window_len: Dict[str, int],
+    frequency: np.ndarray,
+    normalization: Literal["point", "volume"] = "point",
+) -> Tuple[xr.DataArray, xr.DataArray]:
+    """
+    Get the normalized power spectra of the range windows of the pulse compression output.
+
+    Each channel is cut into windows of ``window_len`` samples
+    overlapping by ``1 - SPECTRUM_WINDOW_STEP`` of their length,
+    and the DFT of all pings and windows of a block of pings are taken at once.
+    Dask arrays are processed blockwise along ``ping_time``.
+
+    Parameters
+    ----------
+    pc : xr.DataArray
+        normalized pulse compression output averaged over the transducer sectors,
+        with dimensions ``(channel, ping_time, range_sample)``
+    replicas : dict
+        The list of replicas of the transmit configurations of each ``channel``
+    replica_index : xr.DataArray
+        index of the replica of each ping, from ``get_transmit_replicas``
+    fs_deci : dict
+        sampling frequency of the decimated (recorded) signal of each ``channel`` [Hz]
+    window_len : dict
+        number of samples of the range windows of each ``channel``,
+        see ``get_spectral_window_len``
+    frequency : np.ndarray
+        output frequencies [Hz]
+    normalization : {"point", "volume"}
+        Normalization of the spectra for point targets at the center of the windows (TS)
+        or volume backscattering (Sv), see ``get_autocorrelation_spectra``
+
+    Returns
+    -------
+    spectra : xr.DataArray
+        The spectra, with dimensions ``(channel, ping_time, range_window, frequency)``,
+        NaN beyond the windows of channels with fewer windows
+    window_center : xr.DataArray
+        The ``range_sample`` at the center of each window, with dimensions
+        ``(channel, range_window)``
+    """
+    df = np.min(np.diff(frequency)) if frequency.size > 1 else None
+    spectra_all = []
+    center_all = []
+    for ch in pc["channel"].values:
+        pc_ch = pc.sel(channel=ch).transpose("ping_time", "range_sample")
+        if pc_ch.chunks is not None:
+            pc_ch = pc_ch.chunk({"range_sample": -1})
+        window = get_spectral_window(window_len[str(ch)])
+        step = max(int(window.size * SPECTRUM_WINDOW_STEP), 1)
+        n_window = max((pc_ch.sizes["range_sample"] - window.size) // step + 1, 0)
+        # Zero-pad the DFT to resolve the output frequencies
+        n_fft = window.size
+        if frequency.size > 1:
+            n_fft = max(n_fft, int(2 ** np.ceil(np.log2(fs_deci[str(ch)] / df))))
+        freq_index = get_freq_index(frequency, fs_deci[str(ch)], n_fft)
+        auto_spectra = get_autocorrelation_spectra(
+            replicas[str(ch)], window, n_fft, freq_index, normalization
+        )
+
+        spectra_ch = xr.apply_ufunc(
+            partial(
+                _window_spectra_kernel,
+                window=window,
+                step=step,
+                n_fft=n_fft,
+                freq_index=freq_index,
+                auto_spectra=auto_spectra,
+            ),
+            pc_ch,
+            replica_index.sel(channel=ch),
+            input_core_dims=[["range_sample"], []],
+            output_core_dims=[["range_window", "frequency"]],
+            dask="parallelized",
+            dask_gufunc_kwargs={
+                "output_sizes": {"range_window": n_window, "frequency": frequency.size},
+                # float64 output of complex input
+                "meta": np.empty((0, 0, 0), dtype=np.float64),
+            },
+        )
+        spectra_all.append(
+            spectra_ch.assign_coords(range_window=np.arange(n_window), frequency=frequency)
+        )
+        center_all.append(
+            xr.DataArray(
+                np.arange(n_window) * step + window.size // 2,
+                dims=["range_window"],
+                coords={"range_window": np.arange(n_window)},
+            )
+        )
+
+    spectra = xr.concat(spectra_all, dim="channel", join="outer")
+    window_center = xr.concat(center_all, dim="channel", join="outer", fill_value=-1)
+    return (
+        spectra.assign_coords(channel=pc["channel"]),
+        window_center.assign_coords(channel=pc["channel"]),
+    )
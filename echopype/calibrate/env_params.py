@@ -1,12 +1,14 @@
 import datetime
-from typing import Dict, List, Literal, Optional, Union
+from collections import OrderedDict
+from typing import Callable, Dict, List, Literal, Optional, Tuple, Union
 
 import numpy as np
 import xarray as xr
+from dask.base import tokenize
 
 from ..echodata import EchoData
 from ..utils import uwa
-from ..utils.align import align_to_ping_time
+from ..utils.align import align_to_ping_time, get_linear_interp_weights
 from .cal_params import param2da
 
 ENV_PARAMS = (
@@ -20,6 +22,67 @@ ENV_PARAMS = (
     "formula_absorption",
 )
 
+# Number of environmental parameter sets and interpolation weights memoized,
+# keyed on the content of their inputs. Set to 0 to disable the memoization.
+ENV_PARAMS_CACHE_SIZE = 8
+INTERP_WEIGHTS_CACHE_SIZE = 8
+
+_env_params_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_interp_weights_cache: "OrderedDict[str, Tuple]" = OrderedDict()
+
+
+def clear_env_params_cache():
+    """
+    Remove all memoized environmental parameters and interpolation weights.
+
+    The memoized parameters hold the arrays of the data they are computed from,
+    which are kept in memory until they are evicted or this function is called.
+    The memoization is disabled by setting ``ENV_PARAMS_CACHE_SIZE`` and
+    ``INTERP_WEIGHTS_CACHE_SIZE`` of ``echopype.calibrate.env_params`` to 0.
+    """
+    _env_params_cache.clear()
+    _interp_weights_cache.clear()
+
+
+def _get_memoized(cache: OrderedDict, max_size: int, key: str, compute: Callable):
+    """Get a value from a LRU cache, computing and caching it if missing."""
+    if max_size < 1:
+        return compute()
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    value = compute()
+    cache[key] = value
+    if len(cache) > max_size:
+        cache.popitem(last=False)
+    return value
+
+
+def _interp_to_ping_time(p: xr.DataArray, ping_time: xr.DataArray) -> xr.DataArray:
+    """
+    Linearly interpolate ``p`` from ``time1`` to ``ping_time``, with extrapolation.
+
+    The interpolation indices and weights are memoized, so that they are computed
+    only once for all the parameters sharing the same ``time1``.
+    """
+    if (
+        not isinstance(ping_time, xr.DataArray)
+        or p["time1"].size < 2
+        or np.array_equal(p["time1"].values, ping_time.values)
+    ):
+        return align_to_ping_time(p, "time1", ping_time, method="linear")
+
+    left, right, weight = _get_memoized(
+        _interp_weights_cache,
+        INTERP_WEIGHTS_CACHE_SIZE,
+        tokenize(p["time1"].values, ping_time.values),
+        lambda: get_linear_interp_weights(p["time1"].values, ping_time.values),
+    )
+    weight = xr.DataArray(weight, dims=["ping_time"], coords={"ping_time": ping_time.values})
+    p_left = p.isel(time1=xr.DataArray(left, dims=["ping_time"])).drop_vars("time1")
+    p_right = p.isel(time1=xr.DataArray(right, dims=["ping_time"])).drop_vars("time1")
+    return (p_left * (1 - weight) + p_right * weight).rename(p.name).assign_attrs(p.attrs)
+
 
 def harmonize_env_param_time(
     p: Union[int, float, xr.DataArray],
@@ -65,9 +128,7 @@ def harmonize_env_param_time(
             )
 
         # Align array to ping time
-        return align_to_ping_time(
-            p.dropna(dim="time1", how="all"), "time1", ping_time, method="linear"
-        )
+        return _interp_to_ping_time(p.dropna(dim="time1", how="all"), ping_time)
     return p
 
 
@@ -171,7 +232,35 @@ def get_env_params_AZFP(echodata: EchoData, user_dict: Optional[dict] = None):
     -------
     dict
         A dictionary containing the environmental parameters.
+
+    Notes
+    -----
+    The parameters are memoized on the content of ``user_dict`` and of the data
+    they are computed from, so that calibrating the same data again does not
+    recompute them.
+    See ``echopype.calibrate.clear_env_params_cache`` to release them.
     """
+    beam = echodata["Sonar/Beam_group1"]
+    key = tokenize(
+        "AZFP",
+        beam["channel"],
+        beam["frequency_nominal"],
+        beam["ping_time"],
+        echodata["Environment"]["temperature"],
+        user_dict,
+    )
+    return dict(
+        _get_memoized(
+            _env_params_cache,
+            ENV_PARAMS_CACHE_SIZE,
+            key,
+            lambda: _get_env_params_AZFP(echodata, user_dict),
+        )
+    )
+
+
+def _get_env_params_AZFP(echodata: EchoData, user_dict: Optional[dict] = None) -> Dict:
+    """Get env params using user inputs or values from data file, without memoization."""
     # AZFP only has 1 beam group
     beam = echodata["Sonar/Beam_group1"]
 
@@ -262,10 +351,43 @@ def get_env_params_EK(
     In cases when temperature, salinity, and pressure values are supplied
     by the user simultaneously, both the sound speed and absorption are re-calculated.
 
+    The parameters are memoized on the content of ``user_dict`` and of the data
+    they are computed from, so that calibrating the same data again does not
+    recompute them.
+    See ``echopype.calibrate.clear_env_params_cache`` to release them.
     """
     if sonar_type not in ["EK60", "EK80"]:
         raise ValueError("'sonar_type' has to be 'EK60' or 'EK80'")
 
+    key = tokenize(
+        "EK",
+        sonar_type,
+        beam["channel"],
+        beam["frequency_nominal"],
+        beam["ping_time"],
+        env,
+        user_dict,
+        freq,
+    )
+    return dict(
+        _get_memoized(
+            _env_params_cache,
+            ENV_PARAMS_CACHE_SIZE,
+            key,
+            lambda: _get_env_params_EK(sonar_type, beam, env, user_dict, freq),
+        )
+    )
+
+
+def _get_env_params_EK(
+    sonar_type: Literal["EK60", "EK80"],
+    beam: xr.Dataset,
+    env: xr.Dataset,
+    user_dict: Optional[Dict] = None,
+    freq: xr.DataArray = None,
+) -> Dict:
+    """Get env params using user inputs or values from data file, without memoization."""
+
     # EK80 calibration requires freq, which is the channel center frequency
     if sonar_type == "EK80":
         if freq is None:
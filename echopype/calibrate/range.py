@@ -234,3 +234,32 @@ def range_mod_TVG_EK(
             range_meter.loc[dict(channel=ch_GPT)] = range_meter.sel(channel=ch_GPT) - mod_Ex60()
 
     return range_meter
+
+
+def get_TVG_range_offset_EK(
+    echodata: EchoData, ed_beam_group: str, sound_speed: xr.DataArray
+) -> xr.DataArray:
+    """
+    Get the range offset of the TVG calculation for each channel and ping.
+
+    The modified range of ``range_mod_TVG_EK`` is ``range_meter`` minus this offset,
+    which allows applying the modification within a calibration kernel
+    without computing a full-size modified range.
+    """
+    beam = echodata[ed_beam_group]
+    vend = echodata["Vendor_specific"]
+
+    # Ex60 style hardware: 2-sample shift in the beginning
+    mod_Ex60 = 2 * beam["sample_interval"] * sound_speed / 2
+
+    if echodata.sonar_model in ["EK60", "ES70"]:
+        return mod_Ex60
+
+    # Ex80 style hardware, with the Ex60 shift added for channels with GPT
+    mod_Ex80 = sound_speed * beam["transmit_duration_nominal"] / 4
+    if "time1" in mod_Ex80.coords:
+        mod_Ex80 = mod_Ex80.squeeze().drop_vars("time1")
+    if "GPT" in vend["transceiver_type"]:
+        ch_GPT = vend["transceiver_type"] == "GPT"
+        mod_Ex80 = mod_Ex80 + mod_Ex60.where(ch_GPT.sel(channel=mod_Ex80["channel"]), 0)
+    return mod_Ex80
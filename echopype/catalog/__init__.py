@@ -0,0 +1,3 @@
+from .api import Catalog
+
+__all__ = ["Catalog"]
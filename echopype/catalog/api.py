@@ -0,0 +1,753 @@
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import fsspec
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from ..core import PathHint
+
+from ..echodata import EchoData
+from ..echodata.api import open_mfconverted
+from ..utils.align import align_to_ping_time
+from ..utils.log import _init_logger
+
+logger = _init_logger(__name__)
+
+# Tolerance in Hz when matching nominal frequencies
+FREQUENCY_TOLERANCE = 1.0
+
+# Maximum number of pings in a segment of the ping position index
+PING_SEGMENT_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    sonar_model TEXT,
+    start_time INTEGER,
+    end_time INTEGER,
+    latitude_min REAL,
+    latitude_max REAL,
+    longitude_min REAL,
+    longitude_max REAL,
+    file_size INTEGER,
+    group_shapes TEXT,
+    conversion_time TEXT
+);
+CREATE TABLE IF NOT EXISTS channels (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    channel TEXT NOT NULL,
+    frequency_nominal REAL
+);
+CREATE INDEX IF NOT EXISTS idx_files_time ON files (start_time, end_time);
+CREATE INDEX IF NOT EXISTS idx_channels_path ON channels (path);
+CREATE INDEX IF NOT EXISTS idx_channels_frequency ON channels (frequency_nominal);
+CREATE TABLE IF NOT EXISTS ping_segments (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    beam_group TEXT NOT NULL,
+    ping_start INTEGER,
+    ping_stop INTEGER,
+    latitude BLOB,
+    longitude BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_ping_segments_path ON ping_segments (path);
+CREATE VIRTUAL TABLE IF NOT EXISTS ping_segments_rtree USING rtree(
+    id, longitude_min, longitude_max, latitude_min, latitude_max
+);
+CREATE TRIGGER IF NOT EXISTS ping_segments_delete AFTER DELETE ON ping_segments
+BEGIN
+    DELETE FROM ping_segments_rtree WHERE id = OLD.id;
+END;
+"""
+
+
+def _to_ns(time: Union[str, np.datetime64, pd.Timestamp]) -> int:
+    """Convert a time-like value to integer nanoseconds since the epoch."""
+    return int(pd.Timestamp(time).value)
+
+
+def _nan_bounds(values: np.ndarray) -> Tuple[Optional[float], Optional[float]]:
+    """Min and max of an array ignoring NaN, ``None`` if all values are NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0 or np.isnan(values).all():
+        return None, None
+    return float(np.nanmin(values)), float(np.nanmax(values))
+
+
+def _get_file_size(path: str, storage_options: Dict[str, Any]) -> Optional[int]:
+    """Total size in bytes of a converted file or zarr store."""
+    try:
+        fs, fs_path = fsspec.core.url_to_fs(path, **storage_options)
+        return int(fs.du(fs_path))
+    except (OSError, ValueError):
+        return None
+
+
+def _get_ping_positions(echodata: EchoData, ping_time) -> Tuple[np.ndarray, np.ndarray]:
+    """Platform positions linearly interpolated at each ping, as in ``add_location``."""
+    ds_plat = echodata["Platform"]
+    positions = []
+    for name in ["latitude", "longitude"]:
+        if ds_plat is None or name not in ds_plat:
+            positions.append(np.full(ping_time.size, np.nan))
+            continue
+        loc = ds_plat[name]
+        time_dim = loc.dims[0]
+        loc = loc.dropna(time_dim).drop_duplicates(time_dim).sortby(time_dim)
+        positions.append(align_to_ping_time(loc, time_dim, ping_time, "linear").values)
+    return positions[0], positions[1]
+
+
+def _get_ping_chunk_starts(ds_beam) -> np.ndarray:
+    """Start index of the ping chunks of the (lazily loaded) beam group data."""
+    for var in ds_beam.data_vars.values():
+        if "ping_time" in var.dims and var.chunks is not None:
+            return np.cumsum((0,) + var.chunksizes["ping_time"][:-1])
+    return np.array([0])
+
+
+def _mask_to_ranges(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """``(start, stop)`` of each run of ``True`` values in a boolean array."""
+    edges = np.diff(np.concatenate([[False], mask, [False]]).astype(np.int8))
+    return list(zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()))
+
+
+def _points_in_polygon(
+    lon: np.ndarray, lat: np.ndarray, polygon: Sequence[Tuple[float, float]]
+) -> np.ndarray:
+    """Even-odd rule test of points against a polygon of ``(lon, lat)`` vertices."""
+    vertices = np.asarray(polygon, dtype=np.float64)
+    inside = np.zeros(lon.shape, dtype=bool)
+    for (x0, y0), (x1, y1) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        crosses = (y0 > lat) != (y1 > lat)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = x0 + (lat - y0) * (x1 - x0) / (y1 - y0)
+        inside ^= crosses & (lon < x_cross)
+    return inside
+
+
+def get_ping_segments(echodata: EchoData) -> List[Dict[str, Any]]:
+    """
+    Split the pings of each beam group into segments for the ping position index.
+
+    The position of each ping is interpolated from the Platform group,
+    as in ``consolidate.add_location``. Pings are grouped into runs of
+    at most ``PING_SEGMENT_SIZE`` pings with valid positions, which do not cross
+    the chunk boundaries along ``ping_time`` of the beam group data,
+    so that a segment maps to the chunks that need to be read.
+    Only coordinates and the Platform positions are read.
+
+    Parameters
+    ----------
+    echodata : EchoData
+        The ``EchoData`` object of a converted file
+
+    Returns
+    -------
+    list of dict
+        The segments, with keys matching the columns of the ``ping_segments`` table
+        and the position bounding box of each segment
+    """
+    segments = []
+    for beam_group in echodata.beam_group_paths:
+        ds_beam = echodata[beam_group]
+        if "ping_time" not in ds_beam.coords or ds_beam.sizes["ping_time"] == 0:
+            continue
+        lat, lon = _get_ping_positions(echodata, ds_beam["ping_time"])
+
+        # Segment boundaries: chunk boundaries, every PING_SEGMENT_SIZE pings
+        # and around pings without positions
+        n_pings = lat.size
+        is_start = np.zeros(n_pings, dtype=bool)
+        is_start[_get_ping_chunk_starts(ds_beam)] = True
+        is_start[::PING_SEGMENT_SIZE] = True
+        for start, stop in _mask_to_ranges(~(np.isnan(lat) | np.isnan(lon))):
+            starts = np.concatenate(
+                [[start], np.flatnonzero(is_start[start + 1 : stop]) + start + 1]
+            )
+            for seg_start, seg_stop in zip(starts, np.append(starts[1:], stop)):
+                seg_lat, seg_lon = lat[seg_start:seg_stop], lon[seg_start:seg_stop]
+                segments.append(
+                    {
+                        "beam_group": beam_group,
+                        "ping_start": int(seg_start),
+                        "ping_stop": int(seg_stop),
+                        "latitude": seg_lat.astype(np.float64).tobytes(),
+                        "longitude": seg_lon.astype(np.float64).tobytes(),
+                        "bounds": tuple(
+                            float(b)
+                            for b in (seg_lon.min(), seg_lon.max(), seg_lat.min(), seg_lat.max())
+                        ),
+                    }
+                )
+    return segments
+
+
+def get_file_metadata(
+    echodata: EchoData, storage_options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Extract the catalog record of a converted file from its ``EchoData`` object.
+
+    Only coordinates and small ancillary variables (``latitude``, ``longitude``,
+    ``frequency_nominal``) are read, backscatter data are never loaded.
+
+    Parameters
+    ----------
+    echodata : EchoData
+        An ``EchoData`` object that has been opened from or saved to a converted file
+    storage_options : dict, optional
+        options for cloud storage, used to obtain the file size
+
+    Returns
+    -------
+    dict
+        The catalog record, with keys matching the columns of the ``files`` table
+        and an additional ``channels`` key holding a list of
+        ``(channel, frequency_nominal)`` tuples
+    """
+    storage_options = storage_options if storage_options is not None else {}
+    if echodata.converted_raw_path is None:
+        raise ValueError(
+            "The EchoData object is not associated with a converted file. "
+            "Save it with to_zarr or to_netcdf before adding it to the catalog."
+        )
+    path = str(echodata.converted_raw_path)
+
+    # Ping time range and channels across all beam groups
+    beam_groups = [p for p in echodata.group_paths if p.startswith("Sonar/Beam_group")]
+    start_time, end_time = None, None
+    channels = {}
+    for beam_group in beam_groups:
+        ds_beam = echodata[beam_group]
+        if "ping_time" in ds_beam.coords and ds_beam.sizes["ping_time"] > 0:
+            ping_time = ds_beam["ping_time"].values
+            start = _to_ns(ping_time.min())
+            end = _to_ns(ping_time.max())
+            start_time = start if start_time is None else min(start_time, start)
+            end_time = end if end_time is None else max(end_time, end)
+        if "channel" in ds_beam.coords:
+            freq = (
+                ds_beam["frequency_nominal"].values
+                if "frequency_nominal" in ds_beam
+                else [np.nan] * ds_beam.sizes["channel"]
+            )
+            for ch, f in zip(ds_beam["channel"].values, freq):
+                channels[str(ch)] = None if np.isnan(f) else float(f)
+
+    # Bounding box of the platform positions
+    lat_min, lat_max, lon_min, lon_max = None, None, None, None
+    ds_plat = echodata["Platform"]
+    if ds_plat is not None and "latitude" in ds_plat and "longitude" in ds_plat:
+        lat_min, lat_max = _nan_bounds(ds_plat["latitude"].values)
+        lon_min, lon_max = _nan_bounds(ds_plat["longitude"].values)
+
+    ds_prov = echodata["Provenance"]
+    conversion_time = None if ds_prov is None else ds_prov.attrs.get("conversion_time", None)
+
+    group_shapes = {
+        group: {dim: int(size) for dim, size in echodata[group].sizes.items()}
+        for group in echodata.group_paths
+        if echodata[group] is not None
+    }
+
+    return {
+        "path": path,
+        "sonar_model": echodata.sonar_model,
+        "start_time": start_time,
+        "end_time": end_time,
+        "latitude_min": lat_min,
+        "latitude_max": lat_max,
+        "longitude_min": lon_min,
+        "longitude_max": lon_max,
+        "file_size": _get_file_size(path, storage_options),
+        "group_shapes": json.dumps(group_shapes),
+        "conversion_time": conversion_time,
+        "channels": list(channels.items()),
+    }
+
+
+class Catalog:
+    """
+    Index of converted files for fast time, channel and spatial queries.
+
+    The catalog is a local SQLite database that records, for each converted file,
+    the ping time range, the channels and their nominal frequencies, the sonar model,
+    the bounding box of the platform positions, the file size and the group shapes.
+    Queries are resolved against the index only, so that just the matching files
+    need to be opened. The position of each ping can also be indexed, to resolve
+    bounding box and polygon queries to the matching pings of each file.
+
+    Parameters
+    ----------
+    db_path : str or Path
+        Path to the SQLite database file. It is created if it does not exist.
+
+    Examples
+    --------
+    Index a set of converted files:
+
+    >>> catalog = echopype.catalog.Catalog("survey_catalog.db")
+    >>> catalog.add(glob.glob("converted/*.zarr"), max_workers=8)
+
+    Add a file at conversion time:
+
+    >>> ed = echopype.open_raw("file.raw", sonar_model="EK60")
+    >>> ed.to_zarr("converted/file.zarr")
+    >>> catalog.add(ed)
+
+    Find and open the files covering a time span at 38 kHz within a bounding box:
+
+    >>> ed_combined = catalog.open(
+    >>>     start_time="2023-07-04T02:00",
+    >>>     end_time="2023-07-04T04:00",
+    >>>     frequency=38000,
+    >>>     bbox=(-125.0, 44.0, -124.0, 45.0),
+    >>>     combine=True,
+    >>> )
+
+    Open only the pings located within a polygon of ``(lon, lat)`` vertices:
+
+    >>> eds = catalog.open_pings(polygon=[(-125.0, 44.0), (-124.5, 44.5), (-124.0, 44.0)])
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = str(db_path)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"<Catalog: {len(self)} files indexed in {self.db_path}>"
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def __contains__(self, path: "PathHint") -> bool:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT 1 FROM files WHERE path = ?", (str(path),)).fetchone()
+        return row is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _insert_records(self, conn: sqlite3.Connection, records: List[Dict[str, Any]]) -> None:
+        """Insert or replace file records and their channels."""
+        for record in records:
+            record = dict(record)
+            channels = record.pop("channels")
+            conn.execute("DELETE FROM files WHERE path = ?", (record["path"],))
+            conn.execute(
+                f"INSERT INTO files ({', '.join(record)}) "
+                f"VALUES ({', '.join(['?'] * len(record))})",
+                tuple(record.values()),
+            )
+            conn.executemany(
+                "INSERT INTO channels (path, channel, frequency_nominal) VALUES (?, ?, ?)",
+                [(record["path"], ch, f) for ch, f in channels],
+            )
+
+    def _insert_segments(
+        self, conn: sqlite3.Connection, path: str, segments: List[Dict[str, Any]]
+    ) -> None:
+        """Replace the ping position index of a file."""
+        conn.execute("DELETE FROM ping_segments WHERE path = ?", (path,))
+        for segment in segments:
+            cursor = conn.execute(
+                "INSERT INTO ping_segments "
+                "(path, beam_group, ping_start, ping_stop, latitude, longitude) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    path,
+                    segment["beam_group"],
+                    segment["ping_start"],
+                    segment["ping_stop"],
+                    segment["latitude"],
+                    segment["longitude"],
+                ),
+            )
+            conn.execute(
+                "INSERT INTO ping_segments_rtree VALUES (?, ?, ?, ?, ?)",
+                (cursor.lastrowid, *segment["bounds"]),
+            )
+
+    def add(
+        self,
+        sources: Union["PathHint", EchoData, Sequence[Union["PathHint", EchoData]]],
+        storage_options: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        overwrite: bool = True,
+        ping_index: bool = True,
+    ) -> int:
+        """
+        Add converted files to the catalog.
+
+        Parameters
+        ----------
+        sources : str or Path or EchoData, or a list of these
+            Paths to converted files, which are opened concurrently and lazily
+            with ``open_mfconverted``, or ``EchoData`` objects that have been
+            opened from or saved to a converted file.
+        storage_options : dict, optional
+            options for cloud storage
+        max_workers : int, optional
+            maximum number of threads used to open the files
+        overwrite : bool, default True
+            If ``False``, files already in the catalog are skipped;
+            otherwise their records are refreshed.
+        ping_index : bool, default True
+            If ``True``, index the position of each ping for ``Catalog.query_pings``.
+            The index can be built later with ``Catalog.build_ping_index``.
+
+        Returns
+        -------
+        int
+            The number of files added or refreshed
+        """
+        storage_options = storage_options if storage_options is not None else {}
+        if isinstance(sources, (str, Path, EchoData)):
+            sources = [sources]
+
+        echodata_list = [s for s in sources if isinstance(s, EchoData)]
+        paths = [str(s) for s in sources if not isinstance(s, EchoData)]
+        if not overwrite:
+            paths = [p for p in paths if p not in self]
+            echodata_list = [ed for ed in echodata_list if str(ed.converted_raw_path) not in self]
+        if paths:
+            echodata_list += open_mfconverted(
+                paths, storage_options=storage_options, max_workers=max_workers
+            )
+
+        records = [get_file_metadata(ed, storage_options) for ed in echodata_list]
+        with closing(self._connect()) as conn, conn:
+            self._insert_records(conn, records)
+            if ping_index:
+                for ed, record in zip(echodata_list, records):
+                    self._insert_segments(conn, record["path"], get_ping_segments(ed))
+
+        logger.info(f"{len(records)} files added to catalog {self.db_path}")
+        return len(records)
+
+    def build_ping_index(
+        self,
+        paths: Optional[Union["PathHint", Sequence["PathHint"]]] = None,
+        storage_options: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        overwrite: bool = False,
+    ) -> int:
+        """
+        Index the ping positions of files already in the catalog.
+
+        Parameters
+        ----------
+        paths : str or Path or list of str or Path, optional
+            Paths of the files to index, as recorded in the catalog.
+            Defaults to all files in the catalog.
+        storage_options : dict, optional
+            options for cloud storage
+        max_workers : int, optional
+            maximum number of threads used to open the files
+        overwrite : bool, default False
+            If ``False``, files that already have a ping position index are skipped
+
+        Returns
+        -------
+        int
+            The number of files indexed
+        """
+        storage_options = storage_options if storage_options is not None else {}
+        with closing(self._connect()) as conn:
+            indexed = {r[0] for r in conn.execute("SELECT DISTINCT path FROM ping_segments")}
+            cataloged = [r[0] for r in conn.execute("SELECT path FROM files")]
+        if paths is None:
+            paths = cataloged
+        else:
+            paths = [str(p) for p in ([paths] if isinstance(paths, (str, Path)) else paths)]
+            missing = set(paths) - set(cataloged)
+            if missing:
+                raise ValueError(f"Files not in the catalog: {sorted(missing)}")
+        if not overwrite:
+            paths = [p for p in paths if p not in indexed]
+        if not paths:
+            return 0
+
+        echodata_list = open_mfconverted(
+            paths, storage_options=storage_options, max_workers=max_workers
+        )
+        with closing(self._connect()) as conn, conn:
+            for path, ed in zip(paths, echodata_list):
+                self._insert_segments(conn, path, get_ping_segments(ed))
+
+        logger.info(f"Ping positions of {len(paths)} files indexed in catalog {self.db_path}")
+        return len(paths)
+
+    def remove(self, paths: Union["PathHint", Sequence["PathHint"]]) -> None:
+        """
+        Remove files from the catalog.
+
+        Parameters
+        ----------
+        paths : str or Path or list of str or Path
+            Paths of the files to remove, as recorded in the catalog
+        """
+        if isinstance(paths, (str, Path)):
+            paths = [paths]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM files WHERE path = ?", [(str(p),) for p in paths])
+
+    def query(
+        self,
+        start_time: Optional[Union[str, np.datetime64, pd.Timestamp]] = None,
+        end_time: Optional[Union[str, np.datetime64, pd.Timestamp]] = None,
+        frequency: Optional[Union[float, Sequence[float]]] = None,
+        channel: Optional[Union[str, Sequence[str]]] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        sonar_model: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Find the files matching all given criteria.
+
+        Parameters
+        ----------
+        start_time, end_time : str or datetime-like, optional
+            Files whose ping time range overlaps ``[start_time, end_time]`` are selected
+        frequency : float or list of float, optional
+            Nominal frequencies in Hz. Files containing at least one channel at any of
+            these frequencies are selected.
+        channel : str or list of str, optional
+            Files containing at least one of these channels are selected
+        bbox : tuple of float, optional
+            ``(lon_min, lat_min, lon_max, lat_max)``. Files whose position bounding box
+            intersects ``bbox`` are selected. Files without valid positions are excluded.
+        sonar_model : str, optional
+            Files from this sonar model are selected
+
+        Returns
+        -------
+        list of str
+            Paths of the matching files, sorted by start time
+        """
+        clauses, params = [], []
+        if start_time is not None:
+            clauses.append("end_time >= ?")
+            params.append(_to_ns(start_time))
+        if end_time is not None:
+            clauses.append("start_time <= ?")
+            params.append(_to_ns(end_time))
+        if sonar_model is not None:
+            clauses.append("sonar_model = ?")
+            params.append(sonar_model.upper())
+        if bbox is not None:
+            lon_min, lat_min, lon_max, lat_max = bbox
+            clauses.append(
+                "latitude_max >= ? AND latitude_min <= ? "
+                "AND longitude_max >= ? AND longitude_min <= ?"
+            )
+            params += [lat_min, lat_max, lon_min, lon_max]
+        if frequency is not None:
+            frequency = np.atleast_1d(frequency).astype(float).tolist()
+            freq_clause = " OR ".join(["ABS(frequency_nominal - ?) < ?"] * len(frequency))
+            clauses.append(f"path IN (SELECT path FROM channels WHERE {freq_clause})")
+            for f in frequency:
+                params += [f, FREQUENCY_TOLERANCE]
+        if channel is not None:
+            channel = [channel] if isinstance(channel, str) else list(channel)
+            clauses.append(
+                f"path IN (SELECT path FROM channels WHERE channel IN "
+                f"({', '.join(['?'] * len(channel))}))"
+            )
+            params += channel
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT path FROM files {where} ORDER BY start_time, path", params
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def query_pings(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        polygon: Optional[Sequence[Tuple[float, float]]] = None,
+        beam_group: Optional[str] = None,
+    ) -> List[Tuple[str, str, slice]]:
+        """
+        Find the pings located within a bounding box and/or a polygon.
+
+        The query is resolved with the ping position index: candidate segments
+        are found with an R-tree over their bounding boxes and the position of
+        each of their pings is then tested. Files added with ``ping_index=False``
+        and not indexed with ``Catalog.build_ping_index`` are not searched.
+
+        Parameters
+        ----------
+        bbox : tuple of float, optional
+            ``(lon_min, lat_min, lon_max, lat_max)``
+        polygon : list of tuple of float, optional
+            The ``(lon, lat)`` vertices of a polygon
+        beam_group : str, optional
+            Restrict the query to this beam group, e.g. ``"Sonar/Beam_group1"``
+
+        Returns
+        -------
+        list of tuple
+            ``(path, beam_group, ping_slice)`` of each run of consecutive matching pings,
+            where ``ping_slice`` indexes ``ping_time`` in the beam group,
+            sorted by file start time
+        """
+        if bbox is None and polygon is None:
+            raise ValueError("Either bbox or polygon must be given!")
+        lon_min, lat_min, lon_max, lat_max = -np.inf, -np.inf, np.inf, np.inf
+        if bbox is not None:
+            lon_min, lat_min, lon_max, lat_max = bbox
+        if polygon is not None:
+            vertices = np.asarray(polygon, dtype=np.float64)
+            lon_min, lat_min = np.maximum((lon_min, lat_min), vertices.min(axis=0))
+            lon_max, lat_max = np.minimum((lon_max, lat_max), vertices.max(axis=0))
+
+        clauses = [
+            "r.longitude_max >= ? AND r.longitude_min <= ? "
+            "AND r.latitude_max >= ? AND r.latitude_min <= ?"
+        ]
+        params = [float(lon_min), float(lon_max), float(lat_min), float(lat_max)]
+        if beam_group is not None:
+            clauses.append("s.beam_group = ?")
+            params.append(beam_group)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT s.path, s.beam_group, s.ping_start, s.latitude, s.longitude "
+                "FROM ping_segments_rtree r "
+                "JOIN ping_segments s ON s.id = r.id "
+                "JOIN files f ON f.path = s.path "
+                f"WHERE {' AND '.join(clauses)} "
+                "ORDER BY f.start_time, s.path, s.beam_group, s.ping_start",
+                params,
+            ).fetchall()
+
+        results = []
+        for path, group, ping_start, lat_bytes, lon_bytes in rows:
+            lat = np.frombuffer(lat_bytes, dtype=np.float64)
+            lon = np.frombuffer(lon_bytes, dtype=np.float64)
+            mask = (lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max)
+            if polygon is not None:
+                mask &= _points_in_polygon(lon, lat, polygon)
+            for start, stop in _mask_to_ranges(mask):
+                start, stop = ping_start + start, ping_start + stop
+                # Merge runs continuing across segments
+                if results and results[-1][:2] == (path, group) and results[-1][2].stop == start:
+                    start = results.pop()[2].start
+                results.append((path, group, slice(start, stop)))
+        return results
+
+    def open_pings(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        polygon: Optional[Sequence[Tuple[float, float]]] = None,
+        storage_options: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[EchoData]:
+        """
+        Open the pings located within a bounding box and/or a polygon.
+
+        The files containing matching pings in their first beam group are opened lazily
+        and restricted to these pings with ``EchoData.isel_time``, so that only
+        the chunks holding them are read.
+
+        Parameters
+        ----------
+        bbox : tuple of float, optional
+            ``(lon_min, lat_min, lon_max, lat_max)``
+        polygon : list of tuple of float, optional
+            The ``(lon, lat)`` vertices of a polygon
+        storage_options : dict, optional
+            options for cloud storage
+        max_workers : int, optional
+            maximum number of threads used to open the files
+
+        Returns
+        -------
+        list of EchoData
+            The ``EchoData`` object of each matching file restricted to the matching pings,
+            sorted by start time
+        """
+        ping_slices: Dict[str, List[slice]] = {}
+        for path, group, ping_slice in self.query_pings(bbox=bbox, polygon=polygon):
+            if group == "Sonar/Beam_group1":
+                ping_slices.setdefault(path, []).append(ping_slice)
+        if not ping_slices:
+            raise ValueError("No pings in the catalog match the query!")
+
+        echodata_list = open_mfconverted(
+            list(ping_slices),
+            storage_options=storage_options if storage_options is not None else {},
+            max_workers=max_workers,
+        )
+        return [
+            ed.isel_time(np.concatenate([np.arange(s.start, s.stop) for s in slices]))
+            for ed, slices in zip(echodata_list, ping_slices.values())
+        ]
+
+    def open(
+        self,
+        storage_options: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        combine: bool = False,
+        channel_selection: Optional[Union[List, Dict[str, list]]] = None,
+        **query_kwargs,
+    ) -> Union[List[EchoData], EchoData]:
+        """
+        Open the files matching a query with ``open_mfconverted``.
+
+        Parameters
+        ----------
+        storage_options : dict, optional
+            options for cloud storage
+        max_workers : int, optional
+            maximum number of threads used to open the files
+        combine : bool, default False
+            If ``True``, combine the opened files with ``combine_echodata``
+        channel_selection : list of str or dict, optional
+            Passed to ``combine_echodata`` when ``combine=True``
+        **query_kwargs
+            Query criteria passed to ``Catalog.query``
+
+        Returns
+        -------
+        list of EchoData or EchoData
+            The lazily loaded ``EchoData`` objects sorted by start time,
+            or a single combined ``EchoData`` object if ``combine=True``
+        """
+        paths = self.query(**query_kwargs)
+        if not paths:
+            raise ValueError("No files in the catalog match the query!")
+        return open_mfconverted(
+            paths,
+            storage_options=storage_options,
+            max_workers=max_workers,
+            combine=combine,
+            channel_selection=channel_selection,
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Return the file records as a DataFrame.
+
+        Times are converted to ``datetime64`` and the channels and nominal frequencies
+        of each file are gathered in the ``channels`` and ``frequency_nominal`` columns.
+        """
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query("SELECT * FROM files ORDER BY start_time, path", conn)
+            df_ch = pd.read_sql_query("SELECT * FROM channels", conn)
+        df_ch = df_ch.groupby("path").agg(list)
+        df = df.join(df_ch, on="path")
+        df = df.rename(columns={"channel": "channels"})
+        for col in ["start_time", "end_time"]:
+            df[col] = pd.to_datetime(df[col], unit="ns")
+        return df.set_index("path")
@@ -10,6 +10,7 @@ from geopy import distance
 
 from ..consolidate.api import POSITION_VARIABLES
 from ..utils.compute import _lin2log, _log2lin
+from ..utils.ragged import COUNT_VAR, EXTENT_VAR
 
 logger = logging.getLogger(__name__)
 
@@ -582,22 +583,38 @@ def _groupby_x_along_channels(
                 f"The ```{array_name}``` coordinate array contain NaNs. {aggregation_msg}"
             )
 
-    # reduce along ping_time or distance_nmi
-    # and echo_range or depth
-    # by binning and averaging
-    sv_mean = xarray_reduce(
-        sv,
-        ds_Sv["channel"],
-        ds_Sv[x_var],
-        ds_Sv[range_var],
-        expected_groups=(None, x_interval, range_interval),
-        isbin=[False, True, True],
-        method=method,
-        func=func,
-        skipna=skipna,
-        **flox_kwargs,
-    )
-    return sv_mean
+    def _reduce(sv, ds_Sv):
+        # reduce along ping_time or distance_nmi
+        # and echo_range or depth
+        # by binning and averaging
+        return xarray_reduce(
+            sv,
+            ds_Sv["channel"],
+            ds_Sv[x_var],
+            ds_Sv[range_var],
+            expected_groups=(None, x_interval, range_interval),
+            isbin=[False, True, True],
+            method=method,
+            func=func,
+            skipna=skipna,
+            **flox_kwargs,
+        )
+
+    # Reduce each channel only over its sample extent when known,
+    # skipping the padding added to match the longer pings of other channels,
+    # and only over its own pings for multiplexed channels
+    if EXTENT_VAR in ds_Sv and "range_sample" in ds_Sv[range_var].dims:
+        sv_mean = []
+        for ch_idx, extent in enumerate(ds_Sv[EXTENT_VAR].values):
+            sel = {"channel": [ch_idx], "range_sample": slice(0, max(int(extent), 1))}
+            if COUNT_VAR in ds_Sv and x_var in ds_Sv[COUNT_VAR].dims:
+                pinged = ds_Sv[COUNT_VAR].isel(channel=ch_idx).values > 0
+                if pinged.any():
+                    sel[x_var] = np.flatnonzero(pinged)
+            sv_mean.append(_reduce(sv.isel(sel), ds_Sv.isel(sel)))
+        return xr.concat(sv_mean, dim="channel")
+
+    return _reduce(sv, ds_Sv)
 
 
 def assign_actual_range(ds_MVBS: xr.Dataset) -> xr.Dataset:
@@ -3,12 +3,63 @@ Contains functions necessary to compute the split-beam (alongship/athwartship)
 angles and add them to a Dataset.
 """
 
-from typing import List, Tuple
+from functools import partial
+from typing import List, Optional, Tuple
 
 import numpy as np
 import xarray as xr
 
-from ..calibrate.ek80_complex import compress_pulse, get_norm_fac, get_transmit_signal
+from ..calibrate.ek80_complex import compress_pulse, get_transmit_replicas
+
+# Beam types of split-beam transducers with 3 sectors, with or without a center element
+BEAM_TYPES_3_SECTOR = [17, 49, 65, 81]
+
+
+def _angle_complex_kernel(
+    bs: np.ndarray,
+    sens_along: np.ndarray,
+    sens_athwart: np.ndarray,
+    offset_along: np.ndarray,
+    offset_athwart: np.ndarray,
+    beam_type: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute split-beam angles of a block of complex samples in one pass.
+
+    ``bs`` has the transducer sectors along its last axis. The sector sums are not
+    halved into averages, since this does not change the phase differences.
+    The angles are computed in the precision of ``bs``:
+    float32 for complex64 samples, float64 otherwise.
+    """
+    dtype = np.float32 if bs.dtype == np.complex64 else np.float64
+
+    if beam_type == 1:
+        # 4-sector transducer
+        bs_fore = bs[..., 2] + bs[..., 3]
+        bs_aft = bs[..., 0] + bs[..., 1]
+        theta = np.angle(bs_fore * np.conj(bs_aft), deg=True)
+        del bs_fore, bs_aft
+        bs_star = bs[..., 0] + bs[..., 3]
+        bs_port = bs[..., 1] + bs[..., 2]
+        phi = np.angle(bs_star * np.conj(bs_port), deg=True)
+    else:
+        # 3-sector transducer with or without center element
+        if beam_type == 17:
+            bs_star, bs_port, bs_fore = bs[..., 0], bs[..., 1], bs[..., 2]
+        else:
+            bs_star = bs[..., 0] + bs[..., 3]
+            bs_port = bs[..., 1] + bs[..., 3]
+            bs_fore = bs[..., 2] + bs[..., 3]
+        fac1 = np.angle(bs_fore * np.conj(bs_star), deg=True)
+        fac2 = np.angle(bs_fore * np.conj(bs_port), deg=True)
+        theta = (fac1 + fac2) / dtype(np.sqrt(3))
+        phi = np.subtract(fac2, fac1, out=fac2)
+
+    theta = np.asarray(theta, dtype=dtype) / np.asarray(sens_along, dtype=dtype)
+    theta -= np.asarray(offset_along, dtype=dtype)
+    phi = np.asarray(phi, dtype=dtype) / np.asarray(sens_athwart, dtype=dtype)
+    phi -= np.asarray(offset_athwart, dtype=dtype)
+    return theta, phi
 
 
 def _compute_angle_from_complex(
@@ -19,6 +70,8 @@ def _compute_angle_from_complex(
 
     Can be used for data from a single channel or multiple channels,
     depending on what is in ``bs``.
+    The angles are computed block by block along ``ping_time`` and ``range_sample``
+    for dask arrays, in float32 for complex64 samples.
 
     Parameters
     ----------
@@ -46,51 +99,36 @@ def _compute_angle_from_complex(
     -----
     This function should only be used for data with complex backscatter.
     """
-
-    # 4-sector transducer
-    if beam_type == 1:
-        bs_fore = (bs.isel(beam=2) + bs.isel(beam=3)) / 2  # forward
-        bs_aft = (bs.isel(beam=0) + bs.isel(beam=1)) / 2  # aft
-        bs_star = (bs.isel(beam=0) + bs.isel(beam=3)) / 2  # starboard
-        bs_port = (bs.isel(beam=1) + bs.isel(beam=2)) / 2  # port
-
-        bs_theta = bs_fore * np.conj(bs_aft)
-        bs_phi = bs_star * np.conj(bs_port)
-        theta = np.arctan2(np.imag(bs_theta), np.real(bs_theta)) / np.pi * 180
-        phi = np.arctan2(np.imag(bs_phi), np.real(bs_phi)) / np.pi * 180
-
-    # 3-sector transducer with or without center element
-    elif beam_type in [17, 49, 65, 81]:
-        # 3-sector
-        if beam_type == 17:
-            bs_star = bs.isel(beam=0)
-            bs_port = bs.isel(beam=1)
-            bs_fore = bs.isel(beam=2)
-        else:
-            # 3-sector + 1 center element
-            bs_star = (bs.isel(beam=0) + bs.isel(beam=3)) / 2
-            bs_port = (bs.isel(beam=1) + bs.isel(beam=3)) / 2
-            bs_fore = (bs.isel(beam=2) + bs.isel(beam=3)) / 2
-
-        bs_fac1 = bs_fore * np.conj(bs_star)
-        bs_fac2 = bs_fore * np.conj(bs_port)
-        fac1 = np.arctan2(np.imag(bs_fac1), np.real(bs_fac1)) / np.pi * 180
-        fac2 = np.arctan2(np.imag(bs_fac2), np.real(bs_fac2)) / np.pi * 180
-
-        theta = (fac1 + fac2) / np.sqrt(3)
-        phi = fac2 - fac1
+    beam_type = int(beam_type)
 
     # EC150–3C
-    elif beam_type == 97:
+    if beam_type == 97:
         raise NotImplementedError
-
-    else:
+    elif beam_type != 1 and beam_type not in BEAM_TYPES_3_SECTOR:
         raise ValueError("beam_type not recognized!")
 
-    theta = theta / sens[0] - offset[0]
-    phi = phi / sens[1] - offset[1]
-
-    return theta, phi
+    if bs.chunks is not None:
+        # All sectors of a sample are needed in the same block
+        bs = bs.chunk({"beam": -1})
+    dtype = np.float32 if bs.dtype == np.complex64 else np.float64
+
+    theta, phi = xr.apply_ufunc(
+        partial(_angle_complex_kernel, beam_type=beam_type),
+        bs,
+        sens[0],
+        sens[1],
+        offset[0],
+        offset[1],
+        input_core_dims=[["beam"], [], [], [], []],
+        output_core_dims=[[], []],
+        dask="parallelized",
+        dask_gufunc_kwargs={
+            # real output of complex input
+            "meta": tuple(np.empty((0,) * (bs.ndim - 1), dtype=dtype) for _ in range(2)),
+        },
+    )
+    dims = [d for d in bs.dims if d != "beam"]
+    return theta.transpose(*dims, ...), phi.transpose(*dims, ...)
 
 
 def get_angle_power_samples(
@@ -151,7 +189,10 @@ def get_angle_power_samples(
 
 
 def get_angle_complex_samples(
-    ds_beam: xr.Dataset, angle_params: dict, pc_params: dict = None
+    ds_beam: xr.Dataset,
+    angle_params: dict,
+    pc_params: dict = None,
+    pc: Optional[xr.DataArray] = None,
 ) -> Tuple[xr.DataArray, xr.DataArray]:
     """
     Obtain split-beam angle from CW or BB mode complex samples.
@@ -166,6 +207,9 @@ def get_angle_complex_samples(
     pc_params : dict
         Parameters needed for pulse compression
         This dict also serves as a flag for whether to apply pulse compression
+    pc : xr.DataArray, optional
+        Normalized pulse compression output already computed for the calibration,
+        used in place of the complex samples of ``ds_beam``
 
     Returns
     -------
@@ -179,15 +223,18 @@ def get_angle_complex_samples(
     bs = ds_beam["backscatter_r"] + 1j * ds_beam["backscatter_i"]
 
     # Pulse compression if pc_params exists
-    if pc_params is not None:
-        tx, tx_time = get_transmit_signal(
+    if pc is not None:
+        bs = pc
+    elif pc_params is not None:
+        tx, ds_tx = get_transmit_replicas(
             beam=ds_beam,
             coeff=pc_params,  # this is filter_coeff with fs added
             waveform_mode="BB",
             fs=pc_params["receiver_sampling_frequency"],  # this is the added fs
         )
-        bs = compress_pulse(backscatter=bs, chirp=tx)  # has beam dim
-        bs = bs / get_norm_fac(chirp=tx)  # normalization for each channel
+        # has beam dim
+        bs = compress_pulse(backscatter=bs, chirp=tx, replica_index=ds_tx["replica_index"])
+        bs = bs / ds_tx["norm_fac"]  # normalization for each channel and ping
 
     # Compute angles
     # unique beam_type existing in the dataset
@@ -227,22 +274,8 @@ def get_angle_complex_samples(
             theta.append(theta_ch)
             phi.append(phi_ch)
 
-        # Combine angles from all channels
-        theta = xr.DataArray(
-            data=theta,
-            coords={
-                "channel": bs["channel"],
-                "ping_time": bs["ping_time"],
-                "range_sample": bs["range_sample"],
-            },
-        )
-        phi = xr.DataArray(
-            data=phi,
-            coords={
-                "channel": bs["channel"],
-                "ping_time": bs["ping_time"],
-                "range_sample": bs["range_sample"],
-            },
-        )
+        # Combine angles from all channels, lazily for dask arrays
+        theta = xr.concat(theta, dim="channel").transpose("channel", ...)
+        phi = xr.concat(phi, dim="channel").transpose("channel", ...)
 
     return theta, phi
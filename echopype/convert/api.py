@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Literal, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, Literal, Optional, Tuple, Union
 
 import fsspec
 from xarray import DataTree
@@ -16,6 +16,7 @@ from ..utils import io
 from ..utils.coding import COMPRESSION_SETTINGS
 from ..utils.log import _init_logger
 from ..utils.prov import add_processing_level
+from . import cache
 
 BEAM_SUBGROUP_DEFAULT = "Beam_group1"
 
@@ -354,6 +355,9 @@ def open_raw(
     storage_options: Optional[Dict[str, str]] = None,
     use_swap: Union[bool, Literal["auto"]] = False,
     max_chunk_size: str = "100MB",
+    ragged: bool = False,
+    use_cache: bool = False,
+    cache_options: Optional[Dict[str, Any]] = None,
 ) -> EchoData:
     """Create an EchoData object containing parsed data from a single raw data file.
 
@@ -395,6 +399,24 @@ def open_raw(
     max_mb : int
         The maximum data chunk size in Megabytes (MB), when offloading
         variables with a large memory footprint to a temporary zarr store
+    ragged : bool, default False
+        Flag to store the beam group variables along ``range_sample``
+        as contiguous ragged arrays instead of NaN-padding shorter pings,
+        see ``EchoData.to_ragged``
+    use_cache : bool, default False
+        Flag to use the conversion cache. When set to ``True``, the converted data
+        are stored in a zarr store in the cache directory, and subsequent calls with
+        the same raw file and conversion parameters return the cached store
+        opened lazily instead of parsing the raw file again.
+    cache_options : dict, optional
+        Options for the conversion cache:
+
+        - ``cache_dir``: the cache directory,
+          defaults to ``~/.echopype/conversion_cache``
+        - ``max_size``: the maximum total size of the cache, in bytes or as a string
+          such as "10GB" (default); least recently used entries are evicted beyond it
+        - ``hash_content``: if ``True``, identify the raw file by a hash of its
+          content instead of its size and modification time (default ``False``)
 
 
     Returns
@@ -425,6 +447,11 @@ def open_raw(
 
     This feature is only available for the following
     echosounders: EK60, ES70, EK80, ES80, EA640.
+
+    The cache key of the conversion cache includes the size and modification time
+    (or content hash) of the raw file and the XML file, ``sonar_model``,
+    ``include_bot``, ``include_idx``, ``convert_params`` and the echopype version,
+    so that a change in any of them triggers a new conversion.
     """
     if raw_file is None:
         raise FileNotFoundError("The path to the raw data file must be specified.")
@@ -457,6 +484,25 @@ def open_raw(
         raw_file, sonar_model, xml_path, include_bot, include_idx, storage_options
     )
 
+    # Return the cached conversion if it exists
+    if use_cache:
+        cache_options = cache_options if cache_options is not None else {}
+        cache_key = cache.get_cache_key(
+            file_chk,
+            sonar_model,
+            xml_path=xml_chk,
+            include_bot=include_bot,
+            include_idx=include_idx,
+            convert_params=convert_params,
+            ragged=ragged,
+            storage_options=storage_options,
+            hash_content=cache_options.get("hash_content", False),
+        )
+        cached_path = cache.get_cached(cache_key, cache_dir=cache_options.get("cache_dir"))
+        if cached_path is not None:
+            logger.info(f"Using cached conversion of {file_chk} from {cached_path}")
+            return _open_cached(cached_path, file_chk, xml_chk)
+
     # Parse raw file and organize data into groups
     parser = SONAR_MODELS[sonar_model]["parser"](
         file_chk,
@@ -541,5 +587,28 @@ def open_raw(
     echodata = EchoData(source_file=file_chk, xml_path=xml_chk, sonar_model=sonar_model)
     echodata._set_tree(tree)
     echodata._load_tree()
+    if parser.swap_store is not None:
+        # Swap store released when echodata is deleted
+        echodata._swap_stores.append(parser.swap_store)
+
+    if ragged:
+        echodata.to_ragged()
+
+    if use_cache:
+        cached_path = cache.put_cached(
+            echodata,
+            cache_key,
+            cache_dir=cache_options.get("cache_dir"),
+            max_size=cache_options.get("max_size", cache.CONVERSION_CACHE_MAX_SIZE),
+        )
+        return _open_cached(cached_path, file_chk, xml_chk)
+
+    return echodata
+
 
+def _open_cached(cached_path: str, raw_file: str, xml_path: str) -> EchoData:
+    """Lazily open a cached conversion, keeping track of the raw source files."""
+    echodata = EchoData.from_file(cached_path)
+    echodata.source_file = raw_file
+    echodata.xml_path = xml_path
     return echodata
@@ -0,0 +1,247 @@
+"""
+Cache of raw-converted data keyed on the raw file and the conversion parameters.
+
+Each cache entry is a zarr store named after a hash of the raw file identity
+(size and modification time, or a hash of its content), the sonar model,
+the echopype version and the conversion parameters.
+Entries are evicted in least-recently-used order once the total size
+of the cache exceeds a configurable limit.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import fsspec
+from _echopype_version import version as ECHOPYPE_VERSION
+from dask.utils import parse_bytes
+
+from ..utils.io import ECHOPYPE_DIR
+from ..utils.log import _init_logger
+
+logger = _init_logger(__name__)
+
+CONVERSION_CACHE_DIR = ECHOPYPE_DIR / "conversion_cache"
+CONVERSION_CACHE_MAX_SIZE = "10GB"
+_CACHE_SUFFIX = ".zarr"
+_HASH_BLOCK_SIZE = 2**24  # 16 MiB
+
+
+def _get_file_identity(
+    path: str, storage_options: Dict[str, Any], hash_content: bool = False
+) -> Dict[str, Any]:
+    """
+    Identity of a file used in the cache key.
+
+    The size and modification time (or the ETag for object stores) are used by default.
+    If ``hash_content=True``, the SHA-256 hash of the file content is used instead,
+    which is robust to files being copied or touched but requires a full read.
+    """
+    fs, fs_path = fsspec.core.url_to_fs(path, **storage_options)
+    info = fs.info(fs_path)
+
+    if hash_content:
+        sha = hashlib.sha256()
+        with fs.open(fs_path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+                sha.update(block)
+        return {"size": info["size"], "sha256": sha.hexdigest()}
+
+    mtime = info.get("mtime", info.get("LastModified", info.get("ETag", info.get("created"))))
+    return {"path": path, "size": info["size"], "mtime": str(mtime)}
+
+
+def get_cache_key(
+    raw_file: str,
+    sonar_model: str,
+    xml_path: Optional[str] = None,
+    include_bot: bool = False,
+    include_idx: bool = False,
+    convert_params: Optional[Dict[str, Any]] = None,
+    ragged: bool = False,
+    storage_options: Optional[Dict[str, Any]] = None,
+    hash_content: bool = False,
+) -> str:
+    """
+    Compute the cache key for the conversion of a raw file.
+
+    Parameters
+    ----------
+    raw_file : str
+        path to raw data file
+    sonar_model : str
+        model of the sonar instrument
+    xml_path : str, optional
+        path to XML config file used by AZFP
+    include_bot : bool
+        whether the bottom depth file is parsed
+    include_idx : bool
+        whether the index file is parsed
+    convert_params : dict, optional
+        parameters (metadata) added to the converted file
+    ragged : bool
+        whether beam groups are stored as contiguous ragged arrays
+    storage_options : dict, optional
+        options for cloud storage
+    hash_content : bool, default False
+        Identify the raw (and XML) files by a hash of their content instead of
+        their size and modification time
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA-256 cache key
+    """
+    storage_options = storage_options if storage_options is not None else {}
+    key = {
+        "raw_file": _get_file_identity(raw_file, storage_options, hash_content),
+        "xml_file": (
+            _get_file_identity(xml_path, storage_options, hash_content) if xml_path else None
+        ),
+        "sonar_model": sonar_model,
+        "include_bot": include_bot,
+        "include_idx": include_idx,
+        "convert_params": convert_params if convert_params is not None else {},
+        "ragged": ragged,
+        "echopype_version": ECHOPYPE_VERSION,
+    }
+    key_str = json.dumps(key, sort_keys=True, default=str)
+    return hashlib.sha256(key_str.encode()).hexdigest()
+
+
+def _get_cache_dir(cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    cache_dir = Path(cache_dir) if cache_dir is not None else CONVERSION_CACHE_DIR
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def _get_dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def _list_entries(cache_dir: Path) -> List[Tuple[Path, float, int]]:
+    """List cache entries as (path, last access time, size), least recently used first."""
+    entries = []
+    for entry in cache_dir.glob(f"*{_CACHE_SUFFIX}"):
+        if entry.name.startswith("."):
+            # Skip entries still being written
+            continue
+        try:
+            entries.append((entry, entry.stat().st_mtime, _get_dir_size(entry)))
+        except FileNotFoundError:
+            # Entry evicted concurrently by another process
+            continue
+    return sorted(entries, key=lambda e: e[1])
+
+
+def get_cached(key: str, cache_dir: Optional[Union[str, Path]] = None) -> Optional[str]:
+    """
+    Return the path of the cached converted store for ``key``, if it exists.
+
+    The access time of the entry is updated for least-recently-used eviction.
+    """
+    entry = _get_cache_dir(cache_dir) / f"{key}{_CACHE_SUFFIX}"
+    if not entry.exists():
+        return None
+    now = time.time()
+    os.utime(entry, (now, now))
+    return str(entry)
+
+
+def put_cached(
+    echodata,
+    key: str,
+    cache_dir: Optional[Union[str, Path]] = None,
+    max_size: Union[int, str] = CONVERSION_CACHE_MAX_SIZE,
+) -> str:
+    """
+    Store converted data in the cache and evict old entries to stay under ``max_size``.
+
+    The data are first written to a temporary store that is then renamed,
+    so that concurrent readers never see a partially written entry.
+
+    Parameters
+    ----------
+    echodata : EchoData
+        The converted data to be cached
+    key : str
+        The cache key, see ``get_cache_key``
+    cache_dir : str or Path, optional
+        The cache directory. Defaults to ``CONVERSION_CACHE_DIR``.
+    max_size : int or str
+        The maximum total size of the cache, in bytes or as a string such as "10GB"
+
+    Returns
+    -------
+    str
+        The path of the cached store
+    """
+    cache_dir = _get_cache_dir(cache_dir)
+    entry = cache_dir / f"{key}{_CACHE_SUFFIX}"
+    tmp_entry = cache_dir / f".{key}-{uuid.uuid4().hex}{_CACHE_SUFFIX}"
+
+    from .api import to_file
+
+    to_file(echodata, engine="zarr", save_path=str(tmp_entry), overwrite=True)
+    # The converted_raw_path is set by to_file, but the returned object
+    # should still be seen as in-memory converted data
+    echodata.converted_raw_path = None
+    try:
+        os.rename(tmp_entry, entry)
+    except OSError:
+        # Another process cached the same key in the meantime
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    evict_cache(max_size=max_size, cache_dir=cache_dir, keep=[entry])
+    return str(entry)
+
+
+def evict_cache(
+    max_size: Union[int, str] = CONVERSION_CACHE_MAX_SIZE,
+    cache_dir: Optional[Union[str, Path]] = None,
+    keep: Optional[List[Path]] = None,
+) -> List[str]:
+    """
+    Remove least recently used cache entries until the cache is smaller than ``max_size``.
+
+    Parameters
+    ----------
+    max_size : int or str
+        The maximum total size of the cache, in bytes or as a string such as "10GB"
+    cache_dir : str or Path, optional
+        The cache directory. Defaults to ``CONVERSION_CACHE_DIR``.
+    keep : list of Path, optional
+        Entries that should not be evicted
+
+    Returns
+    -------
+    list of str
+        The paths of the evicted entries
+    """
+    max_size = parse_bytes(max_size) if isinstance(max_size, str) else max_size
+    keep = set(keep) if keep is not None else set()
+    entries = _list_entries(_get_cache_dir(cache_dir))
+    total_size = sum(e[2] for e in entries)
+
+    evicted = []
+    for entry, _, size in entries:
+        if total_size <= max_size:
+            break
+        if entry in keep:
+            continue
+        shutil.rmtree(entry, ignore_errors=True)
+        total_size -= size
+        evicted.append(str(entry))
+        logger.info(f"Evicted {entry.name} from the conversion cache")
+
+    return evicted
+
+
+def clear_cache(cache_dir: Optional[Union[str, Path]] = None) -> None:
+    """Remove all entries from the conversion cache."""
+    evict_cache(max_size=0, cache_dir=cache_dir)
@@ -9,8 +9,8 @@ import numpy as np
 import zarr
 from dask.array.core import auto_chunks
 
-from ..utils.io import create_temp_zarr_store
 from ..utils.log import _init_logger
+from ..utils.swap import get_swap_manager
 from .utils.ek_raw_io import RawSimradFile, SimradEOF
 from .utils.ek_swap import calc_final_shapes
 
@@ -35,6 +35,7 @@ class ParseBase:
         self.sonar_model = sonar_model
         self.data_types = ["power", "angle", "complex"]
         self.raw_types = ["receive", "transmit"]
+        self.swap_store = None  # (swap manager, zarr store) when data are offloaded to disk
 
     def _print_status(self):
         """Prints message to console giving information about the raw file being parsed."""
@@ -162,8 +163,17 @@ class ParseEK(ParseBase):
         # Perform rectangularization
         zarr_root = None
         if use_swap:
-            # Setup temp store
-            zarr_store = create_temp_zarr_store()
+            # Setup temp store, within the swap space quota
+            itemsize = np.dtype("float64").itemsize
+            nbytes = sum(
+                np.prod(shape) * itemsize
+                for shapes in expanded_data_shapes.values()
+                for shape in shapes.values()
+                if shape
+            )
+            swap_manager = get_swap_manager()
+            zarr_store = swap_manager.acquire(nbytes)
+            self.swap_store = (swap_manager, zarr_store)
             # Setup zarr store
             zarr_root = zarr.group(
                 store=zarr_store, overwrite=True, synchronizer=zarr.ThreadSynchronizer()
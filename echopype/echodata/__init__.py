@@ -5,5 +5,6 @@ It is used for calibration and other processing.
 
 from . import convention
 from .echodata import EchoData
+from .legacy import upgrade_legacy_zarr
 
-__all__ = ["EchoData", "convention"]
+__all__ = ["EchoData", "convention", "upgrade_legacy_zarr"]
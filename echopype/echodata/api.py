@@ -1,15 +1,24 @@
-from typing import TYPE_CHECKING, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+import fsspec
+from fsspec import FSMap
 
 if TYPE_CHECKING:
     from ..core import PathHint
 
+from ..utils.log import _init_logger
 from .echodata import EchoData
 
+logger = _init_logger(__name__)
+
 
 def open_converted(
     converted_raw_path: "PathHint",
     storage_options: Dict[str, str] = None,
-    **kwargs
+    **kwargs,
     # kwargs: Dict[str, Any] = {'chunks': 'auto'} # TODO: do we need this?
 ):
     """Create an EchoData object from a single converted netcdf or zarr file.
@@ -28,9 +37,141 @@ def open_converted(
     -------
     EchoData object
     """
-    # TODO: combine multiple files when opening
     return EchoData.from_file(
         converted_raw_path=converted_raw_path,
         storage_options=storage_options,
         open_kwargs=kwargs,
     )
+
+
+def _get_shared_mappers(
+    converted_raw_paths: List["PathHint"], storage_options: Dict[str, str]
+) -> List["PathHint"]:
+    """
+    Map zarr paths to ``FSMap`` objects that all share a single filesystem
+    instance per protocol, so that connection pools are reused across files.
+    NetCDF paths and ``FSMap`` inputs are passed through unchanged.
+    """
+    filesystems = {}
+    mapped_paths = []
+    for path in converted_raw_paths:
+        if isinstance(path, FSMap) or Path(str(path)).suffix != ".zarr":
+            mapped_paths.append(path)
+            continue
+
+        path = str(path)
+        protocol = path.split("://")[0] if "://" in path else "file"
+        if protocol not in filesystems:
+            filesystems[protocol], _ = fsspec.core.url_to_fs(path, **storage_options)
+        mapped_paths.append(filesystems[protocol].get_mapper(path))
+
+    return mapped_paths
+
+
+def _open_converted_with_retry(
+    converted_raw_path: "PathHint",
+    storage_options: Dict[str, str],
+    retries: int,
+    retry_delay: float,
+    open_kwargs: Dict,
+) -> EchoData:
+    """Open a single converted file, retrying transient I/O errors."""
+    for attempt in range(retries + 1):
+        try:
+            return open_converted(
+                converted_raw_path, storage_options=storage_options, **open_kwargs
+            )
+        except FileNotFoundError:
+            # A missing file will not appear on retry
+            raise
+        except OSError as e:
+            if attempt == retries:
+                raise
+            logger.warning(
+                f"Failed to open {converted_raw_path} ({e}), retrying ({attempt + 1}/{retries})"
+            )
+            time.sleep(retry_delay * 2**attempt)
+
+
+def open_mfconverted(
+    converted_raw_paths: List["PathHint"],
+    storage_options: Optional[Dict[str, str]] = None,
+    max_workers: Optional[int] = None,
+    retries: int = 0,
+    retry_delay: float = 1.0,
+    combine: bool = False,
+    channel_selection: Optional[Union[List, Dict[str, list]]] = None,
+    **kwargs,
+) -> Union[List[EchoData], EchoData]:
+    """Create EchoData objects from multiple converted netcdf or zarr files concurrently.
+
+    The files are opened lazily on a thread pool. Zarr stores sharing the same
+    protocol are accessed through a single filesystem instance, so that
+    connections to remote storage are pooled across all files.
+
+    Parameters
+    ----------
+    converted_raw_paths : list of str or Path or FSMap
+        paths to converted data files
+    storage_options : dict, optional
+        options for cloud storage, shared by all files
+    max_workers : int, optional
+        maximum number of threads used to open the files.
+        Defaults to the ``concurrent.futures.ThreadPoolExecutor`` default.
+    retries : int, default 0
+        number of times opening a file is retried when an ``OSError``
+        (other than ``FileNotFoundError``) is raised
+    retry_delay : float, default 1.0
+        delay in seconds before the first retry, doubled at each subsequent retry
+    combine : bool, default False
+        If ``True``, combine the opened objects with ``combine_echodata``
+        and return the combined ``EchoData`` object
+    channel_selection : list of str or dict, optional
+        Passed to ``combine_echodata`` when ``combine=True``
+    kwargs : dict
+        optional keyword arguments to be passed
+        into xr.open_dataset
+
+    Returns
+    -------
+    list of EchoData or EchoData
+        The lazily loaded ``EchoData`` objects in the same order as
+        ``converted_raw_paths``, or a single combined ``EchoData`` object
+        if ``combine=True``
+
+    Examples
+    --------
+    >>> eds = echopype.open_mfconverted(["file1.zarr", "file2.zarr"], max_workers=8)
+    >>> combined = echopype.open_mfconverted(
+    >>>     ["s3://bucket/file1.zarr", "s3://bucket/file2.zarr"],
+    >>>     storage_options={"anon": True},
+    >>>     retries=3,
+    >>>     combine=True,
+    >>> )
+    """
+    if not isinstance(converted_raw_paths, (list, tuple)):
+        raise TypeError("converted_raw_paths must be a list of paths!")
+    if retries < 0:
+        raise ValueError("retries must be a non-negative integer!")
+
+    storage_options = storage_options if storage_options is not None else {}
+    mapped_paths = _get_shared_mappers(list(converted_raw_paths), storage_options)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        echodata_list = list(
+            executor.map(
+                lambda p: _open_converted_with_retry(
+                    p, storage_options, retries, retry_delay, kwargs
+                ),
+                mapped_paths,
+            )
+        )
+
+    if combine:
+        from .combine import combine_echodata
+
+        return combine_echodata(
+            echodata_list, channel_selection=channel_selection, max_workers=max_workers
+        )
+
+    return echodata_list
@@ -1,6 +1,7 @@
 import itertools
 import re
 from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 from warnings import warn
@@ -9,6 +10,7 @@ import fsspec
 import numpy as np
 import pandas as pd
 import xarray as xr
+from dask.base import tokenize
 from xarray import DataTree
 
 from ..utils.io import validate_output_path
@@ -153,7 +155,99 @@ def _check_channel_selection_form(
             raise TypeError("Each value of channel_selection must be a list of strings!")
 
 
-def check_eds(echodata_list: List[EchoData]) -> Tuple[str, List[str]]:
+def _get_vendor_params_token(ds: xr.Dataset) -> str:
+    """
+    Token identifying the ``Vendor_specific`` parameters without an appending dimension.
+
+    These variables are small (filter coefficients, calibration parameters),
+    so that their values are read to be tokenized. Tokens are equal
+    if and only if the parameters are identical.
+    """
+    ds = ds.drop_dims(set(ds.dims).intersection(APPEND_DIMS))
+    return tokenize(
+        ds.attrs,
+        [
+            (name, var.dims, var.dtype.str, var.attrs, var.values)
+            for name, var in sorted(ds.variables.items())
+        ],
+    )
+
+
+def _get_echodata_metadata(
+    ed: EchoData, vendor_channel_selection: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Gather the metadata of an ``EchoData`` object needed to validate a combination.
+
+    Only dimensions, indexed coordinates (channels and the first time values),
+    which are held in memory by lazily loaded objects, and the small
+    ``Vendor_specific`` parameters without an appending dimension are read,
+    so that the data are not loaded.
+
+    Parameters
+    ----------
+    ed: EchoData
+        The ``EchoData`` object to be combined
+    vendor_channel_selection: list of str, optional
+        The channels of the ``Vendor_specific`` group that will be combined
+
+    Returns
+    -------
+    dict
+        The sonar model, whether the beam groups are ragged, the source file path
+        and the metadata of each group
+    """
+    groups = {}
+    for ed_group in ed.group_paths:
+        ds = ed[ed_group]
+        if ds is None:
+            continue
+        first_times = {}
+        for dim in set(ds.dims).intersection(POSSIBLE_TIME_DIMS):
+            index = ds.indexes.get(dim, None)
+            first_times[dim] = (
+                index.values[0] if index is not None and len(index) > 0 else np.datetime64("NaT")
+            )
+        group_metadata = {
+            "dims": set(ds.dims),
+            "channel": list(ds["channel"].values) if "channel" in ds.dims else None,
+            "first_times": first_times,
+        }
+        if ed_group == "Vendor_specific":
+            if vendor_channel_selection is not None and "channel" in ds.indexes:
+                # missing channels are reported by the channel checks
+                ds = ds.sel(
+                    channel=[ch for ch in vendor_channel_selection if ch in ds.indexes["channel"]]
+                )
+            group_metadata["vendor_params"] = _get_vendor_params_token(ds)
+        groups[ed_group] = group_metadata
+
+    if ed.source_file is not None:
+        filepath = ed.source_file
+    elif ed.converted_raw_path is not None:
+        filepath = ed.converted_raw_path
+    else:
+        # defaulting to none, must be from memory
+        filepath = None
+
+    return {
+        "sonar_model": ed.sonar_model,
+        "is_ragged": ed.is_ragged,
+        "filepath": filepath,
+        "groups": groups,
+    }
+
+
+def _get_has_chan_dim(metadata: Dict[str, Any]) -> Dict[str, bool]:
+    """Whether each group of an ``EchoData`` object has a ``channel`` dimension."""
+    return {
+        grp: "channel" in grp_metadata["dims"] for grp, grp_metadata in metadata["groups"].items()
+    }
+
+
+def check_eds(
+    echodata_list: List[EchoData], metadata_list: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[str, List[str]]:
     """
     Ensures that the input list of ``EchoData`` objects for ``combine_echodata``
     is in the correct form and all necessary items exist.
@@ -162,6 +256,9 @@ def check_eds(echodata_list: List[EchoData]) -> Tuple[str, List[str]]:
     ----------
     echodata_list: list of EchoData object
         The list of `EchoData` objects to be combined.
+    metadata_list: list of dict, optional
+        The metadata of each object in ``echodata_list``
+        from ``_get_echodata_metadata``, gathered if not provided
 
     Returns
     -------
@@ -180,6 +277,8 @@ def check_eds(echodata_list: List[EchoData]) -> Tuple[str, List[str]]:
         If and ``EchoData`` object does not have a file path
     ValueError
         If the provided ``EchoData`` objects have the same filenames
+    ValueError
+        If any ``EchoData`` object has beam groups stored as ragged arrays
     """
 
     # make sure that the input is a list of EchoData objects
@@ -188,28 +287,32 @@ def check_eds(echodata_list: List[EchoData]) -> Tuple[str, List[str]]:
     ):
         raise TypeError("The input, eds, must be a list of EchoData objects!")
 
+    if metadata_list is None:
+        metadata_list = [_get_echodata_metadata(ed) for ed in echodata_list]
+
     # get the sonar model for the combined object
-    if echodata_list[0].sonar_model is None:
+    if metadata_list[0]["sonar_model"] is None:
         raise ValueError("all EchoData objects must have non-None sonar_model values")
     else:
-        sonar_model = echodata_list[0].sonar_model
+        sonar_model = metadata_list[0]["sonar_model"]
 
     echodata_filenames = []
-    for ed in echodata_list:
+    for metadata in metadata_list:
         # check sonar model
-        if ed.sonar_model is None:
+        if metadata["sonar_model"] is None:
             raise ValueError("all EchoData objects must have non-None sonar_model values")
-        elif ed.sonar_model != sonar_model:
+        elif metadata["sonar_model"] != sonar_model:
             raise ValueError("all EchoData objects must have the same sonar_model value")
 
+        # ragged beam groups cannot be concatenated along ping_time
+        if metadata["is_ragged"]:
+            raise ValueError(
+                "EchoData objects with ragged beam groups cannot be combined, "
+                "use EchoData.expand_ragged first"
+            )
+
         # check for file names and store them
-        if ed.source_file is not None:
-            filepath = ed.source_file
-        elif ed.converted_raw_path is not None:
-            filepath = ed.converted_raw_path
-        else:
-            # defaulting to none, must be from memory
-            filepath = None
+        filepath = metadata["filepath"]
 
         # set default filename to internal memory
         filename = "internal-memory"
@@ -383,6 +486,7 @@ def _create_channel_selection_dict(
 def _check_echodata_channels(
     echodata_list: List[EchoData],
     user_channel_selection: Optional[Union[List, Dict[str, list]]] = None,
+    metadata_list: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Optional[List[str]]]:
     """
     Coordinates the routines that check to make sure each ``EchoData`` group with a ``channel``
@@ -396,6 +500,9 @@ def _check_echodata_channels(
     user_channel_selection: list or dict, optional
         A user provided input that will be used to specify which channels will be
         selected for each ``EchoData`` group
+    metadata_list: list of dict, optional
+        The metadata of each object in ``echodata_list``
+        from ``_get_echodata_metadata``, gathered if not provided
 
     Returns
     -------
@@ -416,20 +523,23 @@ def _check_echodata_channels(
     function ``_check_channel_consistency``.
     """
 
+    if metadata_list is None:
+        metadata_list = [_get_echodata_metadata(ed) for ed in echodata_list]
+
     # determine if the EchoData group contains a channel dimension
-    has_chan_dim = {
-        grp: "channel" in echodata_list[0][grp].dims for grp in echodata_list[0].group_paths
-    }
+    has_chan_dim = _get_has_chan_dim(metadata_list[0])
 
     # create dictionary specifying the channels that should be selected for each group
     channel_selection = _create_channel_selection_dict(
-        echodata_list[0].sonar_model, has_chan_dim, user_channel_selection
+        metadata_list[0]["sonar_model"], has_chan_dim, user_channel_selection
     )
 
-    for ed_group in echodata_list[0].group_paths:
-        if "channel" in echodata_list[0][ed_group].dims:
+    for ed_group, has_chan in has_chan_dim.items():
+        if has_chan:
             # get each EchoData's channels as a list of list
-            all_chan_list = [list(ed[ed_group].channel.values) for ed in echodata_list]
+            all_chan_list = [
+                list(metadata["groups"][ed_group]["channel"]) for metadata in metadata_list
+            ]
 
             # make sure each EchoData does not have repeating channels
             all_chan_unique = [len(set(ed_chans)) == len(ed_chans) for ed_chans in all_chan_list]
@@ -455,7 +565,7 @@ def _check_echodata_channels(
     return channel_selection
 
 
-def _check_ascending_ds_times(ds_list: List[xr.Dataset], ed_group: str) -> None:
+def _check_ascending_ds_times(first_times: List[Dict[str, np.datetime64]], ed_group: str) -> None:
     """
     A minimal check that the first time value of each Dataset is less than
     the first time value of the subsequent Dataset. If each first time value
@@ -463,8 +573,9 @@ def _check_ascending_ds_times(ds_list: List[xr.Dataset], ed_group: str) -> None:
 
     Parameters
     ----------
-    ds_list: list of xr.Dataset
-        List of Datasets to be combined
+    first_times: list of dict
+        The first value of each time dimension of the Datasets to be combined,
+        as gathered by ``_get_echodata_metadata``
     ed_group: str
         The name of the ``EchoData`` group being combined
 
@@ -480,26 +591,13 @@ def _check_ascending_ds_times(ds_list: List[xr.Dataset], ed_group: str) -> None:
         for the specified echodata group
     """
 
-    # get all time dimensions of the input Datasets
-    ed_time_dim = set(ds_list[0].dims).intersection(POSSIBLE_TIME_DIMS)
-
-    for time in ed_time_dim:
+    for time in first_times[0]:
         # gather the first time of each Dataset
-        first_times = []
-        for ds in ds_list:
-            times = ds[time].values
-            if isinstance(times, np.ndarray):
-                # store first time if we have an array
-                first_times.append(times[0])
-            else:
-                # store first time if we have a single value
-                first_times.append(times)
-
-        first_times = np.array(first_times)
+        group_first_times = np.array([ds_first_times[time] for ds_first_times in first_times])
 
         # skip check if all first times are NaT
-        if not np.isnan(first_times).all():
-            is_descending = (np.diff(first_times) < np.timedelta64(0, "ns")).any()
+        if not np.isnat(group_first_times).all():
+            is_descending = (np.diff(group_first_times) < np.timedelta64(0, "ns")).any()
 
             if is_descending:
                 raise RuntimeError(
@@ -509,7 +607,7 @@ def _check_ascending_ds_times(ds_list: List[xr.Dataset], ed_group: str) -> None:
 
 
 def _check_no_append_vendor_params(
-    ds_list: List[xr.Dataset], ed_group: Literal["Vendor_specific"], ds_append_dims: set
+    vendor_params: List[str], ed_group: Literal["Vendor_specific"]
 ) -> None:
     """
     Check for identical params for all inputs without an
@@ -517,13 +615,12 @@ def _check_no_append_vendor_params(
 
     Parameters
     ----------
-    ds_list: list of xr.Dataset
-        List of Datasets to be combined
+    vendor_params: list of str
+        The tokens of the parameters without an appending dimension of
+        each Dataset to be combined, as gathered by ``_get_echodata_metadata``
     ed_group: "Vendor_specific"
         The name of the ``EchoData`` group being combined,
         this only works for "Vendor_specific" group.
-    ds_append_dims: set
-        A set of datasets append dimensions
 
     Returns
     -------
@@ -539,22 +636,94 @@ def _check_no_append_vendor_params(
     if ed_group != "Vendor_specific":
         raise ValueError("Group must be `Vendor_specific`!")
 
-    if len(ds_append_dims) > 0:
-        # If there's a dataset appending dimension, drop for comparison
-        # of the other values... everything else should be identical
-        ds_list = [ds.drop_dims(ds_append_dims) for ds in ds_list]
-
-    it = iter(ds_list)
-    # Init as identical, must stay True.
-    is_identical = True
-    dataset = next(it)
-    for next_dataset in it:
-        is_identical = dataset.identical(next_dataset)
-        if not is_identical:
-            raise RuntimeError(
-                f"Non identical filter parameters in {ed_group} group. " "Objects cannot be merged!"
+    if len(set(vendor_params)) > 1:
+        raise RuntimeError(
+            f"Non identical filter parameters in {ed_group} group. " "Objects cannot be merged!"
+        )
+
+
+def validate_echodata_list(
+    echodata_list: List[EchoData],
+    channel_selection: Optional[Union[List, Dict[str, list]]] = None,
+    max_workers: Optional[int] = None,
+) -> Tuple[str, List[str], Dict[str, Optional[List[str]]]]:
+    """
+    Validate a list of ``EchoData`` objects before they are combined.
+
+    The metadata of all objects are gathered concurrently with
+    ``_get_echodata_metadata``, without loading the data of lazily loaded objects,
+    and all checks of ``combine_echodata`` are then performed on these metadata.
+
+    Parameters
+    ----------
+    echodata_list: list of EchoData object
+        The list of ``EchoData`` objects to be combined
+    channel_selection: list of str or dict, optional
+        The channel selection passed to ``combine_echodata``
+    max_workers: int, optional
+        maximum number of threads used to gather the metadata.
+        Defaults to the ``concurrent.futures.ThreadPoolExecutor`` default.
+
+    Returns
+    -------
+    sonar_model : str
+        The sonar model used for all values in ``echodata_list``
+    echodata_filenames : list of str
+        The source files names for all values in ``echodata_list``
+    dict
+        The channels that should be selected within each ``EchoData`` group,
+        see ``_create_channel_selection_dict``
+
+    Raises
+    ------
+    See ``combine_echodata``
+    """
+    # make sure that the input is a list of EchoData objects
+    if not isinstance(echodata_list, list) or not all(
+        isinstance(ed, EchoData) for ed in echodata_list
+    ):
+        raise TypeError("The input, eds, must be a list of EchoData objects!")
+
+    # make sure channel_selection is the appropriate type and only contains the beam groups
+    _check_channel_selection_form(channel_selection)
+
+    # the selected Vendor_specific channels are needed to compare the vendor parameters
+    vendor_channel_selection = _create_channel_selection_dict(
+        echodata_list[0].sonar_model,
+        {grp: "channel" in echodata_list[0][grp].dims for grp in echodata_list[0].group_paths},
+        channel_selection,
+    ).get("Vendor_specific", None)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        metadata_list = list(
+            executor.map(
+                lambda ed: _get_echodata_metadata(ed, vendor_channel_selection), echodata_list
             )
-        dataset = next_dataset
+        )
+
+    sonar_model, echodata_filenames = check_eds(echodata_list, metadata_list)
+
+    # perform channel check and get channel selection for each EchoData group
+    ed_group_chan_sel = _check_echodata_channels(echodata_list, channel_selection, metadata_list)
+
+    all_group_paths = dict.fromkeys(
+        itertools.chain.from_iterable(metadata["groups"] for metadata in metadata_list)
+    )
+    for ed_group in all_group_paths:
+        groups_metadata = [
+            metadata["groups"][ed_group]
+            for metadata in metadata_list
+            if ed_group in metadata["groups"]
+        ]
+
+        # Checks for ascending time in dataset list
+        _check_ascending_ds_times([g["first_times"] for g in groups_metadata], ed_group)
+
+        # Checks for filter parameters for "Vendor_specific" ONLY
+        if ed_group == "Vendor_specific":
+            _check_no_append_vendor_params([g["vendor_params"] for g in groups_metadata], ed_group)
+
+    return sonar_model, echodata_filenames, ed_group_chan_sel
 
 
 def _merge_attributes(attributes: List[Dict[str, str]]) -> Dict[str, str]:
@@ -791,16 +960,9 @@ def _combine(
             # Attribute holding
             attrs_dict[ed_group] = ds_attrs
 
-            # Checks for ascending time in dataset list
-            _check_ascending_ds_times(ds_list, ed_group)
-
             # get all dimensions in ds that are append dimensions
             ds_append_dims = set(ds_list[0].dims).intersection(APPEND_DIMS)
 
-            # Checks for filter parameters for "Vendor_specific" ONLY
-            if ed_group == "Vendor_specific":
-                _check_no_append_vendor_params(ds_list, ed_group, ds_append_dims)
-
             if len(ds_append_dims) == 0:
                 combined_ds = ds_list[0]
             else:
@@ -860,6 +1022,7 @@ def _combine(
 def combine_echodata(
     echodata_list: List[EchoData] = None,
     channel_selection: Optional[Union[List, Dict[str, list]]] = None,
+    max_workers: Optional[int] = None,
 ) -> EchoData:
     """
     Combines multiple ``EchoData`` objects into a single ``EchoData`` object.
@@ -878,6 +1041,9 @@ def combine_echodata(
         groups (e.g. "Sonar/Beam_group1") and values as a list of channel names to select
         within that beam group. The rest of the ``EchoData`` groups with a ``channel`` dimension
         will have their selected channels chosen automatically.
+    max_workers: int, optional
+        maximum number of threads used to validate the ``EchoData`` objects.
+        Defaults to the ``concurrent.futures.ThreadPoolExecutor`` default.
 
     Returns
     -------
@@ -925,6 +1091,8 @@ def combine_echodata(
 
     Notes
     -----
+    * All ``EchoData`` objects are validated before anything is combined, from
+      their metadata gathered concurrently, so that lazily loaded data are not loaded.
     * ``EchoData`` objects are combined by appending their groups individually.
     * All attributes (besides attributes whose values are arrays) from all groups before the
       combination will be stored in the ``Provenance`` group.
@@ -949,13 +1117,10 @@ def combine_echodata(
         return EchoData()
 
     # Ensure the list of all EchoData objects to be combined are valid
-    sonar_model, echodata_filenames = check_eds(echodata_list)
-
-    # make sure channel_selection is the appropriate type and only contains the beam groups
-    _check_channel_selection_form(channel_selection)
-
-    # perform channel check and get channel selection for each EchoData group
-    ed_group_chan_sel = _check_echodata_channels(echodata_list, channel_selection)
+    # and get channel selection for each EchoData group
+    sonar_model, echodata_filenames, ed_group_chan_sel = validate_echodata_list(
+        echodata_list, channel_selection, max_workers=max_workers
+    )
 
     # combine the echodata objects and get the tree dict
     tree_dict = _combine(
@@ -1,25 +1,29 @@
 import datetime
-import re
 import warnings
 from html import escape
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import dask.array
 import fsspec
 import numpy as np
 import xarray as xr
-from xarray import DataTree, open_datatree, open_groups
+from xarray import DataTree, open_groups
 from zarr.errors import GroupNotFoundError, PathNotFoundError
 
 if TYPE_CHECKING:
+    from fsspec import FSMap
+
     from ..core import EngineHint, FileFormatHint, PathHint, SonarModelsHint
+    from ..utils.swap import SwapManager
 
 from ..echodata.utils_platform import _clip_by_time_dim, get_mappings_expanded
 from ..utils.coding import sanitize_dtypes, set_time_encodings
 from ..utils.log import _init_logger
 from ..utils.prov import add_processing_level
+from ..utils.ragged import from_ragged, is_ragged, isel_pings, to_ragged
 from .convention import sonarnetcdf_1
+from .legacy import upgrade_legacy_groups
 from .widgets.utils import tree_repr
 from .widgets.widgets import _load_static_files, get_template
 
@@ -39,6 +43,33 @@ TVG_CORRECTION_FACTOR = {
 logger = _init_logger(__name__)
 
 
+def _get_padded_time_mask(
+    times: np.ndarray, start: Optional[np.datetime64], end: Optional[np.datetime64]
+) -> np.ndarray:
+    """
+    Mask of the times between ``start`` and ``end``, padded with the time preceding ``start``
+    and the time following ``end``. Accounts for unsorted times.
+    """
+    mask = np.ones(times.shape, dtype=bool)
+    if start is not None:
+        before = times[times < start]
+        mask &= times >= (before.max() if before.size > 0 else start)
+    if end is not None:
+        after = times[times > end]
+        mask &= times <= (after.min() if after.size > 0 else end)
+    return mask
+
+
+def _mask_to_indexer(mask: np.ndarray) -> Union[slice, np.ndarray]:
+    """Positional indexer of a mask, as a slice if the selection is contiguous."""
+    idx = np.flatnonzero(mask)
+    if idx.size == 0:
+        return slice(0, 0)
+    if idx[-1] - idx[0] + 1 == idx.size:
+        return slice(idx[0], idx[-1] + 1)
+    return idx
+
+
 class EchoData:
     """Echo data model class for handling raw converted data,
     including multiple files associated with the same data set.
@@ -67,6 +98,10 @@ class EchoData:
         self.sonar_model: Optional["SonarModelsHint"] = sonar_model
         self.converted_raw_path: Optional["PathHint"] = converted_raw_path
         self._tree: Optional["DataTree"] = None
+        # EchoData object sharing its data with this one, see expand_ragged
+        self._parent: Optional["EchoData"] = None
+        # (swap manager, zarr store) of the data offloaded to disk during conversion
+        self._swap_stores: List[Tuple["SwapManager", "FSMap"]] = []
 
         self.__setup_groups()
         # self.__read_converted(converted_raw_path)
@@ -77,6 +112,13 @@ class EchoData:
         """
         Clean up only the swap files created during raw data conversion.
         """
+        if self._swap_stores:
+            # Stores of the swap manager, see echopype.utils.swap
+            for swap_manager, store in self._swap_stores:
+                swap_manager.release(store)
+            self._swap_stores = []
+            return
+
         sonar_group = "Sonar"
         beam_group_var = "beam_group"
         for beam_group in self[sonar_group][beam_group_var].to_numpy():
@@ -103,7 +145,7 @@ class EchoData:
     def __del__(self):
         # TODO: this destructor seems to not work in Jupyter Lab if restart or
         #  even clear all outputs is used. It will work if you explicitly delete the object
-        if self.converted_raw_path is None:
+        if self.converted_raw_path is None and self._parent is None:
             # Assumes raw data is in memory
             self.cleanup_swap_files()
 
@@ -170,77 +212,19 @@ class EchoData:
         converted_raw_path = echodata._sanitize_path(converted_raw_path)
         suffix = echodata._check_suffix(converted_raw_path)
 
-        # Open specific groups to check if this is new or legacy data wrt xr.DataTree updates
-        # Legacy data will have: `channel` instead of `channel_all` in the Sonar group
-        #                        `time1` instead of `nmea_time` in the Platform/NMEA group
-        # Need to check both Platform/NMEA and Sonar groups, because:
-        # - datasets from some instruments may not have `channel_all` or `channel` in Sonar
-        # - datasets from some instruments may not have `Platform/NMEA` altogether (no GPS data)
-
-        # TODO: remove this check once adding NMEA subgroup to all sonar_model for consistency
-        # Open Top-level group to check sonar_model
-        # Only Kongsberg sonar_model has Platform/NMEA group
-        top_check = xr.open_dataset(
-            converted_raw_path,
-            engine=XARRAY_ENGINE_MAP[suffix],
-            **echodata.open_kwargs,
-        )
-        kongsberg_sonar_model = ["EK60", "ES70", "EK80", "ES80", "EA640"]
-        combined_pattern = "|".join(re.escape(s) for s in kongsberg_sonar_model)
-        is_kongsberg = bool(re.search(combined_pattern, top_check.attrs["keywords"]))
-        if is_kongsberg:
-            nmea_check = xr.open_dataset(
-                converted_raw_path,
-                group="Platform/NMEA",
-                engine=XARRAY_ENGINE_MAP[suffix],
-                **echodata.open_kwargs,
-            )
-
-        sonar_check = xr.open_dataset(
+        # Open all groups lazily, only reading metadata
+        groups = open_groups(
             converted_raw_path,
-            group="Sonar",
             engine=XARRAY_ENGINE_MAP[suffix],
             **echodata.open_kwargs,
         )
-
-        is_legacy = True
-        if is_kongsberg and ("nmea_time" in nmea_check.coords):
-            is_legacy = False
-        if not is_kongsberg and "channel_all" in sonar_check.coords:
-            is_legacy = False
-
-        if is_legacy:
-            # If legacy data, update coordinates to avoid inheritance problem
-            temp_tree = open_groups(
-                converted_raw_path,
-                engine=XARRAY_ENGINE_MAP[suffix],
-                **echodata.open_kwargs,
-            )
-
-            # Update Sonar for all sonar_model if channel exists as a coordinate
-            sonar = temp_tree["/Sonar"]
-            if "channel" in sonar.coords:
-                # TODO: do we actually want to rename the children as well?
-                sonar = sonar.rename({"channel": "channel_all"})
-                temp_tree["/Sonar"] = sonar
-
-            # Update Platform/NMEA/time1 to Platform/NMEA/nmea_time for only Kongberg model
-            if is_kongsberg:
-                platform = temp_tree["/Platform/NMEA"]
-                if "time1" in platform.coords:
-                    platform = platform.rename({"time1": "nmea_time"})
-                    temp_tree["/Platform/NMEA"] = platform
-
-            # Convert datatree to new format
-            tree = xr.DataTree.from_dict(temp_tree)
-
-        else:
-            # If new data, proceed to open as usual
-            tree = open_datatree(
-                converted_raw_path,
-                engine=XARRAY_ENGINE_MAP[suffix],
-                **echodata.open_kwargs,
-            )
+        # Legacy data wrt xr.DataTree updates have `channel` instead of `channel_all`
+        # in the Sonar group and `time1` instead of `nmea_time` in the Platform/NMEA group.
+        # These are renamed to avoid inheritance problems, without loading any data.
+        groups = upgrade_legacy_groups(groups)
+        tree = DataTree.from_dict(groups)
+        # Close the files of all groups when the tree is closed
+        tree.set_close(lambda: [ds.close() for ds in groups.values()])
 
         tree.name = "root"
         echodata._set_tree(tree)
@@ -585,6 +569,7 @@ class EchoData:
         overwrite: bool = False,
         parallel: bool = False,
         output_storage_options: Dict[str, str] = {},
+        chunk_layout: Optional[str] = None,
         **kwargs,
     ):
         """Save content of EchoData to netCDF.
@@ -603,6 +588,13 @@ class EchoData:
             whether or not to use parallel processing. (Not yet implemented)
         output_storage_options : dict
             Additional keywords to pass to the filesystem class.
+        chunk_layout : str, optional
+            Chunk the variables for an access pattern: "echogram" for blocks of pings
+            over the full range, "timeseries" for all pings over a few samples,
+            or "balanced". Defaults to auto chunks of about 100MB.
+            See ``echopype.utils.coding.CHUNK_LAYOUTS``.
+            Lazy (dask) data, such as data offloaded to swap during conversion,
+            are written one chunk at a time without being loaded into memory.
         **kwargs : dict, optional
             Extra arguments to `xr.Dataset.to_netcdf`: refer to
             xarray's documentation for a list of all possible arguments.
@@ -617,6 +609,7 @@ class EchoData:
             overwrite=overwrite,
             parallel=parallel,
             output_storage_options=output_storage_options,
+            chunk_layout=chunk_layout,
             **kwargs,
         )
 
@@ -628,6 +621,7 @@ class EchoData:
         parallel: bool = False,
         output_storage_options: Dict[str, str] = {},
         consolidated: bool = True,
+        chunk_layout: Optional[str] = None,
         **kwargs,
     ):
         """Save content of EchoData to zarr.
@@ -649,6 +643,11 @@ class EchoData:
         consolidated : bool
             Flag to consolidate zarr metadata.
             Defaults to ``True``
+        chunk_layout : str, optional
+            Chunk the variables for an access pattern: "echogram" for blocks of pings
+            over the full range, "timeseries" for all pings over a few samples,
+            or "balanced". Defaults to auto chunks of about 100MB.
+            See ``echopype.utils.coding.CHUNK_LAYOUTS``.
         **kwargs : dict, optional
             Extra arguments to `xr.Dataset.to_zarr`: refer to
             xarray's documentation for a list of all possible arguments.
@@ -664,6 +663,7 @@ class EchoData:
             parallel=parallel,
             output_storage_options=output_storage_options,
             consolidated=consolidated,
+            chunk_layout=chunk_layout,
             **kwargs,
         )
 
@@ -728,3 +728,173 @@ class EchoData:
                     self[echodata_group] = group.chunk(subset_chunks)
 
         return self
+
+    @property
+    def beam_group_paths(self) -> Tuple[str]:
+        return tuple(p for p in self.group_paths if p.startswith("Sonar/Beam_group"))
+
+    @property
+    def is_ragged(self) -> bool:
+        """Whether any beam group is stored as contiguous ragged arrays."""
+        return any(is_ragged(self[p]) for p in self.beam_group_paths)
+
+    def to_ragged(self):
+        """
+        Store the beam group variables along ``range_sample`` as contiguous ragged arrays.
+
+        Pings with fewer samples than the longest ping are NaN-padded in the
+        rectangular representation. In the contiguous ragged array representation,
+        the valid samples of all pings are concatenated along ``range_sample_ragged``
+        and the number of samples of each ping is stored in ``range_sample_count``,
+        following the CF conventions. This avoids storing the padding when saving
+        to zarr or netCDF. Pings in which a channel does not transmit, as with
+        multiplexed EK80 channels, have no samples, so that each channel
+        only stores its own pings.
+
+        ``compute_Sv`` and ``compute_TS`` expand the ragged arrays lazily and
+        calibrate multiplexed channels over their own pings only.
+        ``expand_ragged`` returns the rectangular representation
+        on the ``ping_time`` of all channels.
+        """
+        for group in self.beam_group_paths:
+            self[group] = to_ragged(self[group])
+
+        return self
+
+    def expand_ragged(self, chunk_size: str = "100MB") -> "EchoData":
+        """
+        Get an ``EchoData`` object with beam groups stored as contiguous ragged arrays
+        expanded to the rectangular, NaN-padded representation along ``range_sample``.
+
+        The expansion is lazy and the data are shared with this object,
+        which is left unchanged.
+
+        Parameters
+        ----------
+        chunk_size : str
+            The approximate size of the chunks of the expanded variables
+            Defaults to ``"100MB"``
+
+        Returns
+        -------
+        EchoData
+            The ``EchoData`` object with rectangular beam groups
+        """
+        echodata = self._derive(self._tree.copy())
+        for group in echodata.beam_group_paths:
+            echodata[group] = from_ragged(echodata[group], chunk_size=chunk_size)
+
+        return echodata
+
+    def _derive(self, tree: DataTree) -> "EchoData":
+        """Create an ``EchoData`` object sharing its data and attributes with this one."""
+        echodata = EchoData(
+            converted_raw_path=self.converted_raw_path,
+            storage_options=self.storage_options,
+            source_file=self.source_file,
+            xml_path=self.xml_path,
+            sonar_model=self.sonar_model,
+            open_kwargs=self.open_kwargs,
+        )
+        echodata._parent = self
+        echodata._set_tree(tree)
+        echodata._load_tree()
+        return echodata
+
+    def sel_time(
+        self,
+        start: Optional[Union[str, np.datetime64]] = None,
+        end: Optional[Union[str, np.datetime64]] = None,
+    ) -> "EchoData":
+        """
+        Select the pings between two times in all groups.
+
+        The beam groups are restricted to the pings with ``start <= ping_time <= end``.
+        The other time dimensions, such as ``time1`` in Platform and Environment or
+        ``nmea_time`` in Platform/NMEA, are restricted to the same span padded
+        with the sample preceding ``start`` and the one following ``end``,
+        so that they can be interpolated at all selected pings,
+        as in ``consolidate.add_location``.
+
+        The selection is lazy and only the chunks of the selected data are read.
+        The data are shared with this object, which is left unchanged.
+
+        Parameters
+        ----------
+        start : str or np.datetime64, optional
+            The start of the time span. Defaults to the first ping.
+        end : str or np.datetime64, optional
+            The end of the time span, inclusive. Defaults to the last ping.
+
+        Returns
+        -------
+        EchoData
+            The ``EchoData`` object with all groups restricted to the time span
+        """
+        start = np.datetime64(start, "ns") if start is not None else None
+        end = np.datetime64(end, "ns") if end is not None else None
+
+        def _select_pings(ping_time: np.ndarray) -> np.ndarray:
+            mask = np.ones(ping_time.shape, dtype=bool)
+            if start is not None:
+                mask &= ping_time >= start
+            if end is not None:
+                mask &= ping_time <= end
+            return mask
+
+        return self._subset_time(_select_pings, start, end)
+
+    def isel_time(self, ping_time: Union[int, slice, np.ndarray]) -> "EchoData":
+        """
+        Select pings by position in all groups.
+
+        The pings of the first beam group are selected by position and the pings of other
+        beam groups at the same times are kept. The other time dimensions are
+        restricted to the span of the selected pings, see ``sel_time``.
+
+        Parameters
+        ----------
+        ping_time : int, slice or array-like
+            The positional indexer of ``ping_time`` in the first beam group
+
+        Returns
+        -------
+        EchoData
+            The ``EchoData`` object with all groups restricted to the selected pings
+        """
+        ping_times = np.atleast_1d(self[self.beam_group_paths[0]]["ping_time"].values[ping_time])
+        if ping_times.size == 0:
+            raise ValueError("No ping selected.")
+
+        return self._subset_time(
+            lambda t: np.isin(t, ping_times), ping_times.min(), ping_times.max()
+        )
+
+    def _subset_time(
+        self,
+        select_pings: Callable[[np.ndarray], np.ndarray],
+        start: Optional[np.datetime64],
+        end: Optional[np.datetime64],
+    ) -> "EchoData":
+        """
+        Select ping dimensions with ``select_pings`` and other time dimensions
+        over the padded span from ``start`` to ``end`` in all groups.
+        """
+        groups = {}
+        for node in self._tree.subtree:
+            # Time coordinates may be inherited from a parent group
+            coords = node.coords
+            ds = node.to_dataset(inherit=False)
+            indexers = {}
+            for dim in ds.dims:
+                if dim not in coords or not np.issubdtype(coords[dim].dtype, np.datetime64):
+                    continue
+                times = coords[dim].values
+                if dim.startswith("ping_time"):
+                    mask = select_pings(times)
+                else:
+                    mask = _get_padded_time_mask(times, start, end)
+                indexers[dim] = _mask_to_indexer(mask)
+            groups[node.path] = isel_pings(ds, indexers) if indexers else ds
+
+        return self._derive(DataTree.from_dict(groups, name="root"))
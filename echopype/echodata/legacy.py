@@ -0,0 +1,190 @@
+"""
+Upgrade of converted files written before the ``xr.DataTree`` coordinate inheritance.
+
+Legacy files have:
+- ``channel`` instead of ``channel_all`` as the coordinate of the Sonar group,
+  which conflicts with the ``channel`` coordinate of the beam groups
+- ``time1`` instead of ``nmea_time`` as the time coordinate of the Platform/NMEA group
+  of Kongsberg sonar models, which conflicts with ``time1`` of the Platform group
+
+The upgrade only renames dimensions and coordinates, so that it can be done lazily
+on open (``upgrade_legacy_groups``) or in place in the metadata of zarr stores
+(``upgrade_legacy_zarr``), without reading or writing any data chunks.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional, Union
+
+import fsspec
+import xarray as xr
+import zarr
+
+from ..utils.log import _init_logger
+
+logger = _init_logger(__name__)
+
+KONGSBERG_SONAR_MODELS = ["EK60", "ES70", "EK80", "ES80", "EA640"]
+
+# Renames of legacy dimensions and coordinates in each group
+LEGACY_RENAMES = {
+    "Sonar": {"channel": "channel_all"},
+    "Platform/NMEA": {"time1": "nmea_time"},
+}
+
+
+def _is_kongsberg(root_attrs: Dict) -> bool:
+    combined_pattern = "|".join(re.escape(s) for s in KONGSBERG_SONAR_MODELS)
+    return bool(re.search(combined_pattern, root_attrs.get("keywords", "")))
+
+
+def _get_legacy_renames(
+    root_attrs: Dict, group_dims: Dict[str, List[str]]
+) -> Dict[str, Dict[str, str]]:
+    """
+    Get the renames needed to upgrade a converted file, from its groups dimensions.
+
+    Parameters
+    ----------
+    root_attrs : dict
+        Attributes of the Top-level group
+    group_dims : dict
+        Dimensions of each group, keyed on the group path without leading slash
+
+    Returns
+    -------
+    dict
+        The renames of each group, empty if the file is not legacy
+    """
+    # Need to check both Platform/NMEA and Sonar groups, because:
+    # - datasets from some instruments may not have `channel_all` or `channel` in Sonar
+    # - datasets from some instruments may not have `Platform/NMEA` altogether (no GPS data)
+    # TODO: remove this check once adding NMEA subgroup to all sonar_model for consistency
+    is_kongsberg = _is_kongsberg(root_attrs)
+    if is_kongsberg and "nmea_time" in group_dims.get("Platform/NMEA", []):
+        return {}
+    if not is_kongsberg and "channel_all" in group_dims.get("Sonar", []):
+        return {}
+
+    renames = {}
+    for group, group_renames in LEGACY_RENAMES.items():
+        if group == "Platform/NMEA" and not is_kongsberg:
+            continue
+        group_renames = {
+            old: new for old, new in group_renames.items() if old in group_dims.get(group, [])
+        }
+        if group_renames:
+            renames[group] = group_renames
+    return renames
+
+
+def upgrade_legacy_groups(groups: Dict[str, xr.Dataset]) -> Dict[str, xr.Dataset]:
+    """
+    Upgrade the groups of a legacy converted file, if needed.
+
+    Only dimensions and coordinates are renamed, so that lazily opened
+    variables are not loaded.
+
+    Parameters
+    ----------
+    groups : dict
+        The datasets of each group, as returned by ``xr.open_groups``
+
+    Returns
+    -------
+    dict
+        The upgraded datasets of each group
+    """
+    renames = _get_legacy_renames(
+        groups["/"].attrs,
+        {path.lstrip("/"): list(ds.dims) for path, ds in groups.items()},
+    )
+    if renames:
+        groups = dict(groups)
+        for group, group_renames in renames.items():
+            groups[f"/{group}"] = groups[f"/{group}"].rename(group_renames)
+    return groups
+
+
+def _rename_zarr_dims(group: zarr.Group, renames: Dict[str, str]) -> None:
+    """Rename dimensions and coordinate arrays in the metadata of a zarr group."""
+    for name, array in list(group.arrays()):
+        attrs = array.attrs.asdict()
+        dims = attrs.get("_ARRAY_DIMENSIONS", [])
+        new_attrs = {}
+        if any(dim in renames for dim in dims):
+            new_attrs["_ARRAY_DIMENSIONS"] = [renames.get(dim, dim) for dim in dims]
+        if "coordinates" in attrs:
+            coords = " ".join(renames.get(c, c) for c in attrs["coordinates"].split())
+            if coords != attrs["coordinates"]:
+                new_attrs["coordinates"] = coords
+        if new_attrs:
+            array.attrs.update(new_attrs)
+    for old, new in renames.items():
+        if old in group:
+            # Only the (small) coordinate array is moved, its chunks are not rewritten
+            group.move(old, new)
+
+
+def upgrade_legacy_zarr(
+    paths: Union[str, List[str]],
+    storage_options: Optional[Dict[str, str]] = None,
+    dry_run: bool = False,
+) -> List[str]:
+    """
+    Upgrade legacy converted zarr stores in place, by rewriting their metadata.
+
+    Dimension names and coordinate arrays are renamed in the zarr metadata,
+    so that the stores can be opened without an upgrade on every open.
+    Data chunks are neither read nor rewritten.
+    Stores that are already up to date are left untouched.
+
+    Parameters
+    ----------
+    paths : str or list of str
+        Paths of the zarr stores, which may contain glob patterns
+    storage_options : dict, optional
+        Additional keywords to pass to the filesystem class
+    dry_run : bool
+        If ``True``, only find the stores that need an upgrade.
+        Defaults to ``False``
+
+    Returns
+    -------
+    list of str
+        The paths of the upgraded (or to be upgraded with ``dry_run=True``) stores
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    storage_options = storage_options if storage_options is not None else {}
+    fs, _, expanded_paths = fsspec.core.get_fs_token_paths(
+        paths, mode="rb", storage_options=storage_options, expand=True
+    )
+
+    upgraded = []
+    for path in expanded_paths:
+        store = fs.get_mapper(path)
+        root = zarr.open_group(store, mode="r" if dry_run else "r+")
+        group_dims = {}
+        for group in LEGACY_RENAMES:
+            if group in root:
+                group_dims[group] = [
+                    dim
+                    for _, array in root[group].arrays()
+                    for dim in array.attrs.get("_ARRAY_DIMENSIONS", [])
+                ]
+        renames = _get_legacy_renames(root.attrs.asdict(), group_dims)
+        if not renames:
+            continue
+
+        url = fs.unstrip_protocol(path)
+        upgraded.append(url)
+        if dry_run:
+            continue
+        for group, group_renames in renames.items():
+            _rename_zarr_dims(root[group], group_renames)
+        if ".zmetadata" in store:
+            zarr.consolidate_metadata(store)
+        logger.info(f"Upgraded legacy metadata of {url}: {json.dumps(renames)}")
+
+    return upgraded
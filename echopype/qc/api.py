@@ -1,5 +1,8 @@
-from typing import List, Optional
+import warnings
+from typing import Any, Dict, List, Optional, Union
 
+import dask
+import dask.array
 import numpy as np
 import xarray as xr
 
@@ -9,35 +12,108 @@ from ..utils.log import _init_logger
 logger = _init_logger(__name__)
 
 
-def _clean_reversed(time_old: np.ndarray, win_len: int):
-    time_old_diff = np.diff(time_old)
+def _median_nonnegative_interval(
+    time_diff: Union[np.ndarray, dask.array.Array],
+) -> Union[np.ndarray, dask.array.Array]:
+    """Median of the non-negative time intervals in ns, 0 if there are none."""
+    xp = dask.array if isinstance(time_diff, dask.array.Array) else np
+    diff_ns = time_diff.astype("timedelta64[ns]").astype(np.float64)
+    with warnings.catch_warnings():
+        # no non-negative interval
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        median = xp.nanmedian(xp.where(diff_ns >= 0, diff_ns, np.nan), axis=0)
+    return xp.where(xp.isnan(median), 0, median)
+
 
-    # get indices of arr_diff with negative values
-    neg_idx = np.argwhere(time_old_diff < np.timedelta64(0, "ns")).flatten()
+def _median_interval_before(
+    time_diff: np.ndarray, fallback: Union[float, np.ndarray], win_len: int
+) -> np.ndarray:
+    """
+    Replace each negative time interval by the median of the ``win_len`` intervals before it.
 
-    # substitute out the reversed timestamp using the previous one
-    new_diff = []
-    for ni in neg_idx:
-        local_win_idx = ni + np.arange(-win_len, 0)
-        if local_win_idx[0] < 0:
-            first_valid_idx = np.argwhere(local_win_idx == 0).flatten()[0]
-            local_win_idx = local_win_idx[first_valid_idx:]
-        new_diff.append(np.median(time_old_diff[local_win_idx]))
-    time_old_diff[neg_idx] = new_diff
+    The medians are computed on sliding windows over the original intervals.
+    A negative interval without any interval before it is replaced by ``fallback``,
+    the median of all non-negative intervals in ns, given as a scalar
+    or an array broadcastable to ``time_diff``.
+    """
+    neg_idx = np.flatnonzero(time_diff < np.timedelta64(0, "ns"))
+    if neg_idx.size == 0:
+        return time_diff
+
+    # windows of the win_len intervals before each interval,
+    # NaN-padded before the first interval
+    diff_ns = time_diff.astype("timedelta64[ns]").astype(np.float64)
+    padded = np.concatenate([np.full(win_len, np.nan), diff_ns])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, win_len)[neg_idx]
+    with warnings.catch_warnings():
+        # all-NaN window of a reversal at the first interval
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        medians = np.nanmedian(windows, axis=1)
+    fallback = np.broadcast_to(fallback, time_diff.shape)[neg_idx]
+    medians = np.where(np.isnan(medians), fallback, medians)
+
+    new_diff = time_diff.copy()
+    new_diff[neg_idx] = medians.astype(np.int64).astype("timedelta64[ns]")
+    return new_diff
+
+
+def _clean_reversed(time_old: Union[np.ndarray, dask.array.Array], win_len: int):
+    """
+    Coerce a 1-D time array to flow forward, preserving the non-negative time intervals.
+
+    Each negative time interval is replaced by the median of the ``win_len``
+    intervals before it, and the times are reconstructed as the cumulative sum
+    of the intervals from the first time. The computation is vectorized and lazy
+    if ``time_old`` is a dask array, in which case the windows extend across
+    the block boundaries.
+    """
+    time_old_diff = time_old[1:] - time_old[:-1]
+    # Fallback of the reversals without intervals before them,
+    # computed over all intervals so that the result does not depend on the chunks
+    fallback = _median_nonnegative_interval(time_old_diff)
+    if isinstance(time_old, dask.array.Array):
+        # The windows do not extend before the first interval
+        depth = max(min(win_len, time_old_diff.size - 1), 0)
+        new_diff = dask.array.map_overlap(
+            _median_interval_before,
+            time_old_diff,
+            dask.array.broadcast_to(fallback, time_old_diff.shape, chunks=time_old_diff.chunks),
+            depth={0: (depth, 0)},
+            boundary="none",
+            dtype=time_old_diff.dtype,
+            win_len=win_len,
+        )
+    else:
+        new_diff = _median_interval_before(time_old_diff, fallback, win_len)
 
-    # perform cumulative sum of differences after 1st neg index
-    c_diff = np.cumsum(time_old_diff[neg_idx[0] :], axis=0)
+    # cumulative sum of differences, which preserves the differences
+    # but enforces increasing values
+    xp = dask.array if isinstance(time_old, dask.array.Array) else np
+    return xp.concatenate([time_old[:1], time_old[0] + xp.cumsum(new_diff, axis=0)])
 
-    # create new array that preserves differences, but enforces increasing vals
-    new_time = time_old.copy()
-    new_time[neg_idx[0] + 1 :] = new_time[neg_idx[0]] + c_diff
 
-    return new_time
+def _get_correction_summary(
+    time_old: np.ndarray, time_new: np.ndarray, time_name: str
+) -> Dict[str, Any]:
+    """Summary of the corrections made to a time coordinate, for QC logs."""
+    time_old_diff = np.diff(time_old)
+    reversed_idx = np.flatnonzero(time_old_diff < np.timedelta64(0, "ns")) + 1
+    shift = np.abs(time_new - time_old)
+    return {
+        "time_name": time_name,
+        "n_reversals": int(reversed_idx.size),
+        "reversed_indices": reversed_idx,
+        "max_backward_jump": (
+            -time_old_diff.min() if reversed_idx.size > 0 else np.timedelta64(0, "ns")
+        ),
+        "n_corrected": int((shift > np.timedelta64(0, "ns")).sum()),
+        "max_shift": shift.max() if shift.size > 0 else np.timedelta64(0, "ns"),
+    }
 
 
 def coerce_increasing_time(
-    ds: xr.Dataset, time_name: str = "ping_time", win_len: int = 100
-) -> None:
+    ds: xr.Dataset, time_name: str = "ping_time", win_len: int = 100, summary: bool = False
+) -> Optional[Dict[str, Any]]:
     """
     Coerce a time coordinate so that it always flows forward. If coercion
     is necessary, the input `ds` will be directly modified.
@@ -51,10 +127,19 @@ def coerce_increasing_time(
     win_len : int
         length of the local window before the reversed timestamp within which
         the median pinging interval is used to infer the next ping time
+    summary : bool
+        If ``True``, return a summary of the corrections.
+        This computes the time coordinate if it is lazy.
 
     Returns
     -------
-    the input dataset but with specified time coordinate coerced to flow forward
+    dict or None
+        If ``summary=True``, a summary of the corrections with keys
+        ``time_name``, ``n_reversals`` (number of time reversals),
+        ``reversed_indices`` (indices of the first sample after each reversal),
+        ``max_backward_jump`` (largest reversal), ``n_corrected``
+        (number of corrected timestamps) and ``max_shift``
+        (largest correction of a timestamp)
 
     Notes
     -----
@@ -62,9 +147,21 @@ def coerce_increasing_time(
     where a time coordinate (``ping_time`` or ``time1``) would suddenly
     go backward for one ping, but then the rest of the pinging interval
     would remain undisturbed.
+
+    The correction is vectorized. If the time variable is a lazy dask array
+    (i.e. not an indexed coordinate), it is corrected lazily and replaced in ``ds``.
     """
+    time_old = ds[time_name].data
+    time_new = _clean_reversed(time_old, win_len)
+    if isinstance(time_old, dask.array.Array):
+        ds[time_name] = ds[time_name].copy(data=time_new)
+    else:
+        time_old = time_old.copy() if summary else time_old
+        ds[time_name].data[:] = time_new
 
-    ds[time_name].data[:] = _clean_reversed(ds[time_name].data, win_len)
+    if summary:
+        time_old, time_new = dask.compute(time_old, time_new)
+        return _get_correction_summary(time_old, time_new, time_name)
 
 
 def exist_reversed_time(ds, time_name):
@@ -81,7 +178,7 @@ def exist_reversed_time(ds, time_name):
     -------
     `True` if at least one time reversal is found, `False` otherwise.
     """
-    return (np.diff(ds[time_name]) < np.timedelta64(0, "ns")).any()
+    return bool((np.diff(ds[time_name].data) < np.timedelta64(0, "ns")).any())
 
 
 def check_and_correct_reversed_time(
@@ -120,7 +217,12 @@ def check_and_correct_reversed_time(
             " (see https://github.com/OSOceanAcoustics/echopype/pull/297)"
         )
         old_time = combined_group[time_str].copy()
-        coerce_increasing_time(combined_group, time_name=time_str)
+        summary = coerce_increasing_time(combined_group, time_name=time_str, summary=True)
+        logger.info(
+            f"{ed_group} {time_str}: {summary['n_reversals']} reversals corrected "
+            f"(largest {summary['max_backward_jump']}), {summary['n_corrected']} timestamps "
+            f"shifted by up to {summary['max_shift']}"
+        )
     else:
         old_time = None
 
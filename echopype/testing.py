@@ -425,3 +425,226 @@ def _gen_ping_data_dict_complex(
 
 
 # End helper functions for ping data dict
+
+
+# Helper functions to generate mock EchoData
+def _gen_echodata_ek60(
+    frequency=[18000.0, 38000.0, 120000.0],
+    ping_time_len=20,
+    range_sample_len=100,
+    ping_time_start="2018-07-01",
+    ping_time_interval="1s",
+    latitude_range=(42.0, 42.1),
+    longitude_range=(-124.1, -124.0),
+    source_file="mock-D20180701-T000000.raw",
+    seed=0,
+):
+    """
+    Mock EchoData object with the structure of a raw-converted EK60 file.
+
+    The beam group contains random power samples (in dB) for all channels,
+    and all variables needed by ``compute_Sv`` and ``compute_TS`` are populated,
+    so that the object can be used in place of a converted file.
+    The Platform group holds a straight ship track from the lower left to the upper right
+    corner of ``latitude_range`` x ``longitude_range``, sampled at each ping time.
+
+    Parameters
+    ----------
+    frequency
+        nominal frequency [Hz] of each channel
+    ping_time_len
+        number of pings
+    range_sample_len
+        number of samples along range
+    ping_time_start
+        first ping time
+    ping_time_interval
+        ping interval as a pandas frequency string
+    latitude_range, longitude_range
+        start and end of the ship track
+    source_file
+        name of the (fake) raw file
+    seed
+        random seed for the backscatter data
+
+    Returns
+    -------
+    EchoData
+    """
+    from xarray import DataTree
+
+    from .echodata import EchoData
+    from .utils.coding import set_time_encodings
+    from .utils.prov import echopype_prov_attrs, source_files_vars
+
+    rng = np.random.default_rng(seed)
+    frequency = np.array(frequency, dtype=np.float64)
+    channel = [
+        f"GPT {int(f // 1000):3d} kHz 00907205a6d0 {i+1}-1 ES{int(f // 1000)}"
+        for i, f in enumerate(frequency)
+    ]
+    ping_time = pd.date_range(ping_time_start, periods=ping_time_len, freq=ping_time_interval)
+    ch_len = len(channel)
+
+    def _ch_pt(val):
+        return (["channel", "ping_time"], np.full((ch_len, ping_time_len), val, dtype=np.float64))
+
+    top = xr.Dataset(
+        attrs={
+            "conventions": "CF-1.7, SONAR-netCDF4-1.0, ACDD-1.3",
+            "keywords": "EK60",
+            "sonar_convention_authority": "ICES",
+            "sonar_convention_name": "SONAR-netCDF4",
+            "sonar_convention_version": "1.0",
+            "summary": "",
+            "title": "",
+            "date_created": str(ping_time[0].strftime("%Y-%m-%dT%H:%M:%SZ")),
+            "survey_name": "mock_survey",
+        }
+    )
+
+    env = xr.Dataset(
+        {
+            "absorption_indicative": (
+                ["channel", "time1"],
+                (
+                    np.array([[0.0025], [0.0098], [0.0379]])[:ch_len]
+                    if ch_len <= 3
+                    else np.full((ch_len, 1), 0.01)
+                ),
+            ),
+            "sound_speed_indicative": (["time1"], [1500.0]),
+            "frequency_nominal": (["channel"], frequency),
+        },
+        coords={"channel": channel, "time1": ping_time[:1]},
+    )
+
+    track = np.linspace(0, 1, ping_time_len)
+    platform = xr.Dataset(
+        {
+            "latitude": (
+                ["time1"],
+                latitude_range[0] + track * (latitude_range[1] - latitude_range[0]),
+            ),
+            "longitude": (
+                ["time1"],
+                longitude_range[0] + track * (longitude_range[1] - longitude_range[0]),
+            ),
+            "sentence_type": (["time1"], np.array(["GGA"] * ping_time_len)),
+            "pitch": (["time2"], np.zeros(ping_time_len)),
+            "roll": (["time2"], np.zeros(ping_time_len)),
+            "vertical_offset": (["time2"], np.zeros(ping_time_len)),
+            "water_level": ([], 0.0),
+            "transducer_offset_x": (["channel"], np.zeros(ch_len)),
+            "transducer_offset_y": (["channel"], np.zeros(ch_len)),
+            "transducer_offset_z": (["channel"], np.zeros(ch_len)),
+            "frequency_nominal": (["channel"], frequency),
+        },
+        coords={"channel": channel, "time1": ping_time, "time2": ping_time},
+        attrs={"platform_name": "mock vessel", "platform_type": "Research vessel"},
+    )
+
+    nmea = xr.Dataset(
+        {
+            "NMEA_datagram": (
+                ["nmea_time"],
+                np.array(["$GPGGA,mock"] * ping_time_len),
+            ),
+        },
+        coords={"nmea_time": ping_time},
+        attrs={"description": "All NMEA sensor datagrams"},
+    )
+
+    files_vars = source_files_vars(source_file)
+    provenance = (
+        xr.Dataset(attrs=echopype_prov_attrs(process_type="conversion"))
+        .assign(**files_vars["source_files_var"])
+        .assign_coords(**files_vars["source_files_coord"])
+    )
+    provenance.attrs["duplicate_ping_times"] = 0
+
+    sonar = xr.Dataset(
+        {"beam_group_descr": (["beam_group"], ["contains backscatter power (uncalibrated)"])},
+        coords={"beam_group": ["Beam_group1"], "channel_all": channel},
+        attrs={"sonar_manufacturer": "Simrad", "sonar_model": "EK60", "sonar_type": "echosounder"},
+    )
+
+    beam = xr.Dataset(
+        {
+            "frequency_nominal": (["channel"], frequency),
+            "beam_type": (["channel"], np.ones(ch_len, dtype=np.int64)),
+            "beamwidth_twoway_alongship": (["channel"], np.full(ch_len, 7.0)),
+            "beamwidth_twoway_athwartship": (["channel"], np.full(ch_len, 7.0)),
+            "beam_direction_x": (["channel"], np.zeros(ch_len)),
+            "beam_direction_y": (["channel"], np.zeros(ch_len)),
+            "beam_direction_z": (["channel"], np.ones(ch_len)),
+            "angle_offset_alongship": (["channel"], np.zeros(ch_len)),
+            "angle_offset_athwartship": (["channel"], np.zeros(ch_len)),
+            "angle_sensitivity_alongship": (["channel"], np.full(ch_len, 21.97)),
+            "angle_sensitivity_athwartship": (["channel"], np.full(ch_len, 21.97)),
+            "equivalent_beam_angle": (["channel"], np.full(ch_len, -20.7)),
+            "gain_correction": (["channel"], np.full(ch_len, 25.0)),
+            "transmit_frequency_start": (["channel"], frequency),
+            "transmit_frequency_stop": (["channel"], frequency),
+            "sample_interval": _ch_pt(2.56e-4),
+            "transmit_bandwidth": _ch_pt(2425.0),
+            "transmit_duration_nominal": _ch_pt(1.024e-3),
+            "transmit_power": _ch_pt(1000.0),
+            "data_type": (["channel", "ping_time"], np.full((ch_len, ping_time_len), 3)),
+            "sample_time_offset": _ch_pt(0.0),
+            "channel_mode": (["channel", "ping_time"], np.zeros((ch_len, ping_time_len))),
+            "backscatter_r": (
+                ["channel", "ping_time", "range_sample"],
+                rng.uniform(-150, -30, size=(ch_len, ping_time_len, range_sample_len)),
+            ),
+            "angle_athwartship": (
+                ["channel", "ping_time", "range_sample"],
+                rng.integers(-127, 127, size=(ch_len, ping_time_len, range_sample_len)).astype(
+                    np.float64
+                ),
+            ),
+            "angle_alongship": (
+                ["channel", "ping_time", "range_sample"],
+                rng.integers(-127, 127, size=(ch_len, ping_time_len, range_sample_len)).astype(
+                    np.float64
+                ),
+            ),
+        },
+        coords={
+            "channel": channel,
+            "ping_time": ping_time,
+            "range_sample": np.arange(range_sample_len),
+        },
+        attrs={"beam_mode": "vertical", "conversion_equation_t": "type_3"},
+    )
+
+    pulse_length = np.tile([2.56e-4, 5.12e-4, 1.024e-3, 2.048e-3, 4.096e-3], (ch_len, 1))
+    vendor = xr.Dataset(
+        {
+            "frequency_nominal": (["channel"], frequency),
+            "sa_correction": (["channel", "pulse_length_bin"], np.full((ch_len, 5), -0.7)),
+            "gain_correction": (["channel", "pulse_length_bin"], np.full((ch_len, 5), 25.0)),
+            "pulse_length": (["channel", "pulse_length_bin"], pulse_length),
+        },
+        coords={"channel": channel, "pulse_length_bin": np.arange(5)},
+    )
+
+    tree_dict = {
+        "/": top,
+        "Environment": set_time_encodings(env),
+        "Platform": set_time_encodings(platform),
+        "Platform/NMEA": set_time_encodings(nmea),
+        "Provenance": provenance,
+        "Sonar": sonar,
+        "Sonar/Beam_group1": set_time_encodings(beam),
+        "Vendor_specific": vendor,
+    }
+    tree = DataTree.from_dict(tree_dict, name="root")
+    echodata = EchoData(source_file=source_file, sonar_model="EK60")
+    echodata._set_tree(tree)
+    echodata._load_tree()
+
+    return echodata
+
+
+# End helper functions for mock EchoData
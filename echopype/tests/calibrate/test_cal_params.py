@@ -11,6 +11,7 @@ from echopype.calibrate.cal_params import (
     _get_interp_da,
     get_cal_params_AZFP,
     get_cal_params_EK,
+    get_cal_params_EK_freq,
     get_vend_cal_params_power,
 )
 
@@ -285,25 +286,18 @@ def test_sanitize_user_cal_dict(sonar_type, user_dict, channel, out_dict):
 @pytest.mark.parametrize(
     ("da_param", "alternative", "da_output"),
     [
-        # da_param: alternative is const: output is xr.DataArray with all const
+        # da_param: alternative is const: output is xr.DataArray with all const,
+        #   not expanded along ping_time
         (
             None,
             1,
-            xr.DataArray(
-                np.ones((2, 200)),
-                dims=["channel", "ping_time"],
-                coords={"channel": ["chA", "chB"], "ping_time": TIME_COORDINATES},
-            ),
+            xr.DataArray([1.0, 1.0], dims=["channel"], coords={"channel": ["chA", "chB"]}),
         ),
         # da_param: alternative is xr.DataArray: output selected with the right channel
         (
             None,
             xr.DataArray([1, 1, 2], dims=["channel"], coords={"channel": ["chA", "chB", "chC"]}),
-            xr.DataArray(
-                np.ones((2, 200)),
-                dims=["channel", "ping_time"],
-                coords={"channel": ["chA", "chB"], "ping_time": TIME_COORDINATES},
-            ),
+            xr.DataArray([1, 1], dims=["channel"], coords={"channel": ["chA", "chB"]}),
         ),
         # da_param: xr.DataArray with freq-dependent values/coordinates
         #   - output should be interpolated with the right values
@@ -386,6 +380,88 @@ def test_get_interp_da(freq_center, da_param, alternative, da_output):
     assert da_interp.identical(da_output)
 
 
+def test_get_interp_da_ping_invariant():
+    # CW freq_center does not vary with ping_time: interpolated values neither
+    freq_center = xr.DataArray([25, 55], dims=["channel"], coords={"channel": ["chA", "chB"]})
+    da_param = xr.DataArray(
+        np.array([[1, 2, 3, 4], [10, 20, 30, 40]]),
+        dims=["cal_channel_id", "cal_frequency"],
+        coords={"cal_channel_id": ["chB", "chA"], "cal_frequency": [10, 30, 50, 70]},
+    )
+    da_interp = _get_interp_da(da_param, freq_center, 75)
+    assert da_interp.identical(
+        xr.DataArray([17.5, 3.25], dims=["channel"], coords={"channel": ["chA", "chB"]})
+    )
+
+    # only the BB_factor varies with ping_time: the alternative is scaled lazily
+    BB_factor = xr.DataArray(
+        DATA,
+        dims=["channel", "ping_time"],
+        coords={"channel": ["chA", "chB"], "ping_time": np.arange(200)},
+    ).chunk({"ping_time": 50})
+    alternative = xr.DataArray([1.0, 2.0], dims=["channel"], coords={"channel": ["chA", "chB"]})
+    da_interp = _get_interp_da(None, freq_center, alternative, BB_factor=BB_factor)
+    assert da_interp.dims == ("channel", "ping_time")
+    assert da_interp.chunks is not None
+    assert_allclose(da_interp.compute(), alternative * BB_factor.compute())
+
+
+def test_get_cal_params_EK_freq():
+    channel = xr.DataArray(["chA", "chB"], dims=["channel"], coords={"channel": ["chA", "chB"]})
+    freq_center = xr.DataArray(
+        [[40.0, 40.0, 40.0], [100.0, 100.0, 100.0]],
+        dims=["channel", "ping_time"],
+        coords={"channel": channel, "ping_time": np.arange(3)},
+    )
+    frequency = xr.DataArray([20.0, 40.0, 80.0], dims=["frequency"])
+    frequency = frequency.assign_coords(frequency=frequency)
+    cal_params = {
+        p: xr.DataArray([1.0, 2.0], dims=["channel"], coords={"channel": channel})
+        for p in [
+            "gain_correction",
+            "beamwidth_alongship",
+            "beamwidth_athwartship",
+            "equivalent_beam_angle",
+            "angle_offset_alongship",
+            "angle_offset_athwartship",
+            "impedance_transducer",
+        ]
+    }
+    # only chA has a frequency-dependent gain
+    vend = xr.Dataset(
+        {
+            "gain": xr.DataArray(
+                [[10.0, 30.0, 50.0, 70.0]],
+                dims=["cal_channel_id", "cal_frequency"],
+                coords={"cal_channel_id": ["chA"], "cal_frequency": [20.0, 40.0, 60.0, 80.0]},
+            )
+        }
+    )
+
+    out = get_cal_params_EK_freq(cal_params, freq_center, frequency, vend)
+    assert out["gain_correction"].dims == ("channel", "ping_time", "frequency")
+    np.testing.assert_allclose(out["gain_correction"].sel(channel="chA"), [[10, 30, 70]] * 3)
+    np.testing.assert_allclose(
+        out["gain_correction"].sel(channel="chB"), [2 + 20 * np.log10([0.2, 0.4, 0.8])] * 3
+    )
+    np.testing.assert_allclose(
+        out["beamwidth_alongship"].sel(channel="chA").isel(ping_time=0), [2.0, 1.0, 0.5]
+    )
+    np.testing.assert_allclose(
+        out["equivalent_beam_angle"].sel(channel="chA").isel(ping_time=0),
+        1 - 20 * np.log10([0.5, 1, 2]),
+    )
+    # parameters constant with frequency are kept along channel
+    assert out["angle_offset_alongship"].identical(cal_params["angle_offset_alongship"])
+
+    # the parameters given by the user are not taken from the Vendor_specific group
+    out = get_cal_params_EK_freq(cal_params, freq_center, frequency, vend, ["gain_correction"])
+    np.testing.assert_allclose(
+        out["gain_correction"].sel(channel="chA").isel(ping_time=0),
+        1 + 20 * np.log10([0.5, 1, 2]),
+    )
+
+
 @pytest.mark.parametrize(
     ("user_dict", "out_dict"),
     [
@@ -545,9 +621,7 @@ def test_get_cal_params_AZFP(beam_AZFP, vend_AZFP, user_dict, out_dict):
                         np.array([111, 222]), dims=["channel"], coords={"channel": ["chA", "chB"]}
                     ),
                     "impedance_transducer": xr.DataArray(
-                        np.ones((2, 200)) * 75,
-                        dims=["channel", "ping_time"],
-                        coords={"channel": ["chA", "chB"], "ping_time": TIME_COORDINATES},
+                        np.array([75, 75]), dims=["channel"], coords={"channel": ["chA", "chB"]}
                     ),
                     "impedance_transceiver": xr.DataArray(
                         np.array([1000, 2000]), dims=["channel"], coords={"channel": ["chA", "chB"]}
@@ -602,9 +676,7 @@ def test_get_cal_params_AZFP(beam_AZFP, vend_AZFP, user_dict, out_dict):
                         np.array([111, 222]), dims=["channel"], coords={"channel": ["chA", "chB"]}
                     ),
                     "impedance_transducer": xr.DataArray(
-                        np.ones((2, 200)) * 75,
-                        dims=["channel", "ping_time"],
-                        coords={"channel": ["chA", "chB"], "ping_time": TIME_COORDINATES},
+                        np.array([75, 75]), dims=["channel"], coords={"channel": ["chA", "chB"]}
                     ),
                     "impedance_transceiver": xr.DataArray(
                         np.array([1000, 2000]), dims=["channel"], coords={"channel": ["chA", "chB"]}
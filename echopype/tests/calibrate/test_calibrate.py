@@ -4,6 +4,7 @@ import pytest
 from scipy.io import loadmat
 import echopype as ep
 from echopype.calibrate.env_params_old import EnvParams
+from echopype.testing import _gen_echodata_ek60
 import xarray as xr
 import dask.array as da
 
@@ -431,3 +432,264 @@ def test_fm_equals_bb():
     # Check that they are equal
     assert ds_Sv_bb.equals(ds_Sv_fm)
     assert ds_TS_bb.equals(ds_TS_fm)
+
+
+def test_compute_products_ek60():
+    """Test computing Sv, TS and split-beam angles at once."""
+    ed = _gen_echodata_ek60(ping_time_len=10, range_sample_len=50)
+    out = ep.calibrate.compute(ed, products=["Sv", "TS", "angles"])
+    assert set(out) == {"Sv", "TS", "angles"}
+    assert out["Sv"].attrs["processing_function"] == "calibrate.compute"
+
+    for cal_type in ["Sv", "TS"]:
+        ds_cal = ep.calibrate.api._compute_cal(cal_type, ed)
+        xr.testing.assert_identical(
+            out[cal_type].drop_attrs(deep=False), ds_cal.drop_attrs(deep=False)
+        )
+
+    ds_Sv = ep.consolidate.add_splitbeam_angle(
+        ep.calibrate.compute_Sv(ed), ed, "CW", "power", to_disk=False
+    )
+    for var in ["angle_alongship", "angle_athwartship"]:
+        xr.testing.assert_allclose(out["angles"][var], ds_Sv[var])
+
+    with pytest.raises(ValueError, match="products"):
+        ep.calibrate.compute(ed, products=["MVBS"])
+    with pytest.raises(ValueError, match="pc_store"):
+        ep.calibrate.compute(ed, products=["Sv"], pc_store="pc.zarr")
+
+
+@pytest.mark.parametrize("chunks", [None, {"ping_time": 3, "range_sample": 20}])
+def test_cal_power_samples_fused(chunks):
+    """Test the one-pass calibration of power samples against the step-by-step computation."""
+    ed = _gen_echodata_ek60(ping_time_len=10, range_sample_len=50)
+    if chunks is not None:
+        ed["Sonar/Beam_group1"] = ed["Sonar/Beam_group1"].chunk(chunks)
+    cal_obj = ep.calibrate.calibrate_ek.CalibrateEK60(ed, None, None, None)
+    beam = ed["Sonar/Beam_group1"]
+    env_params, cal_params = cal_obj.env_params, cal_obj.cal_params
+
+    tvg_mod_range = ep.calibrate.range.range_mod_TVG_EK(
+        ed, "Sonar/Beam_group1", cal_obj.range_meter, env_params["sound_speed"]
+    )
+    tvg_mod_range = tvg_mod_range.where(tvg_mod_range > 0, np.nan)
+    spreading_loss = 20 * np.log10(tvg_mod_range)
+    absorption_loss = 2 * env_params["sound_absorption"] * tvg_mod_range
+    wavelength = env_params["sound_speed"] / beam["frequency_nominal"]
+    CSv = (
+        10 * np.log10(beam["transmit_power"])
+        + 2 * cal_params["gain_correction"]
+        + cal_params["equivalent_beam_angle"]
+        + 10
+        * np.log10(
+            wavelength**2
+            * beam["transmit_duration_nominal"]
+            * env_params["sound_speed"]
+            / (32 * np.pi**2)
+        )
+    )
+    Sv = (
+        beam["backscatter_r"]
+        + spreading_loss
+        + absorption_loss
+        - CSv
+        - 2 * cal_params["sa_correction"]
+    )
+
+    ds_Sv = cal_obj._cal_power_samples("Sv")
+    if chunks is not None:
+        assert ds_Sv["Sv"].chunks == beam["backscatter_r"].chunks
+    xr.testing.assert_identical(ds_Sv["Sv"].compute(), Sv.compute().rename("Sv"))
+
+    ds_Sv_32 = cal_obj._cal_power_samples("Sv", dtype=np.float32)
+    assert ds_Sv_32["Sv"].dtype == np.float32
+    np.testing.assert_allclose(ds_Sv_32["Sv"].values, Sv.values, rtol=1e-6)
+
+
+@pytest.mark.parametrize("cal_type", ["Sv", "TS"])
+def test_compute_cal_float32(cal_type):
+    """Test single precision calibration against the documented error bounds."""
+    ed = _gen_echodata_ek60(ping_time_len=10, range_sample_len=500)
+    compute_cal = getattr(ep.calibrate, f"compute_{cal_type}")
+    ds_64 = compute_cal(ed)
+    ds_32 = compute_cal(ed, dtype="float32")
+
+    assert ds_32[cal_type].dtype == np.float32
+    assert ds_32["echo_range"].dtype == np.float32
+    np.testing.assert_allclose(ds_32[cal_type], ds_64[cal_type], rtol=0, atol=1e-5)
+    np.testing.assert_allclose(ds_32["echo_range"], ds_64["echo_range"], rtol=6e-8)
+
+    with pytest.raises(ValueError, match="dtype"):
+        compute_cal(ed, dtype="int16")
+
+
+@pytest.mark.parametrize("cal_type", ["Sv", "TS"])
+def test_compute_cal_to_zarr(cal_type, tmp_path, monkeypatch):
+    """Test block-wise calibration to a zarr store, and its resume after an interruption."""
+    ed = _gen_echodata_ek60(ping_time_len=25, range_sample_len=40)
+    compute_cal = getattr(ep.calibrate, f"compute_{cal_type}")
+    ds_ref = compute_cal(ed)
+
+    ds_out = compute_cal(ed, output_path=tmp_path / "full.zarr", ping_block=10)
+    assert ds_out[cal_type].chunks[1] == (10, 10, 5)
+    assert ep.calibrate.api.PROGRESS_ATTR not in ds_out.attrs
+    xr.testing.assert_allclose(ds_out.compute(), ds_ref)
+
+    # interrupt the calibration of the third block
+    compute_cal_orig = ep.calibrate.api._compute_cal
+    n_calls = []
+    fail_at = [4]
+
+    def _compute_cal_failing(*args, **kwargs):
+        n_calls.append(1)
+        if len(n_calls) == fail_at[0]:
+            raise RuntimeError("interrupted")
+        return compute_cal_orig(*args, **kwargs)
+
+    monkeypatch.setattr(ep.calibrate.api, "_compute_cal", _compute_cal_failing)
+    output_path = tmp_path / "resumed.zarr"
+    with pytest.raises(RuntimeError, match="interrupted"):
+        compute_cal(ed, output_path=output_path, ping_block=10)
+    progress = xr.open_zarr(output_path, consolidated=False).attrs[
+        ep.calibrate.api.PROGRESS_ATTR
+    ]
+    assert progress["n_done"] == 2
+
+    # only the remaining block is calibrated
+    n_calls.clear()
+    ds_out = compute_cal(ed, output_path=output_path, ping_block=10)
+    assert len(n_calls) == 2
+    xr.testing.assert_allclose(ds_out.compute(), ds_ref)
+
+    # blocks calibrated with other settings are not resumed
+    n_calls.clear()
+    with pytest.raises(RuntimeError, match="interrupted"):
+        compute_cal(ed, output_path=output_path, ping_block=10)
+    n_calls.clear()
+    fail_at[0] = None
+    env_params = {"sound_speed": 1450.0}
+    ds_out = compute_cal(ed, output_path=output_path, ping_block=10, env_params=env_params)
+    assert len(n_calls) == 4
+    xr.testing.assert_allclose(ds_out.compute(), compute_cal(ed, env_params=env_params))
+
+    with pytest.raises(ValueError, match="ping_block"):
+        compute_cal(ed, ping_block=10)
+
+
+def test_compute_cal_to_zarr_non_monotonic(tmp_path):
+    """Test that ping blocks are selected by position when ping_time is not monotonic."""
+    ed = _gen_echodata_ek60(ping_time_len=25, range_sample_len=40)
+    ping_time = ed["Sonar/Beam_group1"]["ping_time"].values.copy()
+    # a time reversal moves ping 15 back within the time span of the first block
+    ping_time[15] = ping_time[5] + (ping_time[6] - ping_time[5]) / 2
+    ed["Sonar/Beam_group1"] = ed["Sonar/Beam_group1"].assign_coords(ping_time=ping_time)
+    ds_ref = ep.calibrate.compute_Sv(ed)
+
+    ds_out = ep.calibrate.compute_Sv(ed, output_path=tmp_path / "Sv.zarr", ping_block=10)
+    np.testing.assert_array_equal(ds_out["ping_time"].values, ping_time)
+    xr.testing.assert_allclose(ds_out.compute(), ds_ref)
+
+
+def test_compute_cal_to_zarr_beam_group2(tmp_path, monkeypatch):
+    """Test that ping blocks are selected in the calibrated beam group, not the first one."""
+    ed = _gen_echodata_ek60(ping_time_len=25, range_sample_len=40)
+    beam = ed["Sonar/Beam_group1"]
+    interval = beam["ping_time"].values[1] - beam["ping_time"].values[0]
+    # pings of the two beam groups are interleaved, as for EK80 complex and power samples
+    groups = {node.path: node.to_dataset(inherit=False) for node in ed._tree.subtree}
+    groups["/Sonar/Beam_group2"] = beam.assign_coords(ping_time=beam["ping_time"] + interval / 2)
+    ed = ed._derive(xr.DataTree.from_dict(groups, name="root"))
+    for module in [ep.calibrate.api, ep.calibrate.calibrate_ek, ep.calibrate.range]:
+        monkeypatch.setattr(
+            module, "retrieve_correct_beam_group", lambda *args, **kwargs: "Sonar/Beam_group2"
+        )
+    ds_ref = ep.calibrate.compute_Sv(ed)
+
+    ds_out = ep.calibrate.compute_Sv(ed, output_path=tmp_path / "Sv.zarr", ping_block=10)
+    np.testing.assert_array_equal(
+        ds_out["ping_time"].values, ed["Sonar/Beam_group2"]["ping_time"].values
+    )
+    xr.testing.assert_allclose(ds_out.compute(), ds_ref)
+
+
+@pytest.mark.parametrize("cal_type", ["Sv", "TS"])
+@pytest.mark.parametrize("chunks", [None, {"ping_time": 3, "range_sample": 20}])
+def test_cal_power_samples_fused_azfp(cal_type, chunks, monkeypatch):
+    """Test the one-pass calibration of AZFP samples against the step-by-step computation."""
+    rng = np.random.default_rng(0)
+    channel = xr.DataArray(["ch_0", "ch_1"], dims="channel")
+    beam = xr.Dataset(
+        {
+            "backscatter_r": (
+                ("channel", "ping_time", "range_sample"),
+                rng.integers(0, 65535, (2, 10, 50)).astype(np.float64),
+            ),
+            "transmit_duration_nominal": (("channel", "ping_time"), np.full((2, 10), 3e-4)),
+            "frequency_nominal": ("channel", [125000.0, 200000.0]),
+        },
+        coords={"channel": channel, "ping_time": np.arange(10)},
+    )
+    if chunks is not None:
+        beam = beam.chunk(chunks)
+    range_meter = (
+        (0.1 + 0.2 * beam["range_sample"]) * xr.ones_like(beam["transmit_duration_nominal"])
+    ).rename("echo_range")
+
+    def param(*vals):
+        return xr.DataArray(list(vals), dims="channel", coords={"channel": channel})
+
+    env_params = {"sound_speed": param(1500.0, 1500.0), "sound_absorption": param(0.04, 0.05)}
+    cal_params = {
+        "EL": param(150.0, 160.0),
+        "DS": param(0.025, 0.026),
+        "TVR": param(170.0, 175.0),
+        "VTX0": param(200.0, 210.0),
+        "equivalent_beam_angle": param(0.01, 0.012),
+        "Sv_offset": param(1.1, 1.2),
+    }
+    monkeypatch.setattr(
+        ep.calibrate.calibrate_azfp.CalibrateAZFP, "compute_echo_range", lambda self, cal_type: None
+    )
+
+    def _calibrate(dtype):
+        cal_obj = ep.calibrate.calibrate_azfp.CalibrateAZFP.__new__(
+            ep.calibrate.calibrate_azfp.CalibrateAZFP
+        )
+        cal_obj.echodata = {"Sonar/Beam_group1": beam}
+        cal_obj.env_params, cal_obj.cal_params = env_params, cal_params
+        cal_obj.range_meter, cal_obj.dtype = range_meter, dtype
+        return cal_obj._cal_power_samples(cal_type)[cal_type]
+
+    # eq.(5), (9) and (10) of the AZFP Operator's Manual
+    a = cal_params["DS"]
+    EL = cal_params["EL"] - 2.5 / a + beam["backscatter_r"] / (26214 * a)
+    SL = cal_params["TVR"] + 20 * np.log10(cal_params["VTX0"])
+    spreading_loss = 20 * np.log10(range_meter)
+    absorption_loss = 2 * env_params["sound_absorption"] * range_meter
+    if cal_type == "Sv":
+        expected = (
+            EL
+            - SL
+            + spreading_loss
+            + absorption_loss
+            - 10
+            * np.log10(
+                0.5
+                * env_params["sound_speed"]
+                * beam["transmit_duration_nominal"]
+                * cal_params["equivalent_beam_angle"]
+            )
+            + cal_params["Sv_offset"]
+        )
+    else:
+        expected = EL - SL + 2 * spreading_loss + absorption_loss
+
+    out = _calibrate(None)
+    assert out.dims == ("channel", "ping_time", "range_sample")
+    if chunks is not None:
+        assert out.chunks == beam["backscatter_r"].chunks
+    xr.testing.assert_allclose(out.compute(), expected.compute().rename(cal_type), rtol=1e-12)
+
+    out_32 = _calibrate(np.dtype(np.float32))
+    assert out_32.dtype == np.float32
+    np.testing.assert_allclose(out_32.values, expected.values, rtol=1e-6)
@@ -451,3 +451,110 @@ def test_ek80_BB_complex_multiplex_NaNs_and_non_NaNs(raw_data_path, target_chann
         target_channel_ping_pattern,
         equal_nan=True
     )
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_ek80_BB_compute_products(ek80_path, tmp_path, monkeypatch, spill):
+    """Test sharing the pulse compression output across Sv, TS and split-beam angles."""
+    ed = ep.open_raw(ek80_path / "D20170912-T234910.raw", sonar_model="EK80")
+    kwargs = dict(waveform_mode="BB", encode_mode="complex")
+
+    n_calls = []
+    compress_pulse = ep.calibrate.calibrate_ek.compress_pulse
+    monkeypatch.setattr(
+        ep.calibrate.calibrate_ek,
+        "compress_pulse",
+        lambda *args, **kw: n_calls.append(1) or compress_pulse(*args, **kw),
+    )
+    pc_store = str(tmp_path / "pc.zarr") if spill else None
+    out = ep.calibrate.compute(ed, products=["Sv", "TS", "angles"], pc_store=pc_store, **kwargs)
+    assert len(n_calls) == 1
+    if spill:
+        assert (tmp_path / "pc.zarr" / "pulse_compressed").exists()
+
+    ds_Sv = ep.calibrate.compute_Sv(ed, **kwargs)
+    ds_TS = ep.calibrate.compute_TS(ed, **kwargs)
+    xr.testing.assert_allclose(out["Sv"]["Sv"], ds_Sv["Sv"])
+    xr.testing.assert_allclose(out["TS"]["TS"], ds_TS["TS"])
+
+    ds_Sv = ep.consolidate.add_splitbeam_angle(
+        ds_Sv, ed, pulse_compression=True, to_disk=False, **kwargs
+    )
+    for var in ["angle_alongship", "angle_athwartship"]:
+        xr.testing.assert_allclose(out["angles"][var], ds_Sv[var])
+
+
+@pytest.mark.parametrize(
+    "raw_file, waveform_mode",
+    [("D20170912-T234910.raw", "BB"), ("D20230804-T083032.raw", "CW")],
+)
+def test_ek80_complex_float32(ek80_path, raw_file, waveform_mode):
+    """Test single precision calibration of complex samples."""
+    ed = ep.open_raw(ek80_path / raw_file, sonar_model="EK80")
+    kwargs = dict(waveform_mode=waveform_mode, encode_mode="complex")
+    ds_64 = ep.calibrate.compute_Sv(ed, **kwargs)
+    ds_32 = ep.calibrate.compute_Sv(ed, dtype="float32", **kwargs)
+
+    assert ds_32["Sv"].dtype == np.float32
+    # errors are larger only where the transducer sectors cancel out
+    err = np.abs(ds_32["Sv"].values - ds_64["Sv"].values)
+    assert np.nanpercentile(err, 99) < 2e-5
+    np.testing.assert_array_equal(np.isnan(ds_32["Sv"]), np.isnan(ds_64["Sv"]))
+
+    if waveform_mode == "BB":
+        cal_obj = ep.calibrate.calibrate_ek.CalibrateEK80(
+            ed, env_params=None, cal_params=None, dtype=np.float32, **kwargs
+        )
+        assert cal_obj.get_pulse_compressed().dtype == np.complex64
+
+
+def test_ek80_BB_compute_Svf(ek80_path):
+    """Test Sv and TS at each frequency of BB channels."""
+    ed = ep.open_raw(ek80_path / "D20170912-T234910.raw", sonar_model="EK80")
+    ds_Svf = ep.calibrate.compute_Svf(ed)
+    ds_TSf = ep.calibrate.compute_TSf(ed)
+
+    dims = ("channel", "ping_time", "range_window", "frequency")
+    assert ds_Svf["Svf"].dims == dims and ds_TSf["TSf"].dims == dims
+    assert ds_Svf["echo_range"].dims == dims[:-1]
+    # computed lazily in blocks of pings
+    assert ds_Svf["Svf"].chunks is not None
+
+    # frequencies are within the transmit band of each channel
+    beam = ed["Sonar/Beam_group1"]
+    freq_low = np.minimum(beam["transmit_frequency_start"], beam["transmit_frequency_stop"])
+    freq_high = np.maximum(beam["transmit_frequency_start"], beam["transmit_frequency_stop"])
+    in_band = (ds_Svf["frequency"] >= freq_low) & (ds_Svf["frequency"] <= freq_high)
+    Svf = ds_Svf["Svf"].compute()
+    assert Svf.where(~in_band).isnull().all()
+    assert Svf.where(in_band).notnull().any()
+
+    # Sv(f) and TS(f) only differ by the spreading and the sampled volume
+    window_duration = 10 ** (
+        (
+            Svf
+            - ds_TSf["TSf"]
+            + 20 * np.log10(ds_Svf["echo_range"])
+            + 10 * np.log10(ds_Svf["sound_speed"] / 2)
+            + ds_Svf["equivalent_beam_angle"]
+        )
+        / -10
+    )
+    for ch in Svf["channel"].values:
+        values = window_duration.sel(channel=ch).values
+        values = values[np.isfinite(values)]
+        np.testing.assert_allclose(values, values[0])
+
+    # the band average of Sv(f) agrees with the band-integrated Sv at the window centers
+    ds_Sv = ep.calibrate.compute_Sv(ed, waveform_mode="BB", encode_mode="complex")
+    Svf_band = (10 ** (Svf / 10)).mean(dim="frequency")
+    for ch in Svf["channel"].values:
+        echo_range = ds_Sv["echo_range"].sel(channel=ch).isel(ping_time=0).values
+        echo_range_window = ds_Svf["echo_range"].sel(channel=ch).isel(ping_time=0).values
+        valid = np.isfinite(echo_range_window) & (echo_range_window > 5)
+        window_center = np.searchsorted(echo_range, echo_range_window[valid])
+        Sv_lin = 10 ** (ds_Sv["Sv"].sel(channel=ch).isel(range_sample=window_center).values / 10)
+        Svf_lin = Svf_band.sel(channel=ch).isel(range_window=np.flatnonzero(valid)).values
+        finite = np.isfinite(Sv_lin) & np.isfinite(Svf_lin)
+        # both are averaged over the same pings and windows, within 1 dB
+        assert abs(10 * np.log10(Svf_lin[finite].mean() / Sv_lin[finite].mean())) < 1
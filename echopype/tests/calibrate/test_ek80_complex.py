@@ -2,12 +2,21 @@ import pytest
 import numpy as np
 import xarray as xr
 
-from echopype.calibrate.ek80_complex import get_vend_filter_EK80
+from echopype.calibrate.ek80_complex import (
+    _build_replica,
+    compress_pulse,
+    get_filter_coeff,
+    get_tau_effective,
+    get_transmit_replicas,
+    get_transmit_signal,
+    get_vend_filter_EK80,
+    get_window_spectra,
+)
 
 
 @pytest.fixture
 def ek80_path(test_path):
-    return test_path['EK80']
+    return test_path["EK80"]
 
 
 def gen_mock_vend(ch_num, filter_len=10, has_nan=False):
@@ -16,20 +25,20 @@ def gen_mock_vend(ch_num, filter_len=10, has_nan=False):
             "WBT_filter_r": (["channel", "WBT_filter_n"], np.random.rand(ch_num, filter_len)),
             "WBT_filter_i": (["channel", "WBT_filter_n"], np.random.rand(ch_num, filter_len)),
             "WBT_decimation": 6,
-            "PC_filter_r": (["channel", "PC_filter_n"], np.random.rand(ch_num, filter_len*2)),
-            "PC_filter_i": (["channel", "PC_filter_n"], np.random.rand(ch_num, filter_len*2)),
+            "PC_filter_r": (["channel", "PC_filter_n"], np.random.rand(ch_num, filter_len * 2)),
+            "PC_filter_i": (["channel", "PC_filter_n"], np.random.rand(ch_num, filter_len * 2)),
             "PC_decimation": 1,
         },
         coords={
             "channel": [f"ch_{ch}" for ch in np.arange(ch_num)],
             "WBT_filter_n": np.arange(filter_len),
-            "PC_filter_n": np.arange(filter_len*2),
-        }
+            "PC_filter_n": np.arange(filter_len * 2),
+        },
     )
     if has_nan:  # replace some parts of filter coeff with NaN
         if filter_len != 1:
-            vend["WBT_filter_r"].data[:, int(filter_len/2):] = np.nan
-            vend["WBT_filter_i"].data[:, int(filter_len/2):] = np.nan
+            vend["WBT_filter_r"].data[:, int(filter_len / 2) :] = np.nan
+            vend["WBT_filter_i"].data[:, int(filter_len / 2) :] = np.nan
             vend["PC_filter_r"].data[:, filter_len:] = np.nan
             vend["PC_filter_i"].data[:, filter_len:] = np.nan
         else:
@@ -51,23 +60,270 @@ def gen_mock_vend(ch_num, filter_len=10, has_nan=False):
         "filter_coeff_filled",
         "filter_coeff_has_nan",
         "filter_coeff_len_1",
-    ]
+    ],
 )
 def test_get_vend_filter_EK80(ch_num, filter_len, has_nan):
     vend = gen_mock_vend(ch_num, filter_len, has_nan)
-    
+
     for ch in [f"ch_{ch}" for ch in np.arange(ch_num)]:
         for filter_name in ["WBT", "PC"]:
             var_imag = f"{filter_name}_filter_i"
             var_real = f"{filter_name}_filter_r"
             var_df = f"{filter_name}_decimation"
             sel_vend = vend.sel(channel=ch)
-            
+
             assert np.all(
-                (sel_vend[var_real] + 1j * sel_vend[var_imag]).dropna(dim=f"{filter_name}_filter_n").values
-                == get_vend_filter_EK80(vend, channel_id=ch, filter_name=filter_name, param_type="coeff")
+                (sel_vend[var_real] + 1j * sel_vend[var_imag])
+                .dropna(dim=f"{filter_name}_filter_n")
+                .values
+                == get_vend_filter_EK80(
+                    vend, channel_id=ch, filter_name=filter_name, param_type="coeff"
+                )
             )
 
             assert sel_vend[var_df].values == get_vend_filter_EK80(
                 vend, channel_id=ch, filter_name=filter_name, param_type="decimation"
             )
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [None, {"ping_time": 2}, {"range_sample": 500, "channel": 1}],
+    ids=["numpy", "dask_ping_time", "dask_range_sample_channel"],
+)
+def test_compress_pulse_fft(chunks):
+    rng = np.random.default_rng(0)
+    shape = (3, 5, 3000, 4)
+    bs = xr.DataArray(
+        (rng.standard_normal(shape) + 1j * rng.standard_normal(shape)).astype(np.complex64),
+        dims=("channel", "ping_time", "range_sample", "beam"),
+        coords={"channel": ["ch_0", "ch_1", "ch_2"]},
+    )
+    # NaN-padded pings and a missing ping
+    bs[0, :, 2000:, :] = np.nan
+    bs[1, 3] = np.nan
+    # replicas of different lengths, longer than some range_sample chunks
+    chirp = {
+        ch: rng.standard_normal(n) + 1j * rng.standard_normal(n)
+        for ch, n in zip(["ch_0", "ch_1", "ch_2"], [700, 57, 1])
+    }
+    pc_direct = compress_pulse(bs, chirp, engine="direct").compute()
+
+    if chunks is not None:
+        bs = bs.chunk(chunks)
+    pc = compress_pulse(bs, chirp)
+    assert pc.dims == bs.dims
+    assert pc.dtype == np.complex64
+    if chunks is not None:
+        assert pc.chunks is not None
+        assert len(pc.chunksizes["channel"]) == len(bs.chunksizes["channel"])
+
+    np.testing.assert_array_equal(np.isnan(pc.values), np.isnan(pc_direct.values))
+    scale = np.nanmax(np.abs(pc_direct.values))
+    np.testing.assert_allclose(pc.values, pc_direct.values, atol=1e-5 * scale)
+
+
+def gen_mock_beam_tx(ping_time_len=6):
+    """Transmit parameters varying by ping on ch_0, with missing pings on ch_1."""
+    nan = np.nan
+    beam = xr.Dataset(
+        data_vars={
+            "transmit_type": (["channel", "ping_time"], np.full((2, ping_time_len), "LFM")),
+            "transmit_duration_nominal": (
+                ["channel", "ping_time"],
+                [
+                    [1.024e-3, 2.048e-3] * (ping_time_len // 2),
+                    [5.12e-4, nan] * (ping_time_len // 2),
+                ],
+            ),
+            "slope": (["channel", "ping_time"], np.full((2, ping_time_len), 0.1)),
+            "transmit_frequency_start": (
+                ["channel", "ping_time"],
+                [[34000.0] * ping_time_len, [90000.0, nan] * (ping_time_len // 2)],
+            ),
+            "transmit_frequency_stop": (
+                ["channel", "ping_time"],
+                [[45000.0] * ping_time_len, [160000.0, nan] * (ping_time_len // 2)],
+            ),
+        },
+        coords={"channel": ["ch_0", "ch_1"], "ping_time": np.arange(ping_time_len)},
+    )
+    return beam
+
+
+def test_get_transmit_replicas():
+    np.random.seed(0)
+    beam = gen_mock_beam_tx()
+    coeff = get_filter_coeff(gen_mock_vend(2))
+    fs = 1.5e6
+
+    _build_replica.cache_clear()
+    replicas, ds_tx = get_transmit_replicas(beam, coeff, "BB", fs)
+    # each unique transmit configuration is built once
+    assert [len(replicas[ch]) for ch in ["ch_0", "ch_1"]] == [2, 1]
+    assert _build_replica.cache_info().misses == 3
+    np.testing.assert_array_equal(
+        ds_tx["replica_index"].values, [[0, 1, 0, 1, 0, 1], [0, -1, 0, -1, 0, -1]]
+    )
+    assert np.isnan(ds_tx["tau_effective"].values[1, 1::2]).all()
+
+    # replicas and effective pulse lengths match those of pings with the same configuration
+    for k, pings in enumerate([[0, 2, 4], [1, 3, 5]]):
+        beam_k = beam.sel(channel=["ch_0"]).isel(ping_time=pings)
+        tx, tx_time = get_transmit_signal(beam_k, coeff, "BB", fs)
+        tau_effective = get_tau_effective(
+            ytx_dict=tx,
+            fs_deci_dict={ch: 1 / np.diff(t[:2]) for ch, t in tx_time.items()},
+            waveform_mode="BB",
+            channel=beam_k["channel"],
+            ping_time=None,
+        )
+        np.testing.assert_array_equal(replicas["ch_0"][k], tx["ch_0"])
+        np.testing.assert_allclose(
+            ds_tx["tau_effective"].isel(channel=0, ping_time=pings), tau_effective.values[0]
+        )
+        np.testing.assert_allclose(
+            ds_tx["norm_fac"].isel(channel=0, ping_time=pings),
+            np.linalg.norm(tx["ch_0"]) ** 2,
+        )
+
+    # replicas are reused across calls
+    replicas_again, _ = get_transmit_replicas(beam, coeff, "BB", fs)
+    assert _build_replica.cache_info().hits == 3
+    assert replicas_again["ch_0"][0] is replicas["ch_0"][0]
+
+
+@pytest.mark.parametrize("engine", ["fft", "direct"])
+@pytest.mark.parametrize("chunks", [None, {"ping_time": 4, "range_sample": 300}])
+def test_compress_pulse_replica_index(engine, chunks):
+    rng = np.random.default_rng(0)
+    shape = (2, 6, 1000, 4)
+    bs = xr.DataArray(
+        (rng.standard_normal(shape) + 1j * rng.standard_normal(shape)).astype(np.complex64),
+        dims=("channel", "ping_time", "range_sample", "beam"),
+        coords={"channel": ["ch_0", "ch_1"], "ping_time": np.arange(6)},
+    )
+    bs[1, 1::2] = np.nan
+    chirp = {
+        "ch_0": [rng.standard_normal(n) + 1j * rng.standard_normal(n) for n in [100, 37]],
+        "ch_1": [rng.standard_normal(20) + 1j * rng.standard_normal(20)],
+    }
+    replica_index = xr.DataArray(
+        [[0, 1, 0, 1, 1, 0], [0, -1, 0, -1, 0, -1]],
+        dims=("channel", "ping_time"),
+        coords={"channel": ["ch_0", "ch_1"], "ping_time": np.arange(6)},
+    )
+
+    if chunks is not None:
+        bs = bs.chunk(chunks)
+    pc = compress_pulse(bs, chirp, engine=engine, replica_index=replica_index).compute()
+    assert pc.dims == bs.dims
+
+    # compare against the pings of each transmit configuration compressed separately
+    for ch, k, pings in [("ch_0", 0, [0, 2, 5]), ("ch_0", 1, [1, 3, 4]), ("ch_1", 0, [0, 2, 4])]:
+        bs_k = bs.sel(channel=[ch]).isel(ping_time=pings)
+        pc_k = compress_pulse(bs_k, {ch: chirp[ch][k]}, engine="direct").compute()
+        scale = np.abs(pc_k.values).max()
+        np.testing.assert_allclose(
+            pc.sel(channel=[ch]).isel(ping_time=pings).values, pc_k.values, atol=1e-5 * scale
+        )
+    assert np.isnan(pc.sel(channel="ch_1").isel(ping_time=[1, 3, 5]).values).all()
+
+
+@pytest.mark.parametrize("chunks", [None, {"ping_time": 2}])
+def test_get_window_spectra(chunks):
+    fs_deci = 62500.0
+    t = np.arange(62) / fs_deci
+    # baseband LFM from -5 to 5 kHz
+    chirp = np.exp(2j * np.pi * (-5e3 * t + 0.5 * 10e3 / t[-1] * t**2))
+    auto = np.correlate(chirp, chirp, mode="full") / np.linalg.norm(chirp) ** 2
+
+    # point targets of amplitude 0.3 at the center of the 5th window of each ping
+    window_len = {"ch_0": 128, "ch_1": 64}
+    pc = np.zeros((2, 4, 1000), dtype=np.complex128)
+    for ch_seq, n in enumerate(window_len.values()):
+        center = 4 * n // 2 + n // 2
+        pc[ch_seq, :, center - chirp.size + 1 : center + chirp.size] = 0.3 * auto
+    pc = xr.DataArray(
+        pc,
+        dims=("channel", "ping_time", "range_sample"),
+        coords={"channel": ["ch_0", "ch_1"], "ping_time": np.arange(4)},
+    )
+    replica_index = xr.DataArray(
+        [[0, 0, 0, 0], [0, -1, 0, 0]],
+        dims=("channel", "ping_time"),
+        coords={"channel": ["ch_0", "ch_1"], "ping_time": np.arange(4)},
+    )
+    if chunks is not None:
+        pc = pc.chunk(chunks)
+    frequency = np.arange(-4e3, 4.5e3, 500)
+
+    spectra, window_center = get_window_spectra(
+        pc,
+        {"ch_0": [chirp], "ch_1": [chirp]},
+        replica_index,
+        {"ch_0": fs_deci, "ch_1": fs_deci},
+        window_len,
+        frequency,
+    )
+    assert spectra.dims == ("channel", "ping_time", "range_window", "frequency")
+    assert (spectra.chunks is None) == (chunks is None)
+    spectra = spectra.compute()
+
+    # the number of windows follows the window length of each channel
+    assert spectra.sizes["range_window"] == (1000 - 64) // 32 + 1
+    np.testing.assert_array_equal(window_center.sel(channel="ch_0")[[0, 1, -1]], [64, 128, -1])
+    assert np.isnan(spectra.sel(channel="ch_0").isel(range_window=-1)).all()
+
+    # the spectra of the windows centered on the targets are the target power
+    np.testing.assert_allclose(spectra.sel(channel="ch_0").isel(range_window=4), 0.09, rtol=1e-10)
+    np.testing.assert_allclose(
+        spectra.sel(channel="ch_1").isel(range_window=4, ping_time=[0, 2, 3]), 0.09, rtol=1e-10
+    )
+    assert np.isnan(spectra.sel(channel="ch_1").isel(ping_time=1)).all()
+
+
+def test_get_window_spectra_aliased_volume():
+    fs_deci = 62500.0
+    t = np.arange(62) / fs_deci
+    # band-pass LFM from 70 to 80 kHz, aliased by the decimated sampling frequency
+    chirp = np.exp(2j * np.pi * (70e3 * t + 0.5 * 10e3 / t[-1] * t**2))
+    chirp *= np.hanning(t.size) ** 0.2
+    frequency = np.arange(71e3, 79.5e3, 500)
+    kwargs = dict(
+        replicas={"ch_0": [chirp]},
+        replica_index=xr.DataArray(
+            np.zeros((1, 200), dtype=int),
+            dims=("channel", "ping_time"),
+            coords={"channel": ["ch_0"]},
+        ),
+        fs_deci={"ch_0": fs_deci},
+        window_len={"ch_0": 128},
+        frequency=frequency,
+    )
+
+    # the spectrum of a tone peaks at its band-pass frequency
+    tone = np.exp(2j * np.pi * 75e3 * np.arange(1000) / fs_deci)
+    pc = xr.DataArray(
+        np.broadcast_to(tone, (1, 200, 1000)),
+        dims=("channel", "ping_time", "range_sample"),
+        coords={"channel": ["ch_0"]},
+    )
+    spectra, _ = get_window_spectra(pc, **kwargs)
+    assert frequency[int(spectra[0, 0, 0].argmax())] == 75e3
+
+    # volume backscattering from random scatterers
+    rng = np.random.default_rng(0)
+    scatterers = rng.standard_normal((200, 1200)) + 1j * rng.standard_normal((200, 1200))
+    auto = np.correlate(chirp, chirp, mode="full") / np.linalg.norm(chirp) ** 2
+    pc = np.array([np.convolve(s, auto, mode="same") for s in scatterers])[:, 100:1100]
+    pc = xr.DataArray(
+        pc[np.newaxis], dims=("channel", "ping_time", "range_sample"), coords={"channel": ["ch_0"]}
+    )
+    spectra, _ = get_window_spectra(pc, normalization="volume", **kwargs)
+
+    # the band average per sample of the windows is the power
+    # per effective pulse length, as for the band-integrated Sv
+    power_freq = spectra.mean().values / 128
+    power = (np.abs(pc) ** 2).mean().values / np.sum(np.abs(auto) ** 2)
+    assert abs(10 * np.log10(power_freq / power)) < 0.3
@@ -1,4 +1,5 @@
 import pytest
+from collections import OrderedDict
 
 import dask.array
 import numpy as np
@@ -6,6 +7,8 @@ import xarray as xr
 import pandas as pd
 
 import echopype as ep
+from echopype.utils.align import align_to_ping_time
+from echopype.testing import _gen_echodata_ek60
 from echopype.calibrate.env_params import (
     harmonize_env_param_time,
     sanitize_user_env_dict,
@@ -518,3 +521,68 @@ def test_get_env_params_EK80_from_data(
 
     assert env_dict["sound_speed"] == sound_speed_ref
     assert env_dict["sound_absorption"].identical(absorption_ref)
+
+
+@pytest.mark.unit
+def test_get_env_params_EK_memoized(monkeypatch):
+    ed = _gen_echodata_ek60(ping_time_len=20, range_sample_len=10)
+    beam = ed["Sonar/Beam_group1"]
+    time1 = beam["ping_time"].values[::6] + np.timedelta64(1, "s")
+    env_params = {
+        "temperature": xr.DataArray(
+            np.tile([8.0, 9.0, 11.0, 12.0], (beam["channel"].size, 1)),
+            dims=["channel", "time1"],
+            coords={"channel": beam["channel"].values, "time1": time1},
+        ),
+        "salinity": 30,
+        "pressure": 10,
+        "pH": 8,
+    }
+
+    n_calls = []
+    get_env_params_orig = ep.calibrate.env_params._get_env_params_EK
+
+    def _get_env_params_counted(*args, **kwargs):
+        n_calls.append(1)
+        return get_env_params_orig(*args, **kwargs)
+
+    monkeypatch.setattr(ep.calibrate.env_params, "_env_params_cache", OrderedDict())
+    monkeypatch.setattr(ep.calibrate.env_params, "_get_env_params_EK", _get_env_params_counted)
+
+    # calibrating again with different cal params reuses the env params
+    ds_Sv = ep.calibrate.compute_Sv(ed, env_params=env_params)
+    ds_Sv_gain = ep.calibrate.compute_Sv(
+        ed, env_params=env_params, cal_params={"gain_correction": 20}
+    )
+    assert len(n_calls) == 1
+    assert ds_Sv["sound_speed"].dims == ("channel", "ping_time")
+    xr.testing.assert_identical(ds_Sv["sound_absorption"], ds_Sv_gain["sound_absorption"])
+
+    # the interpolated values are those of align_to_ping_time
+    sound_speed = ep.utils.uwa.calc_sound_speed(
+        temperature=env_params["temperature"], salinity=30, pressure=10
+    )
+    xr.testing.assert_allclose(
+        ds_Sv["sound_speed"].reset_coords(drop=True),
+        align_to_ping_time(sound_speed, "time1", ds_Sv["ping_time"], method="linear"),
+        rtol=1e-12,
+    )
+
+    # different env params are computed again
+    ep.calibrate.compute_Sv(ed, env_params=dict(env_params, salinity=35))
+    assert len(n_calls) == 2
+
+    # the memoized parameters are released and computed again
+    ep.calibrate.clear_env_params_cache()
+    assert not ep.calibrate.env_params._env_params_cache
+    assert not ep.calibrate.env_params._interp_weights_cache
+    ep.calibrate.compute_Sv(ed, env_params=env_params)
+    assert len(n_calls) == 3
+
+    # the memoization is disabled with a cache size of 0
+    monkeypatch.setattr(ep.calibrate.env_params, "ENV_PARAMS_CACHE_SIZE", 0)
+    ep.calibrate.clear_env_params_cache()
+    ep.calibrate.compute_Sv(ed, env_params=env_params)
+    ep.calibrate.compute_Sv(ed, env_params=env_params)
+    assert len(n_calls) == 5
+    assert not ep.calibrate.env_params._env_params_cache
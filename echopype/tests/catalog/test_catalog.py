@@ -0,0 +1,177 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import echopype
+from echopype.catalog import Catalog
+from echopype.testing import _gen_echodata_ek60
+
+
+@pytest.fixture(scope="module")
+def survey_files(tmp_path_factory):
+    """Three converted files along a ship track, one of them at different frequencies."""
+    out_dir = tmp_path_factory.mktemp("survey")
+    specs = [
+        ("2023-07-04T00:00", (44.0, 44.1), (-125.0, -124.9), [18000.0, 38000.0]),
+        ("2023-07-04T02:30", (44.1, 44.2), (-124.9, -124.8), [18000.0, 38000.0]),
+        ("2023-07-04T05:00", (45.0, 45.1), (-124.0, -123.9), [70000.0, 120000.0]),
+    ]
+    paths = []
+    for idx, (start, lat, lon, freq) in enumerate(specs):
+        ed = _gen_echodata_ek60(
+            frequency=freq,
+            ping_time_len=10,
+            range_sample_len=5,
+            ping_time_start=start,
+            ping_time_interval="10min",
+            latitude_range=lat,
+            longitude_range=lon,
+            source_file=f"mock-{idx}.raw",
+        )
+        path = out_dir / f"mock-{idx}.zarr"
+        ed.to_zarr(path)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def catalog(survey_files, tmp_path):
+    catalog = Catalog(tmp_path / "catalog.db")
+    catalog.add(survey_files)
+    return catalog
+
+
+def test_catalog_add(catalog, survey_files):
+    assert len(catalog) == 3
+    assert all(p in catalog for p in survey_files)
+
+    df = catalog.to_dataframe()
+    assert df.loc[survey_files[0], "sonar_model"] == "EK60"
+    assert df.loc[survey_files[0], "start_time"] == pd.Timestamp("2023-07-04T00:00")
+    assert df.loc[survey_files[0], "end_time"] == pd.Timestamp("2023-07-04T01:30")
+    assert df.loc[survey_files[0], "latitude_min"] == pytest.approx(44.0)
+    assert df.loc[survey_files[0], "longitude_max"] == pytest.approx(-124.9)
+    assert df.loc[survey_files[2], "frequency_nominal"] == [70000.0, 120000.0]
+    assert df.loc[survey_files[0], "file_size"] > 0
+    shapes = json.loads(df.loc[survey_files[0], "group_shapes"])
+    assert {"channel": 2, "ping_time": 10, "range_sample": 5}.items() <= shapes[
+        "Sonar/Beam_group1"
+    ].items()
+
+
+def test_catalog_add_no_overwrite(catalog, survey_files):
+    assert catalog.add(survey_files, overwrite=False) == 0
+    assert catalog.add(survey_files[:1], overwrite=True) == 1
+    assert len(catalog) == 3
+
+
+def test_catalog_add_echodata(tmp_path):
+    ed = _gen_echodata_ek60(ping_time_len=5, range_sample_len=5)
+    catalog = Catalog(tmp_path / "catalog.db")
+
+    # in-memory data without a converted file cannot be indexed
+    with pytest.raises(ValueError):
+        catalog.add(ed)
+
+    ed.to_zarr(tmp_path / "mock.zarr")
+    catalog.add(ed)
+    assert str(tmp_path / "mock.zarr") in catalog
+
+
+@pytest.mark.parametrize(
+    "query, expected_idx",
+    [
+        ({}, [0, 1, 2]),
+        ({"start_time": "2023-07-04T02:00", "end_time": "2023-07-04T04:00"}, [1]),
+        ({"start_time": "2023-07-04T01:00", "end_time": "2023-07-04T03:00"}, [0, 1]),
+        ({"frequency": 38000}, [0, 1]),
+        ({"frequency": [38000, 120000]}, [0, 1, 2]),
+        ({"bbox": (-125.0, 44.05, -124.85, 44.15)}, [0, 1]),
+        ({"bbox": (-124.5, 44.5, -123.5, 45.5)}, [2]),
+        ({"start_time": "2023-07-04T02:00", "frequency": 120000}, [2]),
+        ({"sonar_model": "ek60"}, [0, 1, 2]),
+        ({"sonar_model": "EK80"}, []),
+    ],
+)
+def test_catalog_query(catalog, survey_files, query, expected_idx):
+    assert catalog.query(**query) == [survey_files[i] for i in expected_idx]
+
+
+def test_catalog_query_channel(catalog, survey_files):
+    ch = echopype.open_converted(survey_files[2])["Sonar/Beam_group1"]["channel"].values[0]
+    assert catalog.query(channel=str(ch)) == [survey_files[2]]
+
+
+def test_catalog_open(catalog, survey_files):
+    eds = catalog.open(frequency=18000)
+    assert [ed["Sonar/Beam_group1"].sizes["ping_time"] for ed in eds] == [10, 10]
+
+    ed_combined = catalog.open(frequency=18000, combine=True)
+    np.testing.assert_array_equal(
+        ed_combined["Sonar/Beam_group1"]["ping_time"].values,
+        np.concatenate([ed["Sonar/Beam_group1"]["ping_time"].values for ed in eds]),
+    )
+
+    with pytest.raises(ValueError):
+        catalog.open(frequency=200000)
+
+
+def test_catalog_remove(catalog, survey_files):
+    catalog.remove(survey_files[0])
+    assert len(catalog) == 2
+    assert catalog.query(frequency=18000) == [survey_files[1]]
+
+
+# Selects the pings at both ends of the first file track
+U_POLYGON = [
+    (-125.01, 43.99),
+    (-124.89, 43.99),
+    (-124.89, 44.11),
+    (-124.93, 44.11),
+    (-124.93, 43.995),
+    (-124.97, 43.995),
+    (-124.97, 44.11),
+    (-125.01, 44.11),
+]
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ({"bbox": (-125.0, 44.0, -124.95, 44.05)}, [(0, slice(0, 5))]),
+        ({"bbox": (-124.92, 44.08, -124.88, 44.12)}, [(0, slice(8, 10)), (1, slice(0, 2))]),
+        ({"polygon": U_POLYGON}, [(0, slice(0, 3)), (0, slice(7, 10)), (1, slice(0, 1))]),
+        ({"polygon": U_POLYGON, "bbox": (-125.0, 44.0, -124.8, 44.05)}, [(0, slice(0, 3))]),
+        ({"bbox": (-124.5, 44.5, -124.4, 44.6)}, []),
+    ],
+)
+def test_catalog_query_pings(catalog, survey_files, query, expected):
+    assert catalog.query_pings(**query) == [
+        (survey_files[i], "Sonar/Beam_group1", s) for i, s in expected
+    ]
+
+
+def test_catalog_ping_index(survey_files, tmp_path, monkeypatch):
+    # segments smaller than the files are merged in the query results
+    monkeypatch.setattr("echopype.catalog.api.PING_SEGMENT_SIZE", 4)
+    catalog = Catalog(tmp_path / "catalog.db")
+    catalog.add(survey_files, ping_index=False)
+    assert catalog.query_pings(bbox=(-180, -90, 180, 90)) == []
+
+    assert catalog.build_ping_index() == 3
+    assert catalog.build_ping_index() == 0
+    assert catalog.query_pings(bbox=(-180, -90, 180, 90)) == [
+        (path, "Sonar/Beam_group1", slice(0, 10)) for path in survey_files
+    ]
+
+    eds = catalog.open_pings(bbox=(-124.92, 44.08, -124.88, 44.12))
+    assert [ed["Sonar/Beam_group1"].sizes["ping_time"] for ed in eds] == [2, 2]
+    assert eds[1]["Sonar/Beam_group1"]["ping_time"].values[0] == np.datetime64("2023-07-04T02:30")
+
+    # the index of removed files is removed
+    catalog.remove(survey_files[0])
+    assert [r[0] for r in catalog.query_pings(bbox=(-180, -90, 180, 90))] == survey_files[1:]
+    with pytest.raises(ValueError):
+        catalog.open_pings(bbox=(-124.5, 44.5, -124.4, 44.6))
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from echopype.consolidate.split_beam_angle import (
+    _compute_angle_from_complex,
+    get_angle_complex_samples,
+)
+
+
+def _angle(a, b):
+    return np.rad2deg(np.arctan2(np.imag(a * np.conj(b)), np.real(a * np.conj(b))))
+
+
+def _angle_reference(bs, beam_type):
+    """Split-beam angles from the averages of the sectors."""
+    b = [bs.isel(beam=k) for k in range(bs.sizes["beam"])]
+    if beam_type == 1:
+        return _angle((b[2] + b[3]) / 2, (b[0] + b[1]) / 2), _angle(
+            (b[0] + b[3]) / 2, (b[1] + b[2]) / 2
+        )
+    if beam_type == 17:
+        star, port, fore = b[0], b[1], b[2]
+    else:
+        star, port, fore = (b[0] + b[3]) / 2, (b[1] + b[3]) / 2, (b[2] + b[3]) / 2
+    fac1, fac2 = _angle(fore, star), _angle(fore, port)
+    return (fac1 + fac2) / np.sqrt(3), fac2 - fac1
+
+
+@pytest.fixture
+def bs():
+    rng = np.random.default_rng(0)
+    shape = (2, 20, 100, 4)
+    bs = xr.DataArray(
+        rng.standard_normal(shape) + 1j * rng.standard_normal(shape),
+        dims=("channel", "ping_time", "range_sample", "beam"),
+        coords={"channel": ["ch_0", "ch_1"], "ping_time": np.arange(20)},
+    )
+    bs[0, 3, 10] = np.nan
+    return bs
+
+
+@pytest.mark.parametrize("beam_type", [1, 17, 49, 65, 81])
+@pytest.mark.parametrize("chunks", [None, {"ping_time": 8, "range_sample": 50}])
+@pytest.mark.parametrize("dtype", [np.complex128, np.complex64])
+def test_compute_angle_from_complex(bs, beam_type, chunks, dtype):
+    sens = [xr.DataArray([20.0, 25.0], dims="channel", coords={"channel": bs["channel"]})] * 2
+    offset = [xr.DataArray([0.1, -0.2], dims="channel", coords={"channel": bs["channel"]})] * 2
+    theta_ref, phi_ref = _angle_reference(bs, beam_type)
+    theta_ref = theta_ref / sens[0] - offset[0]
+    phi_ref = phi_ref / sens[1] - offset[1]
+
+    bs = bs.astype(dtype)
+    if chunks is not None:
+        bs = bs.chunk(chunks)
+    theta, phi = _compute_angle_from_complex(bs, beam_type, sens, offset)
+
+    # angles are computed blockwise, in the precision of the samples
+    assert theta.dims == ("channel", "ping_time", "range_sample")
+    assert (theta.chunks is None) == (chunks is None)
+    assert theta.dtype == phi.dtype == (np.float32 if dtype == np.complex64 else np.float64)
+    rtol = 1e-5 if dtype == np.complex64 else 1e-10
+    # the float32 phase of samples close to the +/-180° branch cut may flip sign
+    for angle, angle_ref in [(theta, theta_ref), (phi, phi_ref)]:
+        angle = angle.compute()
+        assert np.isnan(angle[0, 3, 10]) and angle.isnull().sum() == 1
+        close = np.isclose(angle, angle_ref, rtol=rtol, atol=rtol * 10, equal_nan=True)
+        assert close.mean() > 0.999
+
+
+def test_get_angle_complex_samples_beam_types(bs):
+    ds_beam = xr.Dataset(
+        {
+            "backscatter_r": bs.real.astype(np.float32),
+            "backscatter_i": bs.imag.astype(np.float32),
+            "beam_type": ("channel", [1, 17]),
+        }
+    ).chunk({"ping_time": 8})
+    angle_params = {
+        f"angle_{p}_{d}": xr.DataArray([v, v], dims="channel", coords={"channel": bs["channel"]})
+        for p, v in [("sensitivity", 20.0), ("offset", 0.0)]
+        for d in ["alongship", "athwartship"]
+    }
+
+    # channels of different beam types are computed separately and combined lazily
+    theta, phi = get_angle_complex_samples(ds_beam, angle_params)
+    assert theta.dims == ("channel", "ping_time", "range_sample")
+    assert theta.chunks is not None and theta.dtype == np.float32
+
+    bs = ds_beam["backscatter_r"] + 1j * ds_beam["backscatter_i"]
+    for ch_seq, beam_type in enumerate([1, 17]):
+        theta_ch, phi_ch = _compute_angle_from_complex(
+            bs.isel(channel=ch_seq), beam_type, [20.0, 20.0], [0.0, 0.0]
+        )
+        xr.testing.assert_allclose(theta.isel(channel=ch_seq), theta_ch)
+        xr.testing.assert_allclose(phi.isel(channel=ch_seq), phi_ch)
@@ -0,0 +1,88 @@
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import echopype
+from echopype.convert import cache
+from echopype.testing import _gen_echodata_ek60
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    path = tmp_path / "mock.raw"
+    path.write_bytes(b"mock raw data")
+    return str(path)
+
+
+def test_get_cache_key(raw_file):
+    key = cache.get_cache_key(raw_file, "EK60")
+    assert key == cache.get_cache_key(raw_file, "EK60")
+
+    # any change in the conversion inputs changes the key
+    assert key != cache.get_cache_key(raw_file, "ES70")
+    assert key != cache.get_cache_key(raw_file, "EK60", include_idx=True)
+    assert key != cache.get_cache_key(raw_file, "EK60", convert_params={"survey_name": "a"})
+
+    # modification time is part of the default key, but not of the content key
+    key_content = cache.get_cache_key(raw_file, "EK60", hash_content=True)
+    mtime = os.stat(raw_file).st_mtime + 10
+    os.utime(raw_file, (mtime, mtime))
+    assert key != cache.get_cache_key(raw_file, "EK60")
+    assert key_content == cache.get_cache_key(raw_file, "EK60", hash_content=True)
+
+    # content change modifies the content key
+    Path(raw_file).write_bytes(b"other raw data")
+    assert key_content != cache.get_cache_key(raw_file, "EK60", hash_content=True)
+
+
+def test_put_get_cached(tmp_path):
+    ed = _gen_echodata_ek60(ping_time_len=5, range_sample_len=10)
+
+    assert cache.get_cached("abc", cache_dir=tmp_path) is None
+    cached_path = cache.put_cached(ed, "abc", cache_dir=tmp_path)
+    assert cache.get_cached("abc", cache_dir=tmp_path) == cached_path
+    assert ed.converted_raw_path is None
+
+    ed_cached = echopype.open_converted(cached_path)
+    np.testing.assert_array_equal(
+        ed_cached["Sonar/Beam_group1"]["backscatter_r"].values,
+        ed["Sonar/Beam_group1"]["backscatter_r"].values,
+    )
+
+
+def test_evict_cache(tmp_path):
+    ed = _gen_echodata_ek60(ping_time_len=5, range_sample_len=10)
+    for idx, key in enumerate(["a", "b", "c"]):
+        path = cache.put_cached(ed, key, cache_dir=tmp_path)
+        # make access times distinct and ordered
+        os.utime(path, (time.time() + idx, time.time() + idx))
+    entry_size = cache._list_entries(tmp_path)[0][2]
+
+    # accessing "a" makes "b" the least recently used entry
+    os.utime(cache.get_cached("a", cache_dir=tmp_path), (time.time() + 10, time.time() + 10))
+    evicted = cache.evict_cache(max_size=2 * entry_size, cache_dir=tmp_path)
+    assert [Path(p).stem for p in evicted] == ["b"]
+    assert cache.get_cached("b", cache_dir=tmp_path) is None
+    assert cache.get_cached("a", cache_dir=tmp_path) is not None
+
+    cache.clear_cache(cache_dir=tmp_path)
+    assert cache._list_entries(tmp_path) == []
+
+
+@pytest.mark.integration
+def test_open_raw_use_cache(test_path, tmp_path, mocker):
+    raw_file = test_path["EK60"] / "ncei-wcsd" / "Summer2017-D20170615-T190214.raw"
+    cache_options = {"cache_dir": tmp_path}
+    parse_spy = mocker.spy(echopype.convert.parse_ek60.ParseEK60, "parse_raw")
+
+    ed = echopype.open_raw(raw_file, "EK60", use_cache=True, cache_options=cache_options)
+    ed_cached = echopype.open_raw(raw_file, "EK60", use_cache=True, cache_options=cache_options)
+
+    assert parse_spy.call_count == 1
+    assert ed_cached.converted_raw_path == ed.converted_raw_path
+    assert Path(ed_cached.converted_raw_path).parent == tmp_path
+    assert ed_cached.source_file == str(raw_file)
+    assert ed_cached["Sonar/Beam_group1"].identical(ed["Sonar/Beam_group1"])
@@ -5,6 +5,7 @@ import numpy as np
 import pytest
 from echopype.convert.parse_base import FILENAME_DATETIME_EK60, ParseBase, ParseEK, INDEX2POWER
 from echopype.convert.utils.ek_swap import calc_final_shapes
+from echopype.utils.swap import SwapManager, SwapQuotaError
 
 
 class TestParseBase:
@@ -233,3 +234,27 @@ class TestParseEK:
                 use_swap=True,
                 zarr_root=None,
             )
+
+    def test_rectangularize_data_swap_manager(self, tmp_path, mock_ping_data_dict_power_angle_simple):
+        parser = self._get_parser("EK60", mock_ping_data_dict_power_angle_simple)
+        with SwapManager(swap_dir=tmp_path) as swap_manager:
+            parser.rectangularize_data(use_swap=True)
+
+            # data are offloaded to a store of the active swap manager
+            assert parser.swap_store[0] is swap_manager
+            store_path = parser.swap_store[1].root
+            assert store_path.startswith(str(swap_manager.namespace))
+            assert swap_manager.usage() > 0
+            for arr in parser.ping_data_dict["power"].values():
+                if arr is not None:
+                    assert isinstance(arr, dask.array.Array)
+                    arr.compute()
+
+            # rectangularization fails fast when the quota would be exceeded
+            swap_manager.quota = 1
+            parser = self._get_parser("EK60", mock_ping_data_dict_power_angle_simple)
+            with pytest.raises(SwapQuotaError):
+                parser.rectangularize_data(use_swap=True)
+
+        # all stores are removed at exit
+        assert not swap_manager.namespace.exists()
@@ -847,3 +847,122 @@ def test_echodata_delete(caplog):
 
     # Check that it doesn't exist
     assert not os.path.exists(temp_zarr_path)
+
+
+@pytest.fixture
+def mock_converted_files(tmp_path):
+    ed = get_mock_echodata()
+    paths = []
+    for idx in range(4):
+        ext = ".zarr" if idx % 2 == 0 else ".nc"
+        path = tmp_path / f"mock_{idx}{ext}"
+        if ext == ".zarr":
+            ed.to_zarr(path)
+        else:
+            ed.to_netcdf(path)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.unit
+def test_open_mfconverted(mock_converted_files):
+    eds = echopype.open_mfconverted(mock_converted_files, max_workers=2)
+
+    assert len(eds) == len(mock_converted_files)
+    for ed, path in zip(eds, mock_converted_files):
+        assert isinstance(ed, EchoData)
+        assert Path(ed.converted_raw_path).name == Path(path).name
+        assert ed.sonar_model == "TEST"
+
+
+@pytest.mark.unit
+def test_open_mfconverted_shared_filesystem(mock_converted_files):
+    from echopype.echodata.api import _get_shared_mappers
+
+    zarr_paths = [p for p in mock_converted_files if p.endswith(".zarr")]
+    mappers = _get_shared_mappers(mock_converted_files, {})
+
+    zarr_mappers = [m for m in mappers if isinstance(m, fsspec.FSMap)]
+    assert len(zarr_mappers) == len(zarr_paths)
+    assert all(m.fs is zarr_mappers[0].fs for m in zarr_mappers)
+    # netcdf paths are passed through unchanged
+    assert [m for m in mappers if isinstance(m, str)] == [
+        p for p in mock_converted_files if p.endswith(".nc")
+    ]
+
+
+@pytest.mark.unit
+def test_open_mfconverted_retries(mock_converted_files, mocker):
+    from echopype.echodata import api
+
+    original = api.open_converted
+    calls = {"n": 0}
+
+    def flaky_open(*args, **kwargs):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise OSError("transient failure")
+        return original(*args, **kwargs)
+
+    mocker.patch.object(api, "open_converted", side_effect=flaky_open)
+
+    eds = echopype.open_mfconverted(
+        mock_converted_files[:1], retries=1, retry_delay=0, max_workers=1
+    )
+    assert len(eds) == 1
+    assert calls["n"] == 2
+
+    with pytest.raises(FileNotFoundError):
+        echopype.open_mfconverted(["does_not_exist.zarr"], retries=3, retry_delay=0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("ragged", [False, True])
+def test_echodata_sel_time(ragged):
+    from echopype.testing import _gen_echodata_ek60
+
+    ed = _gen_echodata_ek60(ping_time_len=30, range_sample_len=20)
+    start, end = np.datetime64("2018-07-01T00:00:05"), np.datetime64("2018-07-01T00:00:12")
+    ds_Sv = echopype.calibrate.compute_Sv(ed).sel(ping_time=slice(start, end))
+    if ragged:
+        ed.to_ragged()
+
+    ed_sel = ed.sel_time(start, end)
+    assert ed_sel["Sonar/Beam_group1"].sizes["ping_time"] == 8
+    # ancillary time dimensions are padded to cover the time span
+    for group, dim in [("Platform", "time1"), ("Platform/NMEA", "nmea_time")]:
+        times = ed_sel[group][dim].values
+        assert times[0] < start and times[-1] > end
+        assert times.size == 10
+    xr.testing.assert_identical(ed_sel["Environment"], ed["Environment"])
+    # the original object is unchanged
+    assert ed["Sonar/Beam_group1"].sizes["ping_time"] == 30
+
+    # processing functions work on the selection
+    ds_Sv_sel = echopype.calibrate.compute_Sv(ed_sel)
+    xr.testing.assert_allclose(ds_Sv_sel["Sv"].compute(), ds_Sv["Sv"])
+    ds_Sv_sel = echopype.consolidate.add_location(ds_Sv_sel, ed_sel, datagram_type="NMEA")
+    assert not ds_Sv_sel["latitude"].isnull().any()
+    ds_Sv_sel = echopype.consolidate.add_depth(ds_Sv_sel, ed_sel, depth_offset=1)
+    assert ds_Sv_sel["depth"].sizes["ping_time"] == 8
+
+    # positional selection
+    ed_isel = ed.isel_time(slice(5, 13))
+    xr.testing.assert_identical(ed_isel["Sonar/Beam_group1"], ed_sel["Sonar/Beam_group1"])
+    xr.testing.assert_identical(ed_isel["Platform"], ed_sel["Platform"])
+
+
+@pytest.mark.unit
+def test_echodata_sel_time_lazy(tmp_path):
+    from echopype.testing import _gen_echodata_ek60
+
+    ed = _gen_echodata_ek60(ping_time_len=30, range_sample_len=20)
+    ed["Sonar/Beam_group1"] = ed["Sonar/Beam_group1"].chunk({"ping_time": 5})
+    ed.to_zarr(tmp_path / "ed.zarr")
+
+    ed_lazy = open_converted(tmp_path / "ed.zarr", chunks={})
+    ed_sel = ed_lazy.sel_time("2018-07-01T00:00:05", "2018-07-01T00:00:09")
+    backscatter = ed_sel["Sonar/Beam_group1"]["backscatter_r"].data
+    assert isinstance(backscatter, dask.array.Array)
+    # only the chunks of the selected pings are read
+    assert backscatter.numblocks[1] == 1
@@ -14,8 +14,10 @@ from echopype.echodata import EchoData
 from echopype.echodata.combine import (
     _create_channel_selection_dict,
     _check_channel_consistency,
-    _merge_attributes
+    _merge_attributes,
+    validate_echodata_list,
 )
+from echopype.testing import _gen_echodata_ek60
 
 
 @pytest.fixture
@@ -358,6 +360,62 @@ def test_combine_echodata_channel_selection():
     pytest.skip("This test will not be implemented until after a mock EchoData object can be created.")
 
 
+@pytest.fixture
+def mock_lazy_eds(tmp_path):
+    eds = []
+    for idx, start in enumerate(["2023-07-04T00:00", "2023-07-04T01:00", "2023-07-04T02:00"]):
+        ed = _gen_echodata_ek60(
+            ping_time_len=10,
+            range_sample_len=20,
+            ping_time_start=start,
+            source_file=f"mock-{idx}.raw",
+        )
+        ed.to_zarr(tmp_path / f"mock-{idx}.zarr")
+        eds.append(echopype.open_converted(tmp_path / f"mock-{idx}.zarr"))
+    return eds
+
+
+def test_validate_echodata_list_lazy(mock_lazy_eds):
+    sonar_model, filenames, chan_sel = validate_echodata_list(mock_lazy_eds, max_workers=2)
+    assert sonar_model == "EK60"
+    assert filenames == ["mock-0.zarr", "mock-1.zarr", "mock-2.zarr"]
+    assert all(v is None for v in chan_sel.values())
+
+    # only the small Vendor_specific parameters are read
+    for ed in mock_lazy_eds:
+        for group in ed.group_paths:
+            loaded = [
+                name
+                for name, var in ed[group].variables.items()
+                if name not in ed[group].indexes and var._in_memory
+            ]
+            assert (group == "Vendor_specific") == bool(loaded)
+
+    combined = echopype.combine_echodata(mock_lazy_eds, max_workers=2)
+    assert combined["Sonar/Beam_group1"].sizes["ping_time"] == 30
+
+
+def test_validate_echodata_list_errors(mock_lazy_eds):
+    with pytest.raises(RuntimeError, match="ascending order"):
+        validate_echodata_list(mock_lazy_eds[::-1])
+
+    mock_lazy_eds[1]["Vendor_specific"] = mock_lazy_eds[1]["Vendor_specific"].assign(
+        gain_correction=lambda ds: ds["gain_correction"] + 0.1
+    )
+    with pytest.raises(RuntimeError, match="Non identical filter parameters"):
+        validate_echodata_list(mock_lazy_eds)
+
+    # only the parameters of the selected channels must be identical
+    channels = list(mock_lazy_eds[0]["Sonar/Beam_group1"]["channel"].values)
+    mock_lazy_eds[2]["Vendor_specific"] = mock_lazy_eds[2]["Vendor_specific"].assign(
+        sa_correction=lambda ds: ds["sa_correction"].where(ds["channel"] != channels[0], 0)
+    )
+    mock_lazy_eds[1]["Vendor_specific"] = mock_lazy_eds[0]["Vendor_specific"]
+    with pytest.raises(RuntimeError, match="Non identical filter parameters"):
+        validate_echodata_list(mock_lazy_eds)
+    validate_echodata_list(mock_lazy_eds, channel_selection=channels[1:])
+
+
 def test_attr_storage(ek60_test_data):
     # check storage of attributes before combination in provenance group
     eds = [echopype.open_raw(file, "EK60") for file in ek60_test_data]
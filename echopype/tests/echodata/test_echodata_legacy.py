@@ -0,0 +1,83 @@
+import dask.array
+import numpy as np
+import pytest
+import xarray as xr
+import zarr
+
+import echopype as ep
+from echopype.echodata import upgrade_legacy_zarr
+from echopype.echodata.legacy import upgrade_legacy_groups
+from echopype.testing import _gen_echodata_ek60
+
+
+def _to_legacy(ed, save_path):
+    """Save EchoData with the coordinate names used before the xr.DataTree updates."""
+    engine = "zarr" if save_path.suffix == ".zarr" else "netcdf4"
+    renames = {"Sonar": {"channel_all": "channel"}, "Platform/NMEA": {"nmea_time": "time1"}}
+    for idx, node in enumerate(ed._tree.subtree):
+        ds = node.to_dataset(inherit=False).rename(renames.get(node.path.lstrip("/"), {}))
+        group = None if node.is_root else node.path
+        if engine == "zarr":
+            ds.to_zarr(save_path, mode="w" if idx == 0 else "a", group=group)
+        else:
+            ds.to_netcdf(save_path, mode="w" if idx == 0 else "a", group=group)
+    if engine == "zarr":
+        zarr.consolidate_metadata(str(save_path))
+
+
+@pytest.fixture
+def ed():
+    ed = _gen_echodata_ek60(ping_time_len=10, range_sample_len=20)
+    # NMEA times differ from the Platform times
+    ed["Platform/NMEA"] = ed["Platform/NMEA"].assign_coords(
+        nmea_time=ed["Platform/NMEA"]["nmea_time"] + np.timedelta64(1, "s")
+    )
+    return ed
+
+
+@pytest.mark.parametrize("suffix", [".zarr", ".nc"])
+def test_open_legacy_lazily(ed, tmp_path, suffix):
+    save_path = tmp_path / f"legacy{suffix}"
+    _to_legacy(ed, save_path)
+
+    groups = xr.open_groups(save_path, chunks={})
+    assert "channel" in groups["/Sonar"].dims
+    upgraded = upgrade_legacy_groups(groups)
+    assert "channel_all" in upgraded["/Sonar"].dims
+    assert "nmea_time" in upgraded["/Platform/NMEA"].dims
+    # data are not loaded
+    assert upgraded["/Sonar/Beam_group1"] is groups["/Sonar/Beam_group1"]
+    assert all(
+        isinstance(var.data, dask.array.Array) for var in upgraded["/Sonar"].data_vars.values()
+    )
+
+    ed_legacy = ep.open_converted(save_path)
+    for group in ["Sonar", "Platform/NMEA", "Sonar/Beam_group1"]:
+        xr.testing.assert_identical(ed_legacy[group], ed[group])
+
+    # up to date groups are not modified
+    assert upgrade_legacy_groups(upgraded) is upgraded
+
+
+def test_upgrade_legacy_zarr(ed, tmp_path):
+    for name in ["legacy1", "legacy2"]:
+        _to_legacy(ed, tmp_path / f"{name}.zarr")
+    ed.to_zarr(tmp_path / "current.zarr")
+    beam_chunk = tmp_path / "legacy1.zarr" / "Sonar" / "Beam_group1" / "backscatter_r" / "0.0.0"
+    mtime = beam_chunk.stat().st_mtime_ns
+
+    paths = str(tmp_path / "*.zarr")
+    assert len(upgrade_legacy_zarr(paths, dry_run=True)) == 2
+    upgraded = upgrade_legacy_zarr(paths)
+    assert sorted(p.split("/")[-1] for p in upgraded) == ["legacy1.zarr", "legacy2.zarr"]
+    assert upgrade_legacy_zarr(paths) == []
+
+    # data chunks are not rewritten
+    assert beam_chunk.stat().st_mtime_ns == mtime
+
+    # upgraded stores open as current ones, from the consolidated metadata
+    ds_sonar = xr.open_zarr(tmp_path / "legacy1.zarr", group="Sonar")
+    assert "channel_all" in ds_sonar.dims and "channel" not in ds_sonar.dims
+    ed_upgraded = ep.open_converted(tmp_path / "legacy1.zarr")
+    for group in ["Sonar", "Platform/NMEA", "Sonar/Beam_group1"]:
+        xr.testing.assert_identical(ed_upgraded[group], ed[group])
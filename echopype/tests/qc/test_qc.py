@@ -1,3 +1,4 @@
+import dask.array
 import numpy as np
 import xarray as xr
 
@@ -80,3 +81,56 @@ def test_exist_reversed_time(ds_time):
     # after correction there are no reversed timestamps
     coerce_increasing_time(ds_time, "time")
     assert exist_reversed_time(ds_time, "time") == False
+
+
+def test_coerce_increasing_time_summary(ds_time):
+    time_old = ds_time["time"].values.copy()
+    summary = coerce_increasing_time(ds_time, "time", summary=True)
+
+    reversed_idx = np.flatnonzero(np.diff(time_old) < np.timedelta64(0, "ns")) + 1
+    np.testing.assert_array_equal(summary["reversed_indices"], reversed_idx)
+    assert summary["n_reversals"] == reversed_idx.size == 5
+    assert summary["max_backward_jump"] == -np.diff(time_old).min()
+    assert summary["max_shift"] == np.abs(ds_time["time"].values - time_old).max()
+    assert summary["n_corrected"] == (ds_time["time"].values != time_old).sum()
+
+
+def test_coerce_increasing_time_lazy(ds_time):
+    # non-indexed time variable stored as a dask array
+    ds_lazy = xr.Dataset(
+        {"time": ("ping", dask.array.from_array(ds_time["time"].values, chunks=5))}
+    )
+    coerce_increasing_time(ds_lazy, "time", win_len=4)
+    assert isinstance(ds_lazy["time"].data, dask.array.Array)
+
+    coerce_increasing_time(ds_time, "time", win_len=4)
+    np.testing.assert_array_equal(ds_lazy["time"].values, ds_time["time"].values)
+
+
+def test__clean_reversed_first_interval():
+    # a reversal without previous intervals uses the median of all intervals
+    arr_fixed = _clean_reversed(np.array([5, 1, 3, 5, 7], dtype="datetime64[ns]"), 2)
+    np.testing.assert_array_equal(arr_fixed, np.array([5, 7, 9, 11, 13], dtype="datetime64[ns]"))
+
+
+def test__clean_reversed_first_interval_chunked():
+    # the fallback median of the first intervals does not depend on the chunks
+    arr = np.array([20, 10, 11, 12, 22, 32, 42, 52, 62, 72, 82, 92], dtype="datetime64[ns]")
+    arr_fixed = _clean_reversed(arr, 3)
+    arr_fixed_lazy = _clean_reversed(dask.array.from_array(arr, chunks=4), 3)
+    assert isinstance(arr_fixed_lazy, dask.array.Array)
+    np.testing.assert_array_equal(arr_fixed_lazy.compute(), arr_fixed)
+    np.testing.assert_array_equal(arr_fixed[:4], np.array([20, 30, 31, 32], dtype="datetime64[ns]"))
+
+
+def test_coerce_increasing_time_lazy_short(ds_time):
+    # lazy time variable with fewer samples than the default window
+    ds_lazy = xr.Dataset(
+        {"time": ("ping", dask.array.from_array(ds_time["time"].values, chunks=10))}
+    )
+    summary_lazy = coerce_increasing_time(ds_lazy, "time", summary=True)
+    summary = coerce_increasing_time(ds_time, "time", summary=True)
+
+    np.testing.assert_array_equal(ds_lazy["time"].values, ds_time["time"].values)
+    assert summary_lazy["n_reversals"] == summary["n_reversals"] == 5
+    assert summary_lazy["max_shift"] == summary["max_shift"]
@@ -3,7 +3,7 @@ import numpy as np
 import pytest
 
 import echopype as ep
-from echopype.utils.align import align_to_ping_time
+from echopype.utils.align import align_to_ping_time, get_linear_interp_weights
 
 
 @pytest.fixture
@@ -293,3 +293,34 @@ def test_align_to_ping_time_glider_azfp(azfp_path):
         first_non_NaN_pitch.values, 
         np.unique(aligned_da.where(first_non_NaN_pitch["time"].values > aligned_da["ping_time"], drop=True))
     )
+
+
+def test_get_linear_interp_weights():
+    # unsorted source times, and target times beyond both ends
+    time1 = np.array(
+        ["2017-06-20T01:00:30", "2017-06-20T01:00:00", "2017-06-20T01:02:00"],
+        dtype="datetime64[ns]",
+    )
+    external_da = xr.DataArray(
+        [[1.0, 0.0, 4.0], [10.0, 20.0, np.nan]],
+        dims=["channel", "time1"],
+        coords={"channel": ["a", "b"], "time1": time1},
+    )
+    ping_time = xr.DataArray(
+        np.arange(
+            "2017-06-20T00:59:50", "2017-06-20T01:02:20", np.timedelta64(7, "s"),
+            dtype="datetime64[ns]",
+        ),
+        dims=["ping_time"],
+    )
+    ping_time = ping_time.assign_coords(ping_time=ping_time)["ping_time"]
+
+    left, right, weight = get_linear_interp_weights(time1, ping_time.values)
+    aligned = external_da.isel(time1=left).data * (1 - weight) + external_da.isel(
+        time1=right
+    ).data * weight
+    np.testing.assert_allclose(
+        aligned,
+        align_to_ping_time(external_da, "time1", ping_time, method="linear").data,
+        rtol=1e-12,
+    )
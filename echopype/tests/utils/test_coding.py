@@ -5,7 +5,19 @@ import math
 import dask
 import warnings
 
-from echopype.utils.coding import _get_dask_auto_chunk, set_netcdf_encodings, _encode_time_dataarray, DEFAULT_TIME_ENCODING
+from echopype.utils.coding import (
+    _get_dask_auto_chunk,
+    set_netcdf_encodings,
+    _encode_time_dataarray,
+    get_db_packing_range,
+    get_layout_chunks,
+    set_zarr_encodings,
+    pack_db_variables,
+    DEFAULT_TIME_ENCODING,
+    DB_PACKING_SETTINGS,
+    COMPRESSION_SETTINGS,
+)
+from echopype.utils.io import save_file
 
 @pytest.mark.parametrize(
     "chunk",
@@ -134,3 +146,104 @@ def test_encode_time_dataarray_on_encoded_time_data():
     # Check to see if value error is raised when we pass in an encoded float datetime array
     with pytest.raises(ValueError, match="Encoded time data array must be of type ```np.int64```."):
         _encode_time_dataarray(encoded_datetime_array.astype(np.float64))
+
+
+@pytest.mark.unit
+def test_pack_db_variables():
+    vmin, vmax = get_db_packing_range()
+    assert (vmin, vmax) == pytest.approx((-427.67, 227.67))
+
+    ds = xr.Dataset(
+        {
+            "Sv": (("ping_time",), [np.nan, -np.inf, -1000.0, -70.0], {"units": "dB"}),
+            "echo_range": (("ping_time",), [1.0, 2.0, 3.0, 4.0]),
+        }
+    )
+    ds_packed, encoding = pack_db_variables(ds)
+    assert list(encoding) == ["Sv"]
+    assert encoding["Sv"]["dtype"] == np.int16
+    assert ds_packed["Sv"].attrs == {"units": "dB"}
+    np.testing.assert_array_equal(ds_packed["Sv"].values, [np.nan, vmin, vmin, -70.0])
+    # input is unchanged
+    assert np.isneginf(ds["Sv"].values[1])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ["engine", "suffix", "chunks"],
+    [("zarr", ".zarr", None), ("zarr", ".zarr", {"ping_time": 5}), ("netcdf4", ".nc", None)],
+)
+def test_save_file_pack_db(tmp_path, engine, suffix, chunks):
+    rng = np.random.default_rng(0)
+    Sv = rng.uniform(-150, 0, (2, 20, 30))
+    Sv[0, 0, :5] = np.nan
+    ds = xr.Dataset(
+        {
+            "Sv": (("channel", "ping_time", "range_sample"), Sv),
+            "echo_range": (("channel", "ping_time", "range_sample"), np.ones_like(Sv)),
+        }
+    )
+    if chunks is not None:
+        ds = ds.chunk(chunks)
+    path = tmp_path / f"Sv{suffix}"
+    save_file(ds, path, mode="w", engine=engine, pack_db=True)
+
+    # stored as int16, other variables are unchanged
+    ds_raw = xr.open_dataset(path, engine=engine, decode_cf=False)
+    assert ds_raw["Sv"].dtype == np.int16
+    assert ds_raw["echo_range"].dtype == np.float64
+
+    # decoded transparently, with bounded quantization error
+    ds_open = xr.open_dataset(path, engine=engine)
+    assert np.issubdtype(ds_open["Sv"].dtype, np.floating)
+    assert np.isnan(ds_open["Sv"].values[0, 0, :5]).all()
+    np.testing.assert_allclose(
+        ds_open["Sv"].values, Sv, atol=DB_PACKING_SETTINGS["scale_factor"] / 2 + 1e-9
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ["chunk_layout", "expected_chunks"],
+    [
+        # blocks of pings over the full range
+        ("echogram", {"channel": 1, "ping_time": 250, "range_sample": 1000}),
+        # all pings over a few samples
+        ("timeseries", {"channel": 1, "ping_time": 2000, "range_sample": 125}),
+    ],
+)
+def test_get_layout_chunks(chunk_layout, expected_chunks):
+    var = xr.Variable(("channel", "ping_time", "range_sample"), np.empty((3, 2000, 1000)))
+    assert get_layout_chunks(var, chunk_layout, chunk_size="2MB") == expected_chunks
+
+    # the layout is used in the zarr encodings instead of existing chunks
+    var.encoding = {"chunks": (3, 10, 10), "preferred_chunks": {"channel": 3}}
+    ds = xr.Dataset({"backscatter_r": var})
+    encoding = set_zarr_encodings(
+        ds, COMPRESSION_SETTINGS["zarr"], chunk_size="2MB", chunk_layout=chunk_layout
+    )
+    assert encoding["backscatter_r"]["chunks"] == list(expected_chunks.values())
+    assert "preferred_chunks" not in encoding["backscatter_r"]
+
+    with pytest.raises(ValueError, match="Unknown chunk layout"):
+        get_layout_chunks(var, "tiles")
+
+
+@pytest.mark.unit
+def test_set_netcdf_encodings_chunks():
+    var = xr.Variable(("channel", "ping_time", "range_sample"), np.empty((3, 2000, 1000)))
+    ds = xr.Dataset({"backscatter_r": var, "channel_id": ("channel", ["a", "b", "c"])})
+
+    # same chunks as zarr for a layout
+    encoding = set_netcdf_encodings(ds, {}, chunk_size="2MB", chunk_layout="echogram")
+    assert encoding["backscatter_r"]["chunksizes"] == (1, 250, 1000)
+    assert encoding["backscatter_r"]["contiguous"] is False
+    assert "chunksizes" not in encoding["channel_id"]
+
+    # existing chunk sizes are kept by default, and encodings from reading a file are dropped
+    ds["backscatter_r"].encoding = {"chunksizes": (1, 10, 10), "szip": False, "blosc": False}
+    encoding = set_netcdf_encodings(ds, {})
+    assert encoding["backscatter_r"]["chunksizes"] == (1, 10, 10)
+    assert "szip" not in encoding["backscatter_r"] and "blosc" not in encoding["backscatter_r"]
+    encoding = set_netcdf_encodings(ds, {}, chunk_size="2MB", chunk_layout="timeseries")
+    assert encoding["backscatter_r"]["chunksizes"] == (1, 2000, 125)
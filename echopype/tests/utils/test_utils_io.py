@@ -5,14 +5,21 @@ import pytest
 from typing import Tuple
 import tempfile
 import platform
+import dask.array
+import netCDF4
 import xarray as xr
+import zarr
 
+import echopype as ep
+from echopype.testing import _gen_echodata_ek60
 from echopype.utils.io import (
     sanitize_file_path,
     validate_output_path,
     env_indep_joinpath,
     validate_source,
-    init_ep_dir
+    init_ep_dir,
+    rechunk_store,
+    save_file,
 )
 import echopype.utils.io
 
@@ -319,3 +326,53 @@ def test_init_ep_dir(monkeypatch):
     assert echopype.utils.io.ECHOPYPE_DIR.exists() is True
 
     temp_user_dir.cleanup()
+
+
+def test_rechunk_store(tmp_path):
+    ed = _gen_echodata_ek60(ping_time_len=100, range_sample_len=200)
+    ed.to_zarr(tmp_path / "echogram.zarr", chunk_layout="echogram")
+
+    # converted store with all groups
+    rechunk_store(
+        tmp_path / "echogram.zarr", tmp_path / "timeseries.zarr", "timeseries", chunk_size="20kB"
+    )
+    store = zarr.open(str(tmp_path / "timeseries.zarr"))
+    assert store["Sonar/Beam_group1/backscatter_r"].chunks == (1, 100, 25)
+    ed_rechunked = ep.open_converted(tmp_path / "timeseries.zarr")
+    for group in ["Environment", "Platform", "Sonar/Beam_group1", "Vendor_specific"]:
+        xr.testing.assert_identical(ed_rechunked[group], ed[group])
+
+    with pytest.raises(FileExistsError):
+        rechunk_store(tmp_path / "echogram.zarr", tmp_path / "timeseries.zarr", "timeseries")
+
+    # processed store, packed dB values are kept packed
+    ds_Sv = ep.calibrate.compute_Sv(ed)
+    save_file(ds_Sv, tmp_path / "Sv.zarr", mode="w", engine="zarr", pack_db=True)
+    rechunk_store(
+        tmp_path / "Sv.zarr", tmp_path / "Sv_echogram.zarr", "echogram", chunk_size="20kB"
+    )
+    store = zarr.open(str(tmp_path / "Sv_echogram.zarr"))
+    assert store["Sv"].dtype == "int16"
+    assert store["Sv"].chunks == (1, 12, 200)
+    xr.testing.assert_identical(
+        xr.open_zarr(tmp_path / "Sv_echogram.zarr")["Sv"].compute(),
+        xr.open_zarr(tmp_path / "Sv.zarr")["Sv"].compute(),
+    )
+
+
+def test_to_netcdf_chunk_layout(tmp_path):
+    ed = _gen_echodata_ek60(ping_time_len=100, range_sample_len=200)
+    ed.to_netcdf(tmp_path / "timeseries.nc", chunk_layout="timeseries", chunk_size="20kB")
+
+    # lazily opened data are written chunk by chunk with the new layout
+    ed_lazy = ep.open_converted(tmp_path / "timeseries.nc", chunks={})
+    assert isinstance(ed_lazy["Sonar/Beam_group1"]["backscatter_r"].data, dask.array.Array)
+    ed_lazy.to_netcdf(tmp_path / "echogram.nc", chunk_layout="echogram", chunk_size="20kB")
+
+    for path, chunks in [("timeseries.nc", [1, 100, 25]), ("echogram.nc", [1, 12, 200])]:
+        with netCDF4.Dataset(tmp_path / path) as nc:
+            assert nc["Sonar/Beam_group1"]["backscatter_r"].chunking() == chunks
+            assert nc["Platform"]["latitude"].chunking() == [100]
+    xr.testing.assert_identical(
+        ep.open_converted(tmp_path / "echogram.nc")["Sonar/Beam_group1"], ed["Sonar/Beam_group1"]
+    )
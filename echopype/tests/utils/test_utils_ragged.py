@@ -0,0 +1,182 @@
+import numpy as np
+import pytest
+import xarray as xr
+from dask.core import flatten
+from dask.optimization import cull
+
+import echopype as ep
+from echopype.testing import _gen_echodata_ek60
+from echopype.utils.ragged import (
+    COUNT_VAR,
+    EXTENT_VAR,
+    RAGGED_DIM,
+    from_ragged,
+    get_sample_extents,
+    is_ragged,
+    skip_padding,
+    to_ragged,
+)
+
+
+def _pad_pings(ds, ping_lens):
+    """NaN-pad the variables along range_sample beyond the length of each ping."""
+    valid = ds["range_sample"] < xr.DataArray(ping_lens, dims=("channel", "ping_time"))
+    return ds.assign(
+        {name: var.where(valid) for name, var in ds.data_vars.items() if "range_sample" in var.dims}
+    )
+
+
+def _culled_graph(arr):
+    """Tasks needed to compute a dask array."""
+    return cull(dict(arr.__dask_graph__()), list(flatten(arr.__dask_keys__())))[0]
+
+
+@pytest.fixture
+def beam_ds():
+    rng = np.random.default_rng(0)
+    ping_lens = np.array([[10, 4, 7, 0, 10, 3], [5, 5, 5, 5, 5, 5]])
+    ds = xr.Dataset(
+        {
+            "backscatter_r": (
+                ("channel", "ping_time", "range_sample", "beam"),
+                rng.random((2, 6, 10, 3)),
+            ),
+            "angle_alongship": (("channel", "ping_time", "range_sample"), rng.random((2, 6, 10))),
+            "frequency_nominal": (("channel",), [18000.0, 38000.0]),
+        },
+        coords={
+            "channel": ["ch1", "ch2"],
+            "ping_time": np.arange(6),
+            "range_sample": np.arange(10),
+            "beam": ["1", "2", "3"],
+        },
+    )
+    return _pad_pings(ds, ping_lens), ping_lens
+
+
+@pytest.mark.parametrize("chunks", [None, {"ping_time": 4}])
+def test_to_from_ragged(beam_ds, chunks):
+    ds, ping_lens = beam_ds
+    if chunks is not None:
+        ds = ds.chunk(chunks)
+
+    ds_ragged = to_ragged(ds)
+    assert is_ragged(ds_ragged)
+    assert "range_sample" not in ds_ragged.dims
+    assert ds_ragged.sizes[RAGGED_DIM] == ping_lens.sum()
+    assert ds_ragged["backscatter_r"].dims == (RAGGED_DIM, "beam")
+    np.testing.assert_array_equal(ds_ragged[COUNT_VAR].values, ping_lens)
+    assert ds_ragged[COUNT_VAR].attrs["sample_dimension"] == RAGGED_DIM
+    xr.testing.assert_identical(ds_ragged["frequency_nominal"], ds["frequency_nominal"])
+
+    # expansion is lazy, chunked along ping_time
+    ds_rect = from_ragged(ds_ragged, chunk_size=200)
+    assert ds_rect["backscatter_r"].chunks[1] == (1,) * 6
+    xr.testing.assert_equal(ds_rect.compute(), ds.compute())
+
+
+def test_sample_extents(beam_ds):
+    ds, ping_lens = beam_ds
+    ds_ragged = to_ragged(ds)
+
+    extents = get_sample_extents(ds_ragged)
+    assert extents.dims == ("channel",)
+    np.testing.assert_array_equal(extents.values, ping_lens.max(axis=1))
+    xr.testing.assert_equal(get_sample_extents(ds), extents)
+
+    # range_sample chunks are aligned to the channel extents
+    ds_rect = from_ragged(ds_ragged, chunk_size=200)
+    assert ds_rect["backscatter_r"].chunks[2] == (5, 5)
+
+    # the chunks in the padding region no longer depend on the data
+    da_doubled = skip_padding(ds_rect["backscatter_r"] * 2, extents)
+    block = da_doubled.data.blocks[1, 0, 1]
+    block_orig = (ds_rect["backscatter_r"] * 2).data.blocks[1, 0, 1]
+    assert not any("mul" in str(k) for k in _culled_graph(block))
+    assert any("mul" in str(k) for k in _culled_graph(block_orig))
+    xr.testing.assert_equal(da_doubled.compute(), ds["backscatter_r"] * 2)
+
+
+def test_ragged_noop(beam_ds):
+    ds, _ = beam_ds
+    ds_ragged = to_ragged(ds)
+    assert to_ragged(ds_ragged) is ds_ragged
+    assert from_ragged(ds) is ds
+
+
+def test_echodata_ragged(tmp_path):
+    ed = _gen_echodata_ek60(ping_time_len=10, range_sample_len=50)
+    ping_lens = np.tile([50, 10, 20, 10, 10, 50, 10, 10, 10, 10], (3, 1))
+    ping_lens[2] = 20
+    ed["Sonar/Beam_group1"] = _pad_pings(ed["Sonar/Beam_group1"], ping_lens)
+    ds_beam = ed["Sonar/Beam_group1"]
+    ds_Sv = ep.calibrate.compute_Sv(ed)
+
+    assert not ed.is_ragged
+    ed.to_ragged()
+    assert ed.is_ragged
+    assert ed["Sonar/Beam_group1"].sizes[RAGGED_DIM] == ping_lens.sum()
+
+    # expand_ragged leaves the original object unchanged
+    ed_rect = ed.expand_ragged()
+    assert not ed_rect.is_ragged and ed.is_ragged
+    xr.testing.assert_equal(
+        ed_rect["Sonar/Beam_group1"]["backscatter_r"].compute(), ds_beam["backscatter_r"]
+    )
+
+    # calibration expands the ragged arrays
+    ds_Sv_ragged = ep.calibrate.compute_Sv(ed)
+    xr.testing.assert_allclose(ds_Sv_ragged["Sv"].compute(), ds_Sv["Sv"])
+    np.testing.assert_array_equal(ds_Sv_ragged[EXTENT_VAR].values, ping_lens.max(axis=1))
+
+    # MVBS is computed only over the sample extent of each channel
+    xr.testing.assert_allclose(
+        ep.commongrid.compute_MVBS(ds_Sv_ragged, range_bin="2m", ping_time_bin="5s")["Sv"],
+        ep.commongrid.compute_MVBS(ds_Sv, range_bin="2m", ping_time_bin="5s")["Sv"],
+    )
+
+    # ragged arrays are stored as is
+    for save_path in [tmp_path / "ragged.zarr", tmp_path / "ragged.nc"]:
+        if save_path.suffix == ".zarr":
+            ed.to_zarr(save_path)
+        else:
+            ed.to_netcdf(save_path)
+        ed_saved = ep.open_converted(save_path)
+        assert ed_saved.is_ragged
+        xr.testing.assert_allclose(ep.calibrate.compute_Sv(ed_saved)["Sv"].compute(), ds_Sv["Sv"])
+
+    with pytest.raises(ValueError, match="ragged"):
+        ep.combine_echodata([ed, ed_saved])
+
+
+def test_echodata_ragged_multiplexed():
+    ed = _gen_echodata_ek60(ping_time_len=30, range_sample_len=50)
+    # each channel pings in turn, with different numbers of samples
+    ping_lens = np.where(np.arange(30) % 3 == np.arange(3)[:, None], [[50], [20], [30]], 0)
+    ds_beam = _pad_pings(ed["Sonar/Beam_group1"], ping_lens)
+    # ping parameters are also missing for the pings of other channels
+    pinged = xr.DataArray(ping_lens > 0, dims=("channel", "ping_time"))
+    ed["Sonar/Beam_group1"] = ds_beam.assign(
+        {
+            name: var.where(pinged)
+            for name, var in ds_beam.data_vars.items()
+            if {"channel", "ping_time"} <= set(var.dims) and var.dtype.kind == "f"
+        }
+    )
+    ds_Sv = ep.calibrate.compute_Sv(ed)
+
+    ed.to_ragged()
+    assert ed["Sonar/Beam_group1"].sizes[RAGGED_DIM] == ping_lens.sum()
+
+    # each channel is calibrated over its own pings, and aligned on all pings
+    ds_Sv_ragged = ep.calibrate.compute_Sv(ed)
+    np.testing.assert_array_equal(ds_Sv_ragged[COUNT_VAR].values, ping_lens)
+    xr.testing.assert_allclose(
+        ds_Sv_ragged.drop_vars([COUNT_VAR, EXTENT_VAR]).compute(), ds_Sv.compute()
+    )
+
+    # MVBS is computed over the pings of each channel
+    xr.testing.assert_allclose(
+        ep.commongrid.compute_MVBS(ds_Sv_ragged, range_bin="2m", ping_time_bin="5s")["Sv"],
+        ep.commongrid.compute_MVBS(ds_Sv, range_bin="2m", ping_time_bin="5s")["Sv"],
+    )
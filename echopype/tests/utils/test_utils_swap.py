@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+import zarr
+
+from echopype.utils import swap
+from echopype.utils.swap import SwapManager, SwapQuotaError
+
+
+def _write_store(store, nbytes):
+    zarr.group(store=store, overwrite=True).array(
+        "data", np.zeros(nbytes // 8), chunks=-1, compressor=None
+    )
+
+
+def test_acquire_release(tmp_path):
+    swap_manager = SwapManager(swap_dir=tmp_path)
+    store = swap_manager.acquire(nbytes=8000)
+    assert os.path.isdir(store.root)
+    assert store.root.startswith(str(swap_manager.namespace))
+    assert f"-{os.getpid()}-" in swap_manager.namespace.name
+
+    # the reservation is counted until the data are written
+    assert swap_manager.usage() == 8000
+    _write_store(store, 16000)
+    assert swap_manager.usage() >= 16000
+
+    swap_manager.release(store)
+    assert not os.path.exists(store.root)
+    assert swap_manager.usage() == 0
+    # releasing again is a no-op
+    swap_manager.release(store)
+
+
+def test_context_reuse(tmp_path):
+    with SwapManager(swap_dir=tmp_path) as swap_manager:
+        assert swap.get_swap_manager() is swap_manager
+        store = swap_manager.acquire()
+        _write_store(store, 800)
+        swap_manager.release(store)
+
+        # released stores are emptied and reused
+        store_reused = swap_manager.acquire()
+        assert store_reused.root == store.root
+        assert "data/0" not in store_reused
+
+    assert swap.get_swap_manager() is not swap_manager
+    assert not swap_manager.namespace.exists()
+
+
+def test_quota(tmp_path):
+    swap_manager = SwapManager(swap_dir=tmp_path, quota="10kB")
+    with pytest.raises(SwapQuotaError, match="exceeds the quota"):
+        swap_manager.acquire(nbytes=20_000)
+
+    # the stores of other managers in the same directory count towards the quota
+    other_manager = SwapManager(swap_dir=tmp_path)
+    other_store = other_manager.acquire(nbytes=8000)
+    with pytest.raises(SwapQuotaError, match="Not enough swap space"):
+        swap_manager.acquire(nbytes=4000)
+
+    # conversions wait for space to be released
+    swap_manager.wait_timeout = 10
+    swap_manager.poll_interval = 0.05
+    threading.Timer(0.2, other_manager.release, args=(other_store,)).start()
+    start = time.monotonic()
+    swap_manager.acquire(nbytes=4000)
+    assert 0.2 <= time.monotonic() - start < 10
+    swap_manager.cleanup()
+
+
+def test_quota_threads(tmp_path):
+    # conversions in threads sharing a manager wait for each other's stores
+    swap_manager = SwapManager(swap_dir=tmp_path, quota="10kB", wait_timeout=10, poll_interval=5)
+    store = swap_manager.acquire(nbytes=8000)
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(swap_manager.acquire(nbytes=4000)))
+    start = time.monotonic()
+    waiter.start()
+    time.sleep(0.2)
+    assert not acquired
+
+    # the waiting thread does not block the release, and is woken up by it
+    swap_manager.release(store)
+    waiter.join(timeout=10)
+    assert len(acquired) == 1
+    assert time.monotonic() - start < 5
+    assert swap_manager.usage() == 4000
+    swap_manager.cleanup()
+
+
+def test_cleanup_stale(tmp_path, mocker):
+    swap_manager = SwapManager(swap_dir=tmp_path)
+    swap_manager.acquire()
+
+    # namespace of a process that did not exit cleanly
+    stale = tmp_path / swap_manager.namespace.name.replace(f"-{os.getpid()}-", "-999999999-")
+    (stale / "abc.zarr").mkdir(parents=True)
+    mocker.patch("psutil.pid_exists", side_effect=lambda pid: pid == os.getpid())
+
+    assert swap_manager.cleanup_stale() == [str(stale)]
+    assert not stale.exists()
+    assert swap_manager.namespace.exists()
+
+    # stale namespaces are removed when a new manager is created
+    (stale / "abc.zarr").mkdir(parents=True)
+    SwapManager(swap_dir=tmp_path)
+    assert not stale.exists()
+    swap_manager.cleanup()
+    assert not swap_manager.namespace.exists()
@@ -1,3 +1,5 @@
+from typing import Tuple
+
 import numpy as np
 import xarray as xr
 
@@ -59,3 +61,45 @@ def align_to_ping_time(
             # https://docs.scipy.org/doc/scipy/reference/generated/scipy.interpolate.interp1d.html # noqa
             kwargs={"fill_value": "extrapolate"},
         ).drop_vars(external_time_name)
+
+
+def get_linear_interp_weights(
+    source_time: np.ndarray, target_time: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get the indices and weights of the linear interpolation from source to target times.
+
+    Values at the target times are interpolated as
+    ``values[left] * (1 - weight) + values[right] * weight``,
+    with linear extrapolation beyond the first and last source times,
+    as in ``align_to_ping_time`` with ``method="linear"``.
+
+    Parameters
+    ----------
+    source_time : np.ndarray
+        Times of the values to interpolate, at least 2, not necessarily sorted
+    target_time : np.ndarray
+        Times to interpolate to
+
+    Returns
+    -------
+    left, right : np.ndarray
+        Indices in ``source_time`` of the values on each side of each target time
+    weight : np.ndarray
+        Weight of the ``right`` value for each target time
+    """
+    source_time = np.asarray(source_time)
+    target_time = np.asarray(target_time)
+    if np.issubdtype(source_time.dtype, np.datetime64):
+        # Offset from the first time to keep the nanosecond precision in float
+        offset = source_time.min()
+        source_time = (source_time - offset).astype("timedelta64[ns]").astype(np.float64)
+        target_time = (target_time - offset).astype("timedelta64[ns]").astype(np.float64)
+
+    order = np.argsort(source_time, kind="stable")
+    source_sorted = source_time[order]
+    seg = np.clip(np.searchsorted(source_sorted, target_time, side="right") - 1, 0, order.size - 2)
+    t0, t1 = source_sorted[seg], source_sorted[seg + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = np.where(t1 > t0, (target_time - t0) / (t1 - t0), 0.0)
+    return order[seg], order[seg + 1], weight
@@ -1,5 +1,5 @@
 from re import search
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 import xarray as xr
@@ -48,6 +48,46 @@ EXPECTED_VAR_DTYPE = {
 }  # channel name  # beam name
 
 PREFERRED_CHUNKS = "preferred_chunks"
+# Encodings set when opening a netCDF file that are not valid when writing
+NETCDF_READ_ONLY_ENCODINGS = ("szip", "zstd", "bzip2", "blosc", PREFERRED_CHUNKS)
+
+# Chunk layout presets for the access pattern of the stored data.
+# Each layout maps dimension names to a chunk size along that dimension:
+# -1 for the full dimension, an integer for a fixed size,
+# or "auto" to fill up to the target chunk size.
+# Dimensions not listed are "auto".
+_TIME_DIMS = ("ping_time", "time1", "time2", "time3", "nmea_time")
+CHUNK_LAYOUTS = {
+    # Auto chunks spread over all dimensions
+    "balanced": {},
+    # Echogram tiles: blocks of pings over the full range
+    "echogram": {
+        "channel": 1,
+        "range_sample": -1,
+        "echo_range": -1,
+        "depth": -1,
+        "beam": -1,
+    },
+    # Time series at fixed depths: all pings over a few samples
+    "timeseries": {
+        "channel": 1,
+        "beam": -1,
+        **{dim: -1 for dim in _TIME_DIMS},
+    },
+}
+
+# Packed int16 encoding of dB products (Sv, TS, MVBS).
+# Values are stored as round((x - add_offset) / scale_factor), so the quantization
+# error is at most scale_factor / 2 = 0.005 dB over the representable range of
+# add_offset + scale_factor * [-32767, 32767] = [-427.67, 227.67] dB.
+# The minimum int16 value is reserved for NaN.
+DB_PACKING_SETTINGS = {
+    "dtype": np.dtype("int16"),
+    "scale_factor": 0.01,
+    "add_offset": -100.0,
+    "_FillValue": np.iinfo(np.int16).min,
+}
+DB_PACKING_VARIABLES = ("Sv", "TS")
 
 
 def sanitize_dtypes(ds: xr.Dataset) -> xr.Dataset:
@@ -129,6 +169,48 @@ def _get_dask_auto_chunk(
     return dict(zip(variable.sizes, list_chunks))
 
 
+def get_layout_chunks(
+    variable: xr.Variable, chunk_layout: str, chunk_size: "int | str | float" = "100MB"
+) -> Dict[str, int]:
+    """
+    Calculate the chunks of a variable for a chunk layout preset
+
+    Parameters
+    ----------
+    variable : xr.Variable
+        The variable to be chunked
+    chunk_layout : str
+        The name of the layout in ``CHUNK_LAYOUTS``
+    chunk_size : int or str or float
+        The target chunk size for the dimensions that are not fixed by the layout.
+        Default is 100MB
+
+    Returns
+    -------
+    dict
+        The chunks for each dimension
+    """
+    if chunk_layout not in CHUNK_LAYOUTS:
+        raise ValueError(
+            f"Unknown chunk layout '{chunk_layout}', must be one of {list(CHUNK_LAYOUTS)}"
+        )
+    layout = CHUNK_LAYOUTS[chunk_layout]
+
+    chunks = []
+    for dim, size in variable.sizes.items():
+        chunk = layout.get(dim, "auto")
+        chunks.append(chunk if chunk == "auto" else min(size if chunk == -1 else chunk, size))
+
+    if "auto" in chunks:
+        # If the fixed dimensions already exceed the chunk size,
+        # the "auto" dimensions are chunked to 1
+        chunks = auto_chunks(chunks, variable.shape, chunk_size, variable.dtype)
+    # Ensure each chunk is a single value by extracting the first element if it's a tuple.
+    chunks = [c[0] if isinstance(c, tuple) else c for c in chunks]
+
+    return {dim: max(int(c), 1) for dim, c in zip(variable.sizes, chunks)}
+
+
 def set_time_encodings(ds: xr.Dataset) -> xr.Dataset:
     """
     Set the default encoding for variables.
@@ -167,7 +249,11 @@ def get_zarr_compression(var: xr.Variable, compression_settings: dict) -> dict:
 
 
 def set_zarr_encodings(
-    ds: xr.Dataset, compression_settings: dict, chunk_size: str = "100MB", ctol: str = "10MB"
+    ds: xr.Dataset,
+    compression_settings: dict,
+    chunk_size: str = "100MB",
+    ctol: str = "10MB",
+    chunk_layout: Optional[str] = None,
 ) -> dict:
     """
     Obtains all variable encodings based on zarr default values
@@ -177,11 +263,16 @@ def set_zarr_encodings(
     ds : xr.Dataset
         The dataset object to generate encoding for
     compression_settings : dict
-        The compression settings dictionary
+        The compression settings dictionary.
+        If ``None``, the variables are not compressed.
     chunk_size : dict
         The desired chunk size
     ctol : dict
         The chunk size tolerance before rechunking
+    chunk_layout : str, optional
+        The name of a chunk layout preset in ``CHUNK_LAYOUTS``: "echogram" for blocks
+        of pings over the full range, "timeseries" for all pings over a few samples,
+        or "balanced". If set, existing chunks in the variable encodings are replaced.
 
     Returns
     -------
@@ -193,7 +284,15 @@ def set_zarr_encodings(
     encoding = dict()
     for name, val in ds.variables.items():
         encoding[name] = {**val.encoding}
-        encoding[name].update(get_zarr_compression(val, compression_settings))
+        if compression_settings is not None:
+            encoding[name].update(get_zarr_compression(val, compression_settings))
+
+        if chunk_layout is not None:
+            if len(val.shape) > 0:
+                chunks = get_layout_chunks(val, chunk_layout, chunk_size=chunk_size)
+                encoding[name]["chunks"] = [*chunks.values()]
+            encoding[name].pop(PREFERRED_CHUNKS, None)
+            continue
 
         # Always optimize chunk if not specified already
         # user can specify desired chunk in encoding
@@ -234,6 +333,8 @@ def set_zarr_encodings(
 def set_netcdf_encodings(
     ds: xr.Dataset,
     compression_settings: Dict[str, Any] = {},
+    chunk_size: str = "100MB",
+    chunk_layout: Optional[str] = None,
 ) -> Dict[str, Dict[str, Any]]:
     """
     Obtains all variables encodings based on netcdf default values
@@ -243,7 +344,14 @@ def set_netcdf_encodings(
     ds : xr.Dataset
         The dataset object to generate encoding for
     compression_settings : dict
-        The compression settings dictionary
+        The compression settings dictionary.
+        If ``None``, the variables are not compressed.
+    chunk_size : str
+        The desired chunk size
+    chunk_layout : str, optional
+        The name of a chunk layout preset in ``CHUNK_LAYOUTS``, see ``set_zarr_encodings``.
+        If not set, existing chunk sizes in the variable encodings are kept
+        and other variables are auto chunked up to ``chunk_size``.
 
     Returns
     -------
@@ -252,38 +360,125 @@ def set_netcdf_encodings(
     """
     encoding = dict()
     for name, val in ds.variables.items():
-        encoding[name] = {**val.encoding}
+        encoding[name] = {
+            k: v for k, v in val.encoding.items() if k not in NETCDF_READ_ONLY_ENCODINGS
+        }
         if np.issubdtype(val.dtype, np.str_):
             encoding[name].update(
                 {
                     "zlib": False,
                 }
             )
+            continue
         elif compression_settings:
             encoding[name].update(compression_settings)
-        else:
+        elif compression_settings is not None:
             encoding[name].update(COMPRESSION_SETTINGS["netcdf4"])
 
+        # Chunk sizes are not allowed for scalars and zero-size dimensions
+        if len(val.shape) > 0 and 0 not in val.shape:
+            if chunk_layout is not None or encoding[name].get("chunksizes") is None:
+                chunks = get_layout_chunks(val, chunk_layout or "balanced", chunk_size=chunk_size)
+                encoding[name]["chunksizes"] = tuple(chunks.values())
+            encoding[name]["contiguous"] = False
+
     return encoding
 
 
-def set_storage_encodings(ds: xr.Dataset, compression_settings: dict, engine: str) -> dict:
+def get_db_packing_range(packing_settings: Dict[str, Any] = DB_PACKING_SETTINGS) -> Tuple[float]:
+    """
+    Get the range of values that can be represented with the packed encoding of dB products.
+
+    Parameters
+    ----------
+    packing_settings : dict
+        The packed encoding settings, with the integer ``dtype``, ``scale_factor``,
+        ``add_offset`` and ``_FillValue``
+
+    Returns
+    -------
+    tuple of float
+        The minimum and maximum representable values
+    """
+    int_info = np.iinfo(packing_settings["dtype"])
+    # The fill value is one of the bounds of the integer range
+    int_min = int_info.min + 1 if packing_settings["_FillValue"] == int_info.min else int_info.min
+    int_max = int_info.max - 1 if packing_settings["_FillValue"] == int_info.max else int_info.max
+    scale_factor, add_offset = packing_settings["scale_factor"], packing_settings["add_offset"]
+    return (add_offset + scale_factor * int_min, add_offset + scale_factor * int_max)
+
+
+def pack_db_variables(
+    ds: xr.Dataset,
+    variables: Tuple[str] = DB_PACKING_VARIABLES,
+    packing_settings: Dict[str, Any] = DB_PACKING_SETTINGS,
+) -> Tuple[xr.Dataset, Dict[str, Dict[str, Any]]]:
+    """
+    Prepare dB variables such as ``Sv`` and ``TS`` for packed integer storage.
+
+    The variables are clipped to the representable range (see ``get_db_packing_range``),
+    so that ``-inf`` values from zero power samples are stored as the minimum value,
+    and the scale/offset encoding is returned. The packed values are decoded
+    transparently to floats when the file is opened with xarray or echopype.
+    With the default settings, values are stored in int16 with a quantization error
+    of at most 0.005 dB, which reduces the storage size about 4 times compared to float64.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        The dataset to be saved
+    variables : tuple of str
+        The names of the dB variables to be packed. Variables not in ``ds`` are ignored.
+    packing_settings : dict
+        The packed encoding settings, with the integer ``dtype``, ``scale_factor``,
+        ``add_offset`` and ``_FillValue``
+
+    Returns
+    -------
+    ds : xr.Dataset
+        The dataset with clipped dB variables
+    encoding : dict
+        The packed encoding of each dB variable
+    """
+    vmin, vmax = get_db_packing_range(packing_settings)
+    encoding = dict()
+    ds = ds.copy()
+    for name in variables:
+        if name in ds.data_vars and np.issubdtype(ds[name].dtype, np.floating):
+            ds[name] = ds[name].clip(vmin, vmax, keep_attrs=True)
+            encoding[name] = {**packing_settings}
+
+    return ds, encoding
+
+
+def set_storage_encodings(
+    ds: xr.Dataset,
+    compression_settings: dict,
+    engine: str,
+    chunk_layout: Optional[str] = None,
+    chunk_size: str = "100MB",
+) -> dict:
     """
     Obtains the appropriate zarr or netcdf specific encodings for
     each variable in ``ds``.
+    The variables are chunked with the ``chunk_layout`` preset (see ``CHUNK_LAYOUTS``)
+    and its target ``chunk_size``.
     """
 
-    if compression_settings is not None:
-        if engine == "zarr":
-            encoding = set_zarr_encodings(ds, compression_settings)
+    if compression_settings is None and chunk_layout is None:
+        encoding = dict()
 
-        elif engine == "netcdf4":
-            encoding = set_netcdf_encodings(ds, compression_settings)
+    elif engine == "zarr":
+        encoding = set_zarr_encodings(
+            ds, compression_settings, chunk_size=chunk_size, chunk_layout=chunk_layout
+        )
 
-        else:
-            raise RuntimeError(f"Obtaining encodings for the engine {engine} is not allowed.")
+    elif engine == "netcdf4":
+        encoding = set_netcdf_encodings(
+            ds, compression_settings, chunk_size=chunk_size, chunk_layout=chunk_layout
+        )
 
     else:
-        encoding = dict()
+        raise RuntimeError(f"Obtaining encodings for the engine {engine} is not allowed.")
 
     return encoding
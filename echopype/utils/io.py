@@ -13,6 +13,7 @@ from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
 
 import fsspec
 import xarray as xr
+import zarr
 from dask.array import Array as DaskArray
 from fsspec import AbstractFileSystem, FSMap
 from fsspec.implementations.local import LocalFileSystem
@@ -20,7 +21,7 @@ from zarr.storage import FSStore
 
 from ..echodata import EchoData
 from ..echodata.api import open_converted
-from ..utils.coding import set_storage_encodings
+from ..utils.coding import COMPRESSION_SETTINGS, pack_db_variables, set_storage_encodings
 from ..utils.log import _init_logger
 
 if TYPE_CHECKING:
@@ -58,17 +59,45 @@ def get_files_from_dir(folder):
     return [f for f in os.listdir(folder) if os.path.splitext(f)[1] in valid_ext]
 
 
-def save_file(ds, path, mode, engine, group=None, compression_settings=None, **kwargs):
+def save_file(
+    ds,
+    path,
+    mode,
+    engine,
+    group=None,
+    compression_settings=None,
+    pack_db=False,
+    chunk_layout=None,
+    chunk_size="100MB",
+    **kwargs,
+):
     """
     Saves a dataset to netcdf or zarr depending on the engine
     If ``compression_settings`` are set, compress all variables with those settings
+    If ``pack_db`` is ``True``, store dB variables such as ``Sv`` and ``TS`` as packed
+    int16 with 0.01 dB resolution, see ``utils.coding.pack_db_variables``
+    If ``chunk_layout`` is set, chunk variables with the layout preset
+    up to ``chunk_size``, see ``utils.coding.CHUNK_LAYOUTS``
     """
 
     # set zarr or netcdf specific encodings for each variable in ds
-    encoding = set_storage_encodings(ds, compression_settings, engine)
+    encoding = set_storage_encodings(
+        ds, compression_settings, engine, chunk_layout=chunk_layout, chunk_size=chunk_size
+    )
+
+    # set packed integer encodings for dB variables
+    if pack_db:
+        ds, db_encoding = pack_db_variables(ds)
+        for var, enc in db_encoding.items():
+            encoding[var] = {**encoding.get(var, {}), **enc}
 
     # Allows saving both NetCDF and Zarr files from an xarray dataset
     if engine == "netcdf4":
+        # Align dask chunks with the netCDF chunks, so that lazy data
+        # are written through dask one whole netCDF chunk at a time
+        for var, enc in encoding.items():
+            if isinstance(ds[var].data, DaskArray) and enc.get("chunksizes") is not None:
+                ds[var] = ds[var].chunk(dict(zip(ds[var].dims, enc["chunksizes"])))
         ds.to_netcdf(path=path, mode=mode, group=group, encoding=encoding, **kwargs)
     elif engine == "zarr":
         # Ensure that encoding and chunks match
@@ -80,6 +109,89 @@ def save_file(ds, path, mode, engine, group=None, compression_settings=None, **k
         raise ValueError(f"{engine} is not a supported save format")
 
 
+def rechunk_store(
+    source_path: "PathHint",
+    target_path: "PathHint",
+    chunk_layout: str,
+    chunk_size: str = "100MB",
+    compress: bool = True,
+    storage_options: Optional[Dict[str, str]] = None,
+    output_storage_options: Optional[Dict[str, str]] = None,
+    overwrite: bool = False,
+) -> str:
+    """
+    Copy a zarr store to a new store with the chunks of a layout preset.
+
+    Works on converted stores, with all their groups, and on single-group
+    processed stores such as Sv or MVBS. The data are read and rechunked lazily
+    with dask, so that the store does not have to fit in memory.
+    Other encodings, such as the packed storage of dB variables, are preserved.
+
+    Parameters
+    ----------
+    source_path : str or Path
+        The zarr store to be rechunked
+    target_path : str or Path
+        The path of the rechunked zarr store
+    chunk_layout : str
+        The name of a chunk layout preset in ``utils.coding.CHUNK_LAYOUTS``:
+        "echogram" for blocks of pings over the full range,
+        "timeseries" for all pings over a few samples, or "balanced"
+    chunk_size : str
+        The target chunk size, for the dimensions that are not fixed by the layout.
+        Defaults to "100MB"
+    compress : bool
+        Whether to compress the variables with the default zarr compressors.
+        If ``False``, the existing compressors are kept.
+        Defaults to ``True``
+    storage_options : dict, optional
+        Additional keywords to pass to the filesystem class of ``source_path``
+    output_storage_options : dict, optional
+        Additional keywords to pass to the filesystem class of ``target_path``
+    overwrite : bool
+        Whether to overwrite ``target_path`` if it exists.
+        Defaults to ``False``
+
+    Returns
+    -------
+    str
+        The path of the rechunked store
+    """
+    if get_file_format(str(source_path)) != "zarr":
+        raise ValueError("Only zarr stores can be rechunked.")
+
+    storage_options = storage_options if storage_options is not None else {}
+    output_storage_options = output_storage_options if output_storage_options is not None else {}
+    source = sanitize_file_path(source_path, storage_options)
+    target = sanitize_file_path(target_path, output_storage_options)
+    if target.fs.exists(target.root):
+        if not overwrite:
+            raise FileExistsError(
+                f"{target_path} already exists, please use `overwrite=True` to replace it."
+            )
+        target.fs.rm(target.root, recursive=True)
+
+    tree = xr.open_datatree(source, engine="zarr", chunks={})
+    for node in tree.subtree:
+        group = None if node.is_root else node.path.lstrip("/")
+        ds = node.to_dataset(inherit=False)
+        if group is not None and not ds.variables and not ds.attrs:
+            continue
+        save_file(
+            ds,
+            path=target,
+            mode="w" if group is None else "a",
+            engine="zarr",
+            group=group,
+            compression_settings=COMPRESSION_SETTINGS["zarr"] if compress else None,
+            chunk_layout=chunk_layout,
+            chunk_size=chunk_size,
+        )
+    zarr.consolidate_metadata(target)
+
+    return str(target_path)
+
+
 def get_file_format(file):
     """Gets the file format (either Netcdf4 or Zarr) from the file extension"""
     if isinstance(file, list):
@@ -458,19 +570,18 @@ def open_source(
 def create_temp_zarr_store() -> FSMap:
     """Create a temporary zarr store for swapping data.
 
+    The store is created by the current swap manager,
+    see ``echopype.utils.swap.SwapManager``.
+
     Returns
     -------
     FSMap
         The zarr store for swapping data
 
     """
-    # Use system temp directory to create swap file by default
-    with tempfile.TemporaryDirectory(
-        suffix=".zarr",
-        prefix=f"{_SWAP_PREFIX}--",
-        dir=ECHOPYPE_TEMP_DIR,
-    ) as zarr_path:
-        return fsspec.get_mapper(zarr_path)
+    from .swap import get_swap_manager
+
+    return get_swap_manager().acquire()
 
 
 def delete_zarr_store(store: "FSStore | str", fs: Optional[AbstractFileSystem] = None) -> None:
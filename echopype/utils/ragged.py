@@ -0,0 +1,385 @@
+"""
+Compact storage of beam group data with variable-length pings.
+
+When the range setting changes within a file, the parsed pings have different
+numbers of samples and are NaN-padded to the longest ping to form a rectangular
+array. The functions here convert such arrays to the CF contiguous ragged array
+representation, in which the valid samples of all pings are concatenated along
+a single sample dimension and the number of samples of each ping is stored in a
+count variable, and expand them back lazily to the rectangular representation.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import dask
+import dask.array as da
+import numpy as np
+import xarray as xr
+from dask.utils import parse_bytes
+
+RAGGED_DIM = "range_sample_ragged"
+COUNT_VAR = "range_sample_count"
+EXTENT_VAR = "range_sample_extent"
+RANGE_SAMPLE_DIM = "range_sample"
+
+
+def is_ragged(ds: xr.Dataset) -> bool:
+    """Check if a beam group dataset is stored in the contiguous ragged representation."""
+    return isinstance(ds, xr.Dataset) and COUNT_VAR in ds.variables
+
+
+def _get_instance_dims(ds: xr.Dataset, var_names: List[str]) -> Tuple[str]:
+    """Get the dimensions of each ping (instance), which precede ``range_sample``."""
+    instance_dims = None
+    for name in var_names:
+        dims = ds[name].dims
+        var_instance_dims = tuple(d for d in dims[: dims.index(RANGE_SAMPLE_DIM)])
+        if instance_dims is None:
+            instance_dims = var_instance_dims
+        elif var_instance_dims != instance_dims:
+            raise ValueError(
+                f"Variables along {RANGE_SAMPLE_DIM} have different leading dimensions: "
+                f"{instance_dims} and {var_instance_dims}"
+            )
+    return instance_dims
+
+
+def _get_sample_counts(ds: xr.Dataset, var_names: List[str], instance_dims: Tuple[str]):
+    """
+    Get the number of samples of each ping,
+    i.e. the index of the last non-NaN sample + 1 across all variables.
+    """
+    sample_number = xr.DataArray(
+        np.arange(1, ds.sizes[RANGE_SAMPLE_DIM] + 1), dims=RANGE_SAMPLE_DIM
+    )
+    counts = []
+    for name in var_names:
+        valid = ds[name].notnull()
+        other_dims = [d for d in valid.dims if d not in instance_dims + (RANGE_SAMPLE_DIM,)]
+        if other_dims:
+            valid = valid.any(other_dims)
+        counts.append((valid * sample_number).max(RANGE_SAMPLE_DIM))
+    counts = xr.concat(counts, dim="var").max("var")
+    return counts.transpose(*instance_dims).values.astype(np.int64)
+
+
+def _iter_blocks(shape: Tuple[int], chunks: Tuple[int]):
+    """
+    Iterate over blocks of pings in C order,
+    yielding the index of the leading dimensions and a slice along the last one.
+    """
+    for lead_idx in np.ndindex(*shape[:-1]):
+        start = 0
+        for size in chunks:
+            yield lead_idx, slice(start, start + size)
+            start += size
+
+
+def _get_ping_chunks(n_ping: int, ping_nbytes: int, chunk_size: str) -> Tuple[int]:
+    """Split pings into chunks of approximately ``chunk_size`` bytes."""
+    block_size = max(1, parse_bytes(chunk_size) // max(ping_nbytes, 1))
+    return tuple(min(block_size, n_ping - start) for start in range(0, n_ping, block_size))
+
+
+def _flatten_block(block: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    mask = np.arange(block.shape[1]) < counts[:, None]
+    return np.asarray(block)[mask]
+
+
+def _expand_block(flat, counts: np.ndarray, n_range: int, dtype: np.dtype) -> np.ndarray:
+    block = np.full((counts.size, n_range) + flat.shape[1:], np.nan, dtype=dtype)
+    mask = np.arange(n_range) < counts[:, None]
+    block[mask] = np.asarray(flat)
+    return block
+
+
+def to_ragged(ds: xr.Dataset) -> xr.Dataset:
+    """
+    Convert the variables along ``range_sample`` of a beam group dataset
+    to the contiguous ragged array representation.
+
+    The valid samples of each ping are concatenated along the ``range_sample_ragged``
+    dimension, and the number of samples of each ping is stored in the
+    ``range_sample_count`` variable, which has the ``sample_dimension`` attribute
+    of the CF conventions. Trailing NaN samples from padding shorter pings are dropped.
+    The conversion is lazy for variables stored as dask arrays.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        A beam group dataset with variables along ``range_sample``
+
+    Returns
+    -------
+    xr.Dataset
+        The beam group dataset in the contiguous ragged array representation
+    """
+    if is_ragged(ds):
+        return ds
+
+    var_names = [name for name, var in ds.data_vars.items() if RANGE_SAMPLE_DIM in var.dims]
+    if not var_names:
+        return ds
+
+    instance_dims = _get_instance_dims(ds, var_names)
+    counts = _get_sample_counts(ds, var_names, instance_dims)
+    n_range = ds.sizes[RANGE_SAMPLE_DIM]
+
+    ds_ragged = ds.drop_vars(var_names + [RANGE_SAMPLE_DIM])
+    for name in var_names:
+        var = ds[name].transpose(*instance_dims, RANGE_SAMPLE_DIM, ...)
+        trailing_dims = var.dims[len(instance_dims) + 1 :]
+        data = var.data
+
+        if isinstance(data, da.Array):
+            # Flatten each block of pings separately to keep the conversion lazy
+            blocks = []
+            for lead_idx, ping_slice in _iter_blocks(counts.shape, data.chunks[counts.ndim - 1]):
+                block_counts = counts[lead_idx + (ping_slice,)]
+                blocks.append(
+                    da.from_delayed(
+                        dask.delayed(_flatten_block)(data[lead_idx + (ping_slice,)], block_counts),
+                        shape=(int(block_counts.sum()),) + data.shape[counts.ndim + 1 :],
+                        dtype=data.dtype,
+                    )
+                )
+            flat = da.concatenate(blocks, axis=0)
+        else:
+            mask = np.arange(n_range) < counts[..., None]
+            flat = np.asarray(data)[mask]
+
+        ds_ragged[name] = xr.Variable((RAGGED_DIM,) + trailing_dims, flat, attrs=var.attrs)
+
+    ds_ragged[COUNT_VAR] = xr.Variable(
+        instance_dims,
+        counts,
+        attrs={
+            "long_name": "Number of range samples in each ping",
+            "sample_dimension": RAGGED_DIM,
+            # Size of the rectangular range_sample dimension
+            "range_sample_size": n_range,
+        },
+    )
+    return ds_ragged
+
+
+def from_ragged(ds: xr.Dataset, chunk_size: str = "100MB") -> xr.Dataset:
+    """
+    Expand the contiguous ragged variables of a beam group dataset
+    to the rectangular, NaN-padded representation along ``range_sample``.
+
+    The expansion is lazy: the expanded variables are dask arrays
+    chunked along the last ping dimension. Along ``range_sample``, the chunks
+    are aligned to the sample extent of each channel (see ``get_sample_extents``),
+    and the padding beyond the extent of each channel is a constant NaN array
+    that is never materialized from the data.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        A beam group dataset in the contiguous ragged array representation
+    chunk_size : str
+        The approximate size of the chunks of the expanded variables
+
+    Returns
+    -------
+    xr.Dataset
+        The beam group dataset with variables along ``range_sample``
+    """
+    if not is_ragged(ds):
+        return ds
+
+    count_var = ds[COUNT_VAR]
+    instance_dims = count_var.dims
+    counts = count_var.values.astype(np.int64)
+    n_range = int(count_var.attrs.get("range_sample_size", counts.max(initial=0)))
+    offsets = (np.cumsum(counts.ravel()) - counts.ravel()).reshape(counts.shape)
+
+    var_names = [name for name, var in ds.data_vars.items() if RAGGED_DIM in var.dims]
+    ds_rect = ds.drop_vars(var_names + [COUNT_VAR])
+    for name in var_names:
+        var = ds[name].variable
+        is_dask = var.chunks is not None
+        trailing_shape = var.shape[1:]
+        # Integer data are NaN-padded as float, as in the rectangular conversion
+        dtype = np.dtype("float64") if var.dtype.kind in "iub" else var.dtype
+        ping_nbytes = n_range * int(np.prod(trailing_shape)) * dtype.itemsize
+        ping_chunks = _get_ping_chunks(counts.shape[-1], ping_nbytes, chunk_size)
+
+        def _build(lead_idx: Tuple[int]) -> da.Array:
+            # Recursively concatenate blocks along the instance dimensions
+            axis = len(lead_idx)
+            if axis < counts.ndim - 1:
+                return da.concatenate(
+                    [_build(lead_idx + (i,)) for i in range(counts.shape[axis])], axis=axis
+                )
+            # Only expand up to the sample extent of this channel:
+            # the padding beyond it is a constant array that is never materialized
+            # from the data, and becomes separate chunks once channels are concatenated
+            extent = int(counts[lead_idx].max(initial=0))
+            blocks = []
+            for _, ping_slice in _iter_blocks((counts.shape[-1],), ping_chunks):
+                block_counts = counts[lead_idx + (ping_slice,)]
+                start = int(offsets[lead_idx + (ping_slice.start,)])
+                sample_slice = slice(start, start + int(block_counts.sum()))
+                # Index the dask array, or lazily index the backend array,
+                # so that only the samples of this block are loaded
+                flat = var.data[sample_slice] if is_dask else var[sample_slice]
+                block = da.from_delayed(
+                    dask.delayed(_expand_block)(flat, block_counts, extent, dtype),
+                    shape=(block_counts.size, extent) + trailing_shape,
+                    dtype=dtype,
+                )
+                blocks.append(block.reshape((1,) * axis + block.shape))
+            expanded = da.concatenate(blocks, axis=axis)
+            if extent < n_range:
+                padding = da.full(
+                    expanded.shape[: axis + 1] + (n_range - extent,) + trailing_shape,
+                    np.nan,
+                    dtype=dtype,
+                    chunks=expanded.chunks[: axis + 1] + (-1,) + trailing_shape,
+                )
+                expanded = da.concatenate([expanded, padding], axis=axis + 1)
+            return expanded
+
+        ds_rect[name] = xr.Variable(
+            instance_dims + (RANGE_SAMPLE_DIM,) + var.dims[1:], _build(()), attrs=var.attrs
+        )
+
+    ds_rect = ds_rect.assign_coords(
+        {
+            RANGE_SAMPLE_DIM: (
+                RANGE_SAMPLE_DIM,
+                np.arange(n_range),
+                {"long_name": "Along-range sample number, base 0"},
+            )
+        }
+    )
+    return ds_rect
+
+
+def isel_pings(ds: xr.Dataset, indexers: Dict[str, Any]) -> xr.Dataset:
+    """
+    Select pings of a beam group dataset, which may be in the contiguous ragged representation.
+
+    For ragged datasets, the samples of the selected pings are also selected
+    along ``range_sample_ragged``, with a slice when they are contiguous,
+    so that only the chunks holding them are read.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        A beam group dataset
+    indexers : dict
+        Positional indexers of the ping dimensions, such as ``ping_time``
+
+    Returns
+    -------
+    xr.Dataset
+        The dataset with the selected pings
+    """
+    if not is_ragged(ds):
+        return ds.isel(indexers)
+
+    counts = ds[COUNT_VAR]
+    # Pings are concatenated in the C order of the dimensions of the count variable
+    offsets = xr.DataArray(
+        (np.cumsum(counts.values.ravel()) - counts.values.ravel()).reshape(counts.shape),
+        dims=counts.dims,
+    )
+    sel_counts = counts.isel(indexers).values.ravel()
+    sel_offsets = offsets.isel(indexers).values.ravel()
+    # Index of each selected sample: offset of its ping + position within the ping
+    ping_starts = np.cumsum(sel_counts) - sel_counts
+    sample_idx = np.repeat(sel_offsets - ping_starts, sel_counts) + np.arange(sel_counts.sum())
+    if sample_idx.size == 0 or sample_idx[-1] - sample_idx[0] + 1 == sample_idx.size:
+        sample_idx = slice(sample_idx[0], sample_idx[-1] + 1) if sample_idx.size else slice(0, 0)
+
+    return ds.isel({**indexers, RAGGED_DIM: sample_idx})
+
+
+def get_sample_extents(ds: xr.Dataset) -> xr.DataArray:
+    """
+    Get the sample extent of each channel of a beam group dataset,
+    i.e. the number of samples of its longest ping.
+
+    Samples beyond the extent of a channel only contain the NaN padding
+    added to match the longer pings of other channels.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        A beam group dataset, in the rectangular or contiguous ragged array representation
+
+    Returns
+    -------
+    xr.DataArray
+        The sample extent along the leading ping dimension, usually ``channel``
+    """
+    if is_ragged(ds):
+        counts = ds[COUNT_VAR]
+    else:
+        var_names = [name for name, var in ds.data_vars.items() if RANGE_SAMPLE_DIM in var.dims]
+        instance_dims = _get_instance_dims(ds, var_names)
+        counts = xr.DataArray(
+            _get_sample_counts(ds, var_names, instance_dims),
+            dims=instance_dims,
+            coords={d: ds[d] for d in instance_dims if d in ds.coords},
+        )
+
+    extents = counts.max(counts.dims[1:]) if counts.ndim > 1 else counts.max()
+    extents.name = EXTENT_VAR
+    extents.attrs = {"long_name": "Number of range samples of the longest ping of each channel"}
+    return extents
+
+
+def skip_padding(da_in: xr.DataArray, extents: xr.DataArray) -> xr.DataArray:
+    """
+    Replace the chunks of a dask-backed array that are entirely in the padding region
+    beyond the sample extent of their channels by constant NaN chunks,
+    so that the computation of these chunks is skipped.
+
+    Arrays that are not dask-backed, not floating point or without the dimension
+    of ``extents`` and ``range_sample`` are returned unchanged.
+
+    Parameters
+    ----------
+    da_in : xr.DataArray
+        The array along ``range_sample`` and the dimension of ``extents``
+    extents : xr.DataArray
+        The sample extents, see ``get_sample_extents``
+
+    Returns
+    -------
+    xr.DataArray
+        The array with padding chunks replaced by constant NaN chunks
+    """
+    if (
+        extents.ndim != 1
+        or da_in.chunks is None
+        or da_in.dtype.kind not in "fc"
+        or RANGE_SAMPLE_DIM not in da_in.dims
+        or extents.dims[0] not in da_in.dims
+    ):
+        return da_in
+
+    extent_dim = extents.dims[0]
+    ext = extents.sel({extent_dim: da_in[extent_dim]}).values
+    data = da_in.data
+    ext_axis = da_in.get_axis_num(extent_dim)
+    range_axis = da_in.get_axis_num(RANGE_SAMPLE_DIM)
+    bounds = [np.cumsum((0,) + c) for c in data.chunks]
+
+    def _block(block_idx: Tuple[int]):
+        # Nested list of blocks as expected by da.block
+        if len(block_idx) < data.ndim:
+            return [_block(block_idx + (i,)) for i in range(data.numblocks[len(block_idx)])]
+        ext_block = ext[
+            bounds[ext_axis][block_idx[ext_axis]] : bounds[ext_axis][block_idx[ext_axis] + 1]
+        ]
+        block = data.blocks[block_idx]
+        if bounds[range_axis][block_idx[range_axis]] >= ext_block.max(initial=0):
+            return da.full(block.shape, np.nan, dtype=data.dtype, chunks=block.shape)
+        return block
+
+    return da_in.copy(data=da.block(_block(())))
@@ -0,0 +1,297 @@
+"""
+Management of the disk swap space used when rectangularizing large raw data.
+
+Swap stores are zarr stores created under a configurable directory,
+in a namespace unique to each process and manager (``ep-swap-<host>-<pid>-<id>``).
+The total size of the swap stores of all processes sharing the directory
+can be limited by a quota: a conversion that would exceed it either waits
+for space to be released by other conversions or fails fast.
+
+Swap stores are released when the ``EchoData`` object using them is deleted,
+and the namespace of the process is removed at interpreter exit.
+Namespaces left behind by processes that did not exit cleanly
+(for example a crashed Jupyter kernel) are removed by the next manager
+created on the same host.
+Within a ``SwapManager`` context, released stores are reused by the following
+conversions and all stores are removed when the context exits:
+
+    >>> with SwapManager(swap_dir="/scratch/swap", quota="50GB", wait_timeout=600):
+    ...     for raw_file in raw_files:
+    ...         ed = open_raw(raw_file, sonar_model="EK80", use_swap=True)
+    ...         ed.to_zarr(...)
+"""
+
+import atexit
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import fsspec
+import psutil
+from dask.utils import parse_bytes
+from fsspec import FSMap
+
+from .io import _SWAP_PREFIX, ECHOPYPE_TEMP_DIR
+from .log import _init_logger
+
+logger = _init_logger(__name__)
+
+_RESERVATION_SUFFIX = ".reserved"
+
+
+class SwapQuotaError(RuntimeError):
+    """Raised when the swap space quota would be exceeded."""
+
+
+def _get_dir_size(path: Path) -> int:
+    size = 0
+    for f in path.rglob("*"):
+        try:
+            if f.is_file():
+                size += f.stat().st_size
+        except FileNotFoundError:
+            # Removed concurrently
+            continue
+    return size
+
+
+def _get_store_usage(path: Path) -> int:
+    """Disk usage of a swap store: the larger of its size and its reservation."""
+    try:
+        reserved = json.loads(path.with_suffix(_RESERVATION_SUFFIX).read_text())["nbytes"]
+    except (FileNotFoundError, ValueError, KeyError):
+        reserved = 0
+    return max(reserved, _get_dir_size(path))
+
+
+class SwapManager:
+    """
+    Create, reuse and clean up the swap stores of the current process.
+
+    Parameters
+    ----------
+    swap_dir : str or Path, optional
+        The directory where swap stores are created.
+        Defaults to the ``echopype`` directory of the system temporary directory.
+    quota : int or str, optional
+        The maximum total size of the swap stores in ``swap_dir``, in bytes
+        or as a string such as "50GB". This includes the stores of other
+        processes using the same directory. Defaults to no limit.
+    wait_timeout : float
+        The number of seconds a conversion waits for swap space to be released
+        when the quota would be exceeded, before raising ``SwapQuotaError``.
+        Defaults to 0, i.e. fail fast.
+    poll_interval : float
+        The number of seconds between checks of the swap space usage while waiting.
+        Defaults to 1.
+
+    Notes
+    -----
+    The quota is enforced at the creation of a swap store, from the expected size
+    of the rectangularized data and the size of the existing stores.
+    The check is not atomic across processes, so concurrent conversions
+    may slightly exceed the quota.
+    """
+
+    def __init__(
+        self,
+        swap_dir: Optional[Union[str, Path]] = None,
+        quota: Optional[Union[int, str]] = None,
+        wait_timeout: float = 0,
+        poll_interval: float = 1,
+    ):
+        self.swap_dir = Path(swap_dir) if swap_dir is not None else ECHOPYPE_TEMP_DIR
+        self.quota = parse_bytes(quota) if isinstance(quota, str) else quota
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.namespace = self.swap_dir / (
+            f"{_SWAP_PREFIX}-{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+
+        self._lock = threading.RLock()
+        # Notified when a store of this manager is released
+        self._released = threading.Condition(self._lock)
+        self._stores: Dict[str, Path] = {}
+        self._pool: List[Path] = []
+        self._reuse = False
+        self._previous: Optional["SwapManager"] = None
+
+        self.cleanup_stale()
+        atexit.register(self.cleanup)
+
+    def __repr__(self) -> str:
+        return f"SwapManager(swap_dir='{self.swap_dir}', quota={self.quota})"
+
+    def __enter__(self) -> "SwapManager":
+        global _swap_manager
+        self._previous, _swap_manager = _swap_manager, self
+        self._reuse = True
+        return self
+
+    def __exit__(self, *exc):
+        global _swap_manager
+        _swap_manager, self._previous = self._previous, None
+        self._reuse = False
+        self.cleanup()
+
+    def usage(self) -> int:
+        """Total disk usage of the swap stores of all processes in ``swap_dir``, in bytes."""
+        if not self.swap_dir.exists():
+            return 0
+        return sum(
+            _get_store_usage(store)
+            for namespace in self.swap_dir.glob(f"{_SWAP_PREFIX}-*")
+            if namespace.is_dir()
+            for store in namespace.iterdir()
+            if store.is_dir()
+        )
+
+    def _wait_for_space(self, nbytes: int) -> None:
+        """
+        Wait until ``nbytes`` fit within the quota. Must be called with the lock held,
+        which is released while waiting so that other threads can release their stores.
+        """
+        if self.quota is None:
+            return
+        if nbytes > self.quota:
+            raise SwapQuotaError(
+                f"The swap space required ({nbytes} bytes) exceeds the quota ({self.quota} bytes)."
+            )
+        start = time.monotonic()
+        while self.usage() + nbytes > self.quota:
+            remaining = self.wait_timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                raise SwapQuotaError(
+                    f"Not enough swap space in {self.swap_dir} for {nbytes} bytes "
+                    f"within the quota of {self.quota} bytes."
+                )
+            logger.info("Waiting for swap space to be released")
+            # Woken up by the stores released by this manager,
+            # and polling for those released by other processes
+            self._released.wait(min(self.poll_interval, remaining))
+
+    def acquire(self, nbytes: int = 0) -> FSMap:
+        """
+        Get an empty swap store, waiting for space if the quota would be exceeded.
+
+        Parameters
+        ----------
+        nbytes : int
+            The expected size of the data to be written to the store, in bytes
+
+        Returns
+        -------
+        FSMap
+            The swap store
+        """
+        with self._lock:
+            # The quota is checked and the space reserved atomically for this manager
+            self._wait_for_space(nbytes)
+            if self._pool:
+                path = self._pool.pop()
+            else:
+                path = self.namespace / f"{uuid.uuid4().hex}.zarr"
+                path.mkdir(parents=True)
+            # The reservation is kept next to the store, which may be overwritten
+            path.with_suffix(_RESERVATION_SUFFIX).write_text(json.dumps({"nbytes": int(nbytes)}))
+            self._stores[str(path)] = path
+        logger.debug(f"Acquired swap store {path}")
+        return fsspec.get_mapper(str(path))
+
+    def release(self, store: "FSMap | str") -> None:
+        """
+        Release a swap store once its data are no longer used.
+
+        Within a ``SwapManager`` context, the store is emptied to be reused,
+        otherwise it is removed. Releasing a store more than once has no effect.
+
+        Parameters
+        ----------
+        store : FSMap or str
+            The swap store or its path
+        """
+        path = Path(store.root if isinstance(store, FSMap) else store)
+        with self._lock:
+            if self._stores.pop(str(path), None) is None:
+                return
+            path.with_suffix(_RESERVATION_SUFFIX).unlink(missing_ok=True)
+            if self._reuse:
+                for item in path.iterdir():
+                    if item.is_dir():
+                        shutil.rmtree(item, ignore_errors=True)
+                    else:
+                        item.unlink(missing_ok=True)
+                self._pool.append(path)
+            else:
+                shutil.rmtree(path, ignore_errors=True)
+            self._released.notify_all()
+        logger.debug(f"Released swap store {path}")
+
+    def cleanup(self) -> None:
+        """Remove all the swap stores of this manager."""
+        with self._lock:
+            self._stores.clear()
+            self._pool.clear()
+            shutil.rmtree(self.namespace, ignore_errors=True)
+
+    def cleanup_stale(self) -> List[str]:
+        """
+        Remove the swap namespaces of processes of this host that are no longer running.
+
+        Returns
+        -------
+        list of str
+            The paths of the removed namespaces
+        """
+        prefix = f"{_SWAP_PREFIX}-{socket.gethostname()}-"
+        removed = []
+        if not self.swap_dir.exists():
+            return removed
+        for namespace in self.swap_dir.glob(f"{prefix}*"):
+            pid = namespace.name[len(prefix) :].split("-")[0]
+            if pid.isdigit() and not psutil.pid_exists(int(pid)):
+                shutil.rmtree(namespace, ignore_errors=True)
+                removed.append(str(namespace))
+                logger.info(f"Removed stale swap space {namespace}")
+        return removed
+
+
+_swap_manager: Optional[SwapManager] = None
+
+
+def get_swap_manager() -> SwapManager:
+    """Get the swap manager used by raw data conversions, creating a default one if needed."""
+    global _swap_manager
+    if _swap_manager is None:
+        _swap_manager = SwapManager()
+    return _swap_manager
+
+
+def configure_swap(
+    swap_dir: Optional[Union[str, Path]] = None,
+    quota: Optional[Union[int, str]] = None,
+    wait_timeout: float = 0,
+    poll_interval: float = 1,
+) -> SwapManager:
+    """
+    Set the swap space used by raw data conversions for the rest of the session.
+
+    See ``SwapManager`` for a description of the parameters.
+    The stores of the previous swap manager are kept until their data are released.
+
+    Returns
+    -------
+    SwapManager
+        The new swap manager
+    """
+    global _swap_manager
+    _swap_manager = SwapManager(
+        swap_dir=swap_dir, quota=quota, wait_timeout=wait_timeout, poll_interval=poll_interval
+    )
+    return _swap_manager
@@ -175,14 +175,12 @@ def calc_absorption(
             * (1 + temperature * (-0.042 + temperature * (8.53e-4 - temperature * 6.23e-6)))
             * (1 + k * (-3.84e-4 + k * 7.57e-8))
         )
-        if salinity == 0:
-            sea_abs = c * frequency**2
-        else:
-            sea_abs = (
-                (a * f1 * frequency**2) / (f1**2 + frequency**2)
-                + (b * f2 * frequency**2) / (f2**2 + frequency**2)
-                + c * frequency**2
-            )
+        # Only the pure water term is kept where salinity is 0,
+        # which also works for salinity varying in time
+        sea_abs = (salinity != 0) * (
+            (a * f1 * frequency**2) / (f1**2 + frequency**2)
+            + (b * f2 * frequency**2) / (f2**2 + frequency**2)
+        ) + c * frequency**2
     else:
         ValueError("Unknown formula source")
 